@@ -0,0 +1,53 @@
+"""Чтение одного числового поля из всех секций синтетического system.ltx
+(как в таблицах ``analyzer_general``) и сортировка по нему:
+``Ini.column`` в сравнении с ``get_float`` по каждой секции.
+
+Запуск: ``python benchmarks/bench_column.py [n_sections] [field]``
+"""
+
+import sys
+import time
+
+from ip_ltx import Ini, Section
+
+from synthetic import system_ltx
+
+
+def _column_getters(ini: Ini, field: str) -> list[float | None]:
+    """Прежний способ: ``get_float`` с перехватом исключения для каждой секции."""
+    values = []
+    for section in ini.sections():
+        try:
+            values.append(section.get_float(field))
+        except Section.Error:
+            values.append(None)
+    return values
+
+
+def main() -> None:
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 50000
+    field = sys.argv[2] if (len(sys.argv) > 2) else "field_2"
+    ini = Ini(name="system.ltx")
+    ini.read_raw(system_ltx(n_sections))
+    ids = list(ini.ids())
+
+    t = time.perf_counter()
+    values_getters = _column_getters(ini, field)
+    order_getters = sorted(
+        (i for i, v in enumerate(values_getters) if v is not None),
+        key=values_getters.__getitem__
+    )
+    print(f"get_float per section + sort: {time.perf_counter() - t:.3f} s")
+
+    t = time.perf_counter()
+    values, valid = ini.column(field, "float")
+    order = sorted(
+        (i for i in range(len(ids)) if valid[i]), key=values.__getitem__
+    )
+    print(f"column + sort: {time.perf_counter() - t:.3f} s")
+    print(f"{sum(valid)} of {len(ids)} sections have a valid value")
+    assert order == order_getters
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Сравнение двух версий синтетического system.ltx (часть секций изменена,
+удалена, добавлена и перемещена): ``ini_diff.diff`` в сравнении
+с прямым сравнением полей всех общих секций.
+
+Запуск: ``python benchmarks/bench_diff.py [n_sections] [n_changed]``
+"""
+
+import io
+import random
+import sys
+import time
+
+from ip_ltx import Ini
+from ip_ltx.ini_diff import diff
+
+from synthetic import system_ltx
+
+
+def _blocks(raw: str) -> list[str]:
+    """Разбиение текста на блоки по объявлениям секций."""
+    blocks = raw.split("\n[")
+    return [blocks[0]] + [f"[{b}" for b in blocks[1:]]
+
+
+def _patch(raw: str, n_changed: int, seed: int = 1) -> str:
+    rnd = random.Random(seed)
+    head, *blocks = _blocks(raw)
+    # Секции без наследников: удаление не ломает объявления остальных
+    parents = set()
+    for b in blocks:
+        decl = b.split("\n", 1)[0].split(";", 1)[0]
+        if ":" in decl:
+            parents.update(p.strip() for p in decl.split(":", 1)[1].split(","))
+    leaves = [i for i, b in enumerate(blocks) if b[1:b.index("]")] not in parents]
+    picked = rnd.sample(leaves, 3 * n_changed)
+    changed, removed, moved = (
+        picked[:n_changed], set(picked[n_changed:2 * n_changed]), picked[2 * n_changed:]
+    )
+    for i in changed:
+        blocks[i] = blocks[i].rstrip("\n") + "\npatched = 1\n"
+    tail = [blocks[i] for i in moved]
+    blocks = [b for i, b in enumerate(blocks) if (i not in removed) and (i not in moved)]
+    blocks += tail
+    blocks += [f"[added_{i}]\nvalue = {i}\n" for i in range(n_changed)]
+    return "\n".join([head] + blocks)
+
+
+def _diff_scan(old: Ini, new: Ini) -> set[str]:
+    """Сравнение без хэшей: поля каждой общей секции."""
+    ids = {_id for _id in old.ids() if not new.section_exist(_id)}
+    ids.update(_id for _id in new.ids() if not old.section_exist(_id))
+    for _id in old.ids():
+        if new.section_exist(_id):
+            s1, s2 = old.section(_id), new.section(_id)
+            if (list(s1.fields()) != list(s2.fields())) or (s1.parents != s2.parents):
+                ids.add(_id)
+    return ids
+
+
+def main() -> None:
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+    n_changed = int(sys.argv[2]) if (len(sys.argv) > 2) else 20
+    raw = system_ltx(n_sections)
+    old = Ini(name="before")
+    old.read_raw(raw)
+    new = Ini(name="after")
+    new.read_raw(_patch(raw, n_changed))
+    print(f"system.ltx: {n_sections} sections, {n_changed} changed/removed/added/moved")
+
+    t = time.perf_counter()
+    ids = _diff_scan(old, new)
+    print(f"scan: {time.perf_counter() - t:.3f} s")
+
+    t = time.perf_counter()
+    old.fingerprint()
+    new.fingerprint()
+    print(f"fingerprints (first call): {time.perf_counter() - t:.3f} s")
+
+    t = time.perf_counter()
+    d = diff(old, new)
+    out = io.StringIO()
+    d.write(out, "ltx")
+    print(f"diff + ltx: {time.perf_counter() - t:.3f} s")
+    assert {sd.id for sd in d.sections} == ids
+    print(
+        f"{len(d.by_kind('changed'))} changed, {len(d.by_kind('removed'))} removed,"
+        f" {len(d.by_kind('added'))} added, {len(d.moved)} moved"
+    )
+
+
+if __name__ == "__main__":
+    main()
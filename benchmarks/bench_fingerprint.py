@@ -0,0 +1,57 @@
+"""Сравнение двух снимков синтетического system.ltx, различающихся
+несколькими секциями: вывод через ``Ini.write`` и сравнение текста
+в сравнении с ``Ini.differing_ids``.
+
+Запуск: ``python benchmarks/bench_fingerprint.py [n_sections] [n_changed]``
+"""
+
+import io
+import sys
+import time
+
+from ip_ltx import Ini
+
+from synthetic import system_ltx
+
+
+def _dump(ini: Ini) -> dict[str, str]:
+    """Текст каждой секции (как при сравнении файлов, полученных через write)."""
+    blocks = {}
+    for section in ini.sections():
+        file = io.StringIO()
+        section.write(file)
+        blocks[section.id] = file.getvalue()
+    return blocks
+
+
+def main() -> None:
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+    n_changed = int(sys.argv[2]) if (len(sys.argv) > 2) else 10
+    raw = system_ltx(n_sections)
+    ini_1, ini_2 = Ini(name="before"), Ini(name="after")
+    ini_1.read_raw(raw)
+    ini_2.read_raw(raw)
+    ids = list(ini_2.ids())
+    changed = set(ids[::len(ids) // n_changed][:n_changed])
+
+    t = time.perf_counter()
+    ini_1.fingerprint()
+    ini_2.fingerprint()
+    print(f"fingerprints (first): {time.perf_counter() - t:.3f} s")
+
+    for _id in changed:
+        ini_2.section(_id)._fields["patched"] = "1"
+
+    t = time.perf_counter()
+    blocks_1, blocks_2 = _dump(ini_1), _dump(ini_2)
+    text_diff = {_id for _id in blocks_1 if blocks_1[_id] != blocks_2.get(_id)}
+    print(f"write + compare text: {time.perf_counter() - t:.3f} s")
+
+    t = time.perf_counter()
+    diff = ini_1.differing_ids(ini_2)
+    print(f"differing_ids: {time.perf_counter() - t:.3f} s")
+    assert diff == text_diff == changed
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Передача синтетического system.ltx в процессы-обработчики:
+сериализация (``pickle``) экземпляра ``Ini`` в сравнении с ``FrozenIni``
+(копия буфера или путь до отображаемого в память файла).
+
+Запуск: ``python benchmarks/bench_frozen.py [n_sections] [n_tasks]``
+"""
+
+import pickle
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ip_ltx import Ini
+from ip_ltx.ini_frozen import FrozenIni
+
+from synthetic import system_ltx
+
+
+def _task(ini: Ini | FrozenIni) -> int:
+    return sum(1 for _id in ini.ids() if ini.line_exist(_id, "field_0"))
+
+
+def main() -> None:
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+    n_tasks = int(sys.argv[2]) if (len(sys.argv) > 2) else 8
+    ini = Ini(name="system.ltx")
+    ini.read_raw(system_ltx(n_sections))
+
+    t = time.perf_counter()
+    frozen = FrozenIni.from_ini(ini)
+    print(f"from_ini: {time.perf_counter() - t:.3f} s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fp = str(Path(tmp) / "system.frozen")
+        frozen.dump(fp)
+        mapped = FrozenIni.open(fp)
+        for title, obj in (("Ini", ini), ("FrozenIni", frozen), ("FrozenIni (mmap)", mapped)):
+            t = time.perf_counter()
+            data = pickle.dumps(obj)
+            pickle.loads(data)
+            print(
+                f"{title}: pickle {len(data) / 1e6:.2f} MB,"
+                f" dumps + loads {time.perf_counter() - t:.3f} s"
+            )
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            executor.submit(int).result()  # запуск процессов
+            for title, obj in (("Ini", ini), ("FrozenIni (mmap)", mapped)):
+                t = time.perf_counter()
+                results = list(executor.map(_task, [obj] * n_tasks))
+                print(f"{title}: {n_tasks} tasks {time.perf_counter() - t:.3f} s")
+                assert results[0] == _task(ini)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Поиск секций по значению поля в синтетическом system.ltx:
+перебор ``Ini.sections()`` в сравнении с ``Ini.lookup`` / ``Ini.with_field``.
+
+Запуск: ``python benchmarks/bench_index.py [n_sections] [n_queries]``
+"""
+
+import sys
+import time
+
+from ip_ltx import Ini
+
+from synthetic import system_ltx
+
+
+def main() -> None:
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+    n_queries = int(sys.argv[2]) if (len(sys.argv) > 2) else 50
+    ini = Ini(name="system.ltx")
+    ini.read_raw(system_ltx(n_sections), fp_src="system.ltx")
+    queries = [("field_3", str(i)) for i in range(n_queries)]
+
+    t = time.perf_counter()
+    scan = [
+        [s.id for s in ini.sections() if s.get_string(field, "") == value]
+        for field, value in queries
+    ]
+    scan.append([s.id for s in ini.sections() if s.line_exist("flag_7")])
+    print(f"scan: {time.perf_counter() - t:.3f} s")
+
+    t = time.perf_counter()
+    ini.build_index("field_3")
+    ini.with_field("flag_7")
+    print(f"build indexes: {time.perf_counter() - t:.3f} s")
+
+    t = time.perf_counter()
+    found = [[s.id for s in ini.lookup(field, value)] for field, value in queries]
+    found.append([s.id for s in ini.with_field("flag_7")])
+    print(f"lookup: {time.perf_counter() - t:.6f} s")
+    assert found == scan
+
+
+if __name__ == "__main__":
+    main()
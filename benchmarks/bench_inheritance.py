@@ -0,0 +1,49 @@
+"""Запросы к графу наследования синтетического system.ltx:
+поиск потомков секции перебором всех секций в сравнении с ``Ini.descendants``.
+
+Запуск: ``python benchmarks/bench_inheritance.py [n_sections] [n_queries]``
+"""
+
+import sys
+import time
+
+from ip_ltx import Ini
+
+from synthetic import system_ltx
+
+
+def _descendants_scan(ini: Ini, root: str) -> set[str]:
+    """Поиск потомков без индекса: повторные проходы по всем секциям."""
+    found = {root}
+    for section in ini.sections():
+        if any(parent in found for parent in section.parents):
+            found.add(section.id)
+    found.discard(root)
+    return found
+
+
+def main() -> None:
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+    n_queries = int(sys.argv[2]) if (len(sys.argv) > 2) else 200
+    ini = Ini(name="system.ltx")
+    ini.read_raw(system_ltx(n_sections), fp_src="system.ltx")
+    ids = list(ini.ids())
+    roots = ids[::max(1, len(ids) // n_queries)][:n_queries]
+
+    t = time.perf_counter()
+    scan = [_descendants_scan(ini, root) for root in roots]
+    print(f"scan: {time.perf_counter() - t:.3f} s")
+
+    t = time.perf_counter()
+    found = [set(ini.descendants(root)) for root in roots]
+    print(f"descendants (first query): {time.perf_counter() - t:.3f} s")
+    t = time.perf_counter()
+    for root in roots:
+        ini.descendants(root)
+    print(f"descendants (repeated): {time.perf_counter() - t:.6f} s")
+    assert found == scan
+    print(f"avg descendants: {sum(map(len, found)) / len(found):.0f}")
+
+
+if __name__ == "__main__":
+    main()
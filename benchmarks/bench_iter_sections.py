@@ -0,0 +1,53 @@
+"""Однопроходная обработка синтетического ``alife_*.ltx``:
+``Ini.read`` + ``Ini.sections`` в сравнении с ``Ini.iter_sections``
+(время и пиковое потребление памяти).
+
+Запуск: ``python benchmarks/bench_iter_sections.py [n_objects]``
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from ip_ltx import Ini, Section
+
+from synthetic import alife_ltx
+
+
+def _consume(sections: Iterable[Section]) -> int:
+    return sum(len(section.get_string("name", "")) for section in sections)
+
+
+def _measure(label: str, f: Callable[[], int]) -> int:
+    tracemalloc.start()
+    t = time.perf_counter()
+    result = f()
+    elapsed = time.perf_counter() - t
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label}: {elapsed:.3f} s, peak {peak / 1e6:.1f} MB")
+    return result
+
+
+def _read(fp: str) -> int:
+    ini = Ini(name="alife")
+    ini.read(fp)
+    return _consume(ini.sections())
+
+
+def main() -> None:
+    n_objects = int(sys.argv[1]) if (len(sys.argv) > 1) else 50000
+    with tempfile.TemporaryDirectory() as tmp:
+        fp = Path(tmp) / "alife_l01.ltx"
+        fp.write_text(alife_ltx(n_objects))
+        print(f"alife_l01.ltx: {n_objects} objects, {fp.stat().st_size / 1e6:.1f} MB")
+        r1 = _measure("read + sections", lambda: _read(str(fp)))
+        r2 = _measure("iter_sections", lambda: _consume(Ini().iter_sections(str(fp))))
+        assert r1 == r2
+
+
+if __name__ == "__main__":
+    main()
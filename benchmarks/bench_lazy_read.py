@@ -0,0 +1,54 @@
+"""Сравнение обычного и ленивого (``lazy=True``) чтения
+синтетического декомпилированного all.spawn.
+
+Запуск: ``python benchmarks/bench_lazy_read.py [n_objects]``
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from ip_ltx import Ini
+
+from synthetic import alife_ltx
+
+
+def _read(fp: str, lazy: bool) -> tuple[float, float]:
+    t = time.perf_counter()
+    ini = Ini(name="all.spawn")
+    ini.read(fp, lazy=lazy)
+    t_read = time.perf_counter() - t
+    ids = list(ini.ids())
+    ini.get_string(ids[len(ids) // 2], "section_name")
+    t_query = time.perf_counter() - t
+    return t_read, t_query
+
+
+def _measure(fp: str, lazy: bool) -> tuple[float, float, float]:
+    # Время и память измеряются раздельно: tracemalloc сильно замедляет чтение
+    t_read, t_query = _read(fp, lazy)
+    tracemalloc.start()
+    _read(fp, lazy)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return t_read, t_query, peak / 1e6
+
+
+def main() -> None:
+    n_objects = int(sys.argv[1]) if (len(sys.argv) > 1) else 50000
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        fp = Path(dir_tmp, "alife_test.ltx")
+        fp.write_text(alife_ltx(n_objects), encoding="utf-8")
+        print(f"alife_test.ltx: {fp.stat().st_size / 1e6:.1f} MB")
+        for lazy in (False, True):
+            t_read, t_query, peak = _measure(str(fp), lazy)
+            print((
+                f"lazy={lazy!s:5}: read {t_read:.3f} s,"
+                f" first query {t_query:.3f} s, peak memory {peak:.1f} MB"
+            ))
+
+
+if __name__ == "__main__":
+    main()
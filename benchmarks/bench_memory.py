@@ -0,0 +1,38 @@
+"""Память, занимаемая считанными синтетическими system.ltx и all.spawn.
+
+Запуск: ``python benchmarks/bench_memory.py [n_sections] [n_objects]``
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from ip_ltx import Ini
+
+from synthetic import alife_ltx, system_ltx
+
+
+def _retained(raw: str, name: str) -> float:
+    gc.collect()
+    tracemalloc.start()
+    ini = Ini(name=name)
+    ini.read_raw(raw, fp_src=name)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del ini
+    return current / 1e6
+
+
+def main() -> None:
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+    n_objects = int(sys.argv[2]) if (len(sys.argv) > 2) else 50000
+    for name, raw in (
+        ("system.ltx", system_ltx(n_sections)),
+        ("alife.ltx", alife_ltx(n_objects)),
+    ):
+        print(f"{name}: {len(raw) / 1e6:.1f} MB of text, {_retained(raw, name):.1f} MB retained")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Разбор числовых списков (``position``, ``direction``) всех объектов
+синтетического all.spawn (как в ``Spawn.init``): ``get_floats``
+с поэлементным ``cast_safe`` (прежний путь), ``get_floats`` со списком
+одним ``map`` и ``Ini.column_elems`` (все секции одним проходом).
+
+Запуск: ``python benchmarks/bench_numeric_lists.py [n_objects]``
+"""
+
+import sys
+import time
+
+from ip_ltx import Ini
+from ip_ltx import ip_ltx as ip_ltx_module
+
+from synthetic import alife_ltx
+
+
+_FIELDS = ("position", "direction")
+
+
+def main() -> None:
+    n_objects = int(sys.argv[1]) if (len(sys.argv) > 1) else 100000
+    raw = alife_ltx(n_objects)
+
+    def fresh() -> Ini:
+        ini = Ini(name="all.spawn")
+        ini.read_raw(raw)
+        for section in ini.sections():
+            section._over  # разбор ленивых секций - вне замеров
+        return ini
+
+    ini = fresh()
+    bulk = ip_ltx_module._BULK_CASTERS.copy()
+    ip_ltx_module._BULK_CASTERS.clear()
+    t = time.perf_counter()
+    expected = [[section.get_floats(k) for k in _FIELDS] for section in ini.sections()]
+    print(f"get_floats (per-element cast_safe): {time.perf_counter() - t:.3f} s")
+    ip_ltx_module._BULK_CASTERS.update(bulk)
+
+    ini = fresh()
+    t = time.perf_counter()
+    r = [[section.get_floats(k) for k in _FIELDS] for section in ini.sections()]
+    print(f"get_floats: {time.perf_counter() - t:.3f} s")
+    assert r == expected
+
+    ini = fresh()
+    t = time.perf_counter()
+    columns = [ini.column_elems(k, "float") for k in _FIELDS]
+    r = [list(row) for row in zip(*columns)]
+    print(f"column_elems: {time.perf_counter() - t:.3f} s")
+    assert r == expected
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Инициализация набора общих данных с зависимостями (как ``validate_data``):
+последовательно и через ``preload``.
+
+Загрузчики синтетические: разбор ltx-текста (процессор) и пауза,
+имитирующая чтение с диска (ожидание ввода-вывода).
+
+Запуск: ``python benchmarks/bench_preload.py [n_sections] [io_delay] [max_workers]``
+"""
+
+import sys
+import time
+
+from ip_ltx import Ini
+from ip_ltx import preload as preload_module
+from ip_ltx.preload import Loader, preload
+
+from synthetic import system_ltx
+
+_RAW = ""
+_DELAY = 0.0
+
+
+def _load(io: float = 1.0, cpu: int = 1) -> None:
+    time.sleep(_DELAY * io)
+    for _ in range(cpu):
+        ini = Ini()
+        ini.read_raw(_RAW)
+
+def meta():
+    _load(0.2, 0)
+
+def system():
+    _load(1.0, 2)
+
+def spawn():
+    _load(2.0, 2)
+
+def xml():
+    _load(1.0, 0)
+
+def spawn_objects():
+    _load(0.5, 1)
+
+
+def main() -> None:
+    global _RAW, _DELAY
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 5000
+    _DELAY = float(sys.argv[2]) if (len(sys.argv) > 2) else 0.2
+    max_workers = int(sys.argv[3]) if (len(sys.argv) > 3) else None
+    _RAW = system_ltx(n_sections)
+    preload_module.LOADERS = {
+        "meta": Loader(f"{__name__}:meta"),
+        "system": Loader(f"{__name__}:system", ("meta",)),
+        "spawn": Loader(f"{__name__}:spawn", ("meta",)),
+        "string_table": Loader(f"{__name__}:xml", ("system",)),
+        "dialogs": Loader(f"{__name__}:xml", ("system",)),
+        "spawn_objects": Loader(f"{__name__}:spawn_objects", ("spawn", "system")),
+    }
+    names = list(preload_module.LOADERS)
+
+    t = time.perf_counter()
+    preload(names, max_workers=1)
+    print(f"sequential: {time.perf_counter() - t:.3f} s")
+
+    t = time.perf_counter()
+    timings = preload(names, max_workers=max_workers)
+    print(f"preload: {time.perf_counter() - t:.3f} s")
+    for name, dt in timings.items():
+        print(f"  {name}: {dt:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Считывание набора текстовых файлов в разных кодировках (UTF-8, cp1251):
+``read_file`` в сравнении с открытием файла заново для каждой кодировки.
+
+Запуск: ``python benchmarks/bench_read_file.py [n_files] [n_sections]``
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ip_ltx.utils import read_file
+
+from synthetic import system_ltx
+
+
+_ENCODINGS = ["utf-8-sig", "cp1251", None]
+
+
+def _read_file_reopen(fp: str, stats: list[int]) -> str:
+    """Прежний способ: файл открывается и декодируется заново для каждой кодировки."""
+    for i, encoding in enumerate(_ENCODINGS):
+        try:
+            stats[0] += os.path.getsize(fp)
+            with open(fp, "r", encoding=encoding) as file:
+                return file.read()
+        except UnicodeDecodeError:
+            if i == (len(_ENCODINGS) - 1):
+                raise
+    return ""
+
+
+def main() -> None:
+    n_files = int(sys.argv[1]) if (len(sys.argv) > 1) else 40
+    n_sections = int(sys.argv[2]) if (len(sys.argv) > 2) else 1000
+    with tempfile.TemporaryDirectory() as tmp:
+        fps = []
+        for i in range(n_files):
+            fp = Path(tmp) / f"file_{i}.ltx"
+            raw = system_ltx(n_sections, seed=i) + "\n; Конец файла\n"
+            # Половина файлов - в cp1251 (как большинство конфигов оригинальной игры)
+            fp.write_bytes(raw.encode("cp1251" if (i % 2) else "utf-8"))
+            fps.append(str(fp))
+        size = sum(os.path.getsize(fp) for fp in fps)
+        print(f"{n_files} files, {size / 1e6:.1f} MB")
+
+        stats = [0]
+        t = time.perf_counter()
+        texts_reopen = [_read_file_reopen(fp, stats) for fp in fps]
+        print(
+            f"reopen per encoding: {time.perf_counter() - t:.3f} s,"
+            f" {stats[0] / 1e6:.1f} MB read"
+        )
+
+        for k in range(2):
+            t = time.perf_counter()
+            texts = [read_file(fp) for fp in fps]
+            print(
+                f"read_file (pass #{k + 1}): {time.perf_counter() - t:.3f} s,"
+                f" {size / 1e6:.1f} MB read"
+            )
+        assert texts == texts_reopen
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Чтение набора синтетических ``alife_*.ltx`` (как у декомпилированного
+all.spawn): последовательно и через ``Ini.read_many``.
+
+Запуск: ``python benchmarks/bench_read_many.py [n_files] [n_objects] [max_workers]``
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ip_ltx import Ini
+
+from synthetic import alife_ltx
+
+
+def main() -> None:
+    n_files = int(sys.argv[1]) if (len(sys.argv) > 1) else 24
+    n_objects = int(sys.argv[2]) if (len(sys.argv) > 2) else 100000
+    max_workers = int(sys.argv[3]) if (len(sys.argv) > 3) else None
+    with tempfile.TemporaryDirectory() as tmp:
+        # Уровни разного размера: от 1 до 3 условных долей
+        weights = [1 + (i % 3) for i in range(n_files)]
+        fps = []
+        for i, w in enumerate(weights):
+            fp = Path(tmp) / f"alife_l{i:02}.ltx"
+            raw = alife_ltx(n_objects * w // sum(weights), seed=i)
+            # ID секций должны быть уникальны в пределах всех файлов
+            fp.write_text(raw.replace("\n[", f"\n[l{i:02}_").replace("[", f"[l{i:02}_", 1))
+            fps.append(str(fp))
+        print(f"{n_files} files, {n_objects} objects")
+
+        t = time.perf_counter()
+        Ini(name="largest").read(fps[weights.index(max(weights))])
+        print(f"read (largest file): {time.perf_counter() - t:.3f} s")
+
+        t = time.perf_counter()
+        ini_serial = Ini(name="all.spawn")
+        for fp in fps:
+            ini_serial.read(fp)
+        print(f"read (serial): {time.perf_counter() - t:.3f} s")
+
+        t = time.perf_counter()
+        ini = Ini(name="all.spawn")
+        ini.read_many(fps, max_workers=max_workers)
+        print(f"read_many: {time.perf_counter() - t:.3f} s")
+        assert list(ini.ids()) == list(ini_serial.ids())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Сравнение реализаций ``Ini.read_raw`` (``parser="fast"`` и ``"legacy"``)
+на синтетическом system.ltx.
+
+Запуск: ``python benchmarks/bench_read_raw.py [n_sections]``
+"""
+
+import sys
+import time
+
+from ip_ltx import Ini
+
+from synthetic import system_ltx
+
+
+def _measure(raw: str, parser: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        ini = Ini(name="system.ltx")
+        t = time.perf_counter()
+        ini.read_raw(raw, fp_src="system.ltx", parser=parser)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main() -> None:
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+    raw = system_ltx(n_sections)
+    print(f"system.ltx: {len(raw) / 1e6:.1f} MB, {raw.count("\n") + 1} lines")
+    t_legacy = _measure(raw, "legacy")
+    t_fast = _measure(raw, "fast")
+    print(f"legacy: {t_legacy:.3f} s")
+    print(f"fast:   {t_fast:.3f} s (x{t_legacy / t_fast:.2f})")
+
+
+if __name__ == "__main__":
+    main()
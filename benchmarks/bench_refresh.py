@@ -0,0 +1,72 @@
+"""Повторное чтение (``Ini.refresh``) синтетического system.ltx,
+разбитого на несколько include-файлов, после изменения одного из них.
+
+Запуск: ``python benchmarks/bench_refresh.py [n_sections] [n_files]``
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ip_ltx import Ini
+
+from synthetic import system_ltx
+
+
+def _split(raw: str, n_files: int) -> list[str]:
+    """Разбиение текста на части по границам секций."""
+    lines = raw.splitlines()
+    size = len(lines) // n_files + 1
+    parts, start = [], 0
+    while start < len(lines):
+        end = min(start + size, len(lines))
+        while (end < len(lines)) and not lines[end].startswith("["):
+            end += 1
+        parts.append("\n".join(lines[start:end]))
+        start = end
+    return parts
+
+
+def _touch(fp: Path, text: str) -> None:
+    fp.write_text(text)
+    st = fp.stat()
+    os.utime(fp, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def main() -> None:
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+    n_files = int(sys.argv[2]) if (len(sys.argv) > 2) else 20
+    parts = _split(system_ltx(n_sections), n_files)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "system.ltx"
+        names = [f"part_{i}.ltx" for i in range(len(parts))]
+        root.write_text("\n".join(f'#include "{name}"' for name in names))
+        for name, text in zip(names, parts):
+            (Path(tmp) / name).write_text(text)
+        print(f"system.ltx: {n_sections} sections in {len(parts)} files")
+
+        best = float("inf")
+        for _ in range(3):
+            t = time.perf_counter()
+            ini = Ini(name="system.ltx")
+            ini.read(str(root))
+            best = min(best, time.perf_counter() - t)
+        print(f"read: {best:.3f} s")
+
+        t = time.perf_counter()
+        ini.refresh()
+        print(f"refresh (nothing changed): {time.perf_counter() - t:.4f} s")
+
+        # Изменение значения в последней, средней и первой частях
+        for i in (len(parts) - 1, len(parts) // 2, 0):
+            fp = Path(tmp) / names[i]
+            _touch(fp, fp.read_text().replace(" = ", " =  ", 1))
+            t = time.perf_counter()
+            ini.refresh()
+            print(f"refresh ({names[i]} changed): {time.perf_counter() - t:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
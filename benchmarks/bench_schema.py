@@ -0,0 +1,80 @@
+"""Извлечение полей спавн-объектов (как в ``SpawnObject.init``) из синтетического
+all.spawn: цепочка ``get_*`` с обработкой исключений для каждого поля
+в сравнении со скомпилированной схемой (``Schema.extract_all``).
+
+Запуск: ``python benchmarks/bench_schema.py [n_objects]``
+"""
+
+import sys
+import time
+
+from ip_ltx import Ini, Section
+from ip_ltx.spawn import _SPAWN_OBJECT_SCHEMA
+
+from synthetic import alife_ltx
+
+
+def _extract_getters(section: Section) -> tuple[list, list[str]]:
+    """Прежний способ: отдельный ``get_*`` и ``try/except`` на каждое поле."""
+    errors, r = [], []
+    r.append(section.get_uint("spawn_id", -1))
+    for k in ("section_name", "name"):
+        r.append(section.get_string(k, ""))
+        if len(r[-1]) == 0:
+            errors.append(f"'{k}' is not specified")
+    for k in ("position", "direction"):
+        try:
+            tmp = section.get_floats(k)
+        except Exception as e:
+            errors.append(str(e))
+            r.append((0, 0, 0))
+        else:
+            r.append(tuple(tmp) if len(tmp) == 3 else (0, 0, 0))
+    for k in ("game_vertex_id", "level_vertex_id"):
+        try:
+            r.append(section.get_uint(k))
+        except Exception as e:
+            errors.append(str(e))
+            r.append(-1)
+    try:
+        r.append(int(section.get_string("object_flags"), 16))
+    except Exception as e:
+        errors.append(str(e))
+        r.append(-1)
+    r.append(section.get_string("custom_data", ""))
+    try:
+        r.append(section.get_int("story_id", -1))
+    except Exception as e:
+        errors.append(str(e))
+        r.append(-1)
+    return r, errors
+
+
+def main() -> None:
+    n_objects = int(sys.argv[1]) if (len(sys.argv) > 1) else 100000
+    raw = alife_ltx(n_objects)
+
+    def fresh() -> Ini:
+        ini = Ini(name="all.spawn")
+        ini.read_raw(raw)
+        for section in ini.sections():
+            section._over  # разбор ленивых секций - вне замеров
+        return ini
+
+    ini = fresh()
+    t = time.perf_counter()
+    expected = [_extract_getters(section) for section in ini.sections()]
+    print(f"get_* chain: {time.perf_counter() - t:.3f} s")
+
+    ini = fresh()
+    t = time.perf_counter()
+    extracted = list(_SPAWN_OBJECT_SCHEMA.extract_all(ini))
+    print(f"compiled schema: {time.perf_counter() - t:.3f} s")
+    for (r, errors), (_, fields, errors_schema) in zip(expected, extracted):
+        assert errors == errors_schema
+        assert r[3] == tuple(fields.position)
+        assert r[7] == int(fields.object_flags, 16)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Повторный запуск скрипта, читающего синтетический system.ltx:
+отдельным процессом и через сервер (``python -m ip_ltx.server``).
+
+Запуск: ``python benchmarks/bench_server.py [n_sections] [n_runs]``
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import system_ltx
+
+
+_SCRIPT = """
+META_FILEPATH = "meta.ltx"
+
+def main():
+    from ip_ltx.ini import system_ini
+    print(len(system_ini().ids()))
+
+if __name__ == "__main__":
+    import os
+    from pathlib import Path
+    os.environ["META_FILEPATH"] = str(Path(META_FILEPATH).resolve())
+    main()
+"""
+
+
+def main() -> None:
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+    n_runs = int(sys.argv[2]) if (len(sys.argv) > 2) else 3
+    with tempfile.TemporaryDirectory() as dir_tmp:
+        root = Path(dir_tmp)
+        root.joinpath("gamedata", "config").mkdir(parents=True)
+        root.joinpath("gamedata", "config", "system.ltx").write_text(system_ltx(n_sections))
+        root.joinpath("meta.ltx").write_text(
+            f"[settings]\ngamedata_path_mod = {root.joinpath('gamedata')}\n"
+        )
+        root.joinpath("script.py").write_text(_SCRIPT)
+        env = dict(os.environ, LTX_SERVER_FILE=str(root.joinpath("state.json")))
+        env.pop("LTX_CACHE_DIR", None)
+        cmd = [sys.executable, "-m", "ip_ltx.server"]
+
+        def timed(args: list[str]) -> float:
+            t = time.perf_counter()
+            subprocess.run(args, cwd=root, env=env, check=True, stdout=subprocess.DEVNULL)
+            return time.perf_counter() - t
+
+        times = [timed([sys.executable, "script.py"]) for _ in range(n_runs)]
+        print(f"separate processes: {min(times):.3f} s per run")
+
+        server = subprocess.Popen(cmd + ["serve"], cwd=root, env=env, stdout=subprocess.DEVNULL)
+        try:
+            while not root.joinpath("state.json").exists():
+                time.sleep(0.05)
+            times = [timed(cmd + ["run", "script.py"]) for _ in range(n_runs + 1)]
+            print(f"server, first run: {times[0]:.3f} s")
+            print(f"server, next runs: {min(times[1:]):.3f} s per run")
+        finally:
+            subprocess.run(cmd + ["stop"], env=env, stdout=subprocess.DEVNULL)
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Проверки ``ServerClasses.issubclass`` на большой синтетической иерархии
+``[server_classes]`` (как в ``ObjectTypeDetector.get_object_type``: каждый класс
+против всех правил): поиск пути в графе networkx и предвычисленное
+транзитивное замыкание.
+
+Запуск: ``python benchmarks/bench_server_classes.py [n_classes] [n_rules]``
+"""
+
+import random
+import sys
+import time
+
+import networkx as nx
+
+from ip_ltx import Ini
+from ip_ltx import ini as ini_module
+from ip_ltx.utils_meta import ServerClasses
+
+
+def _hierarchy(n_classes: int, seed: int = 3) -> str:
+    """Иерархия классов: у каждого - один или два родителя среди предыдущих."""
+    rnd = random.Random(seed)
+    lines = ["[server_classes]", "cse_0", "cse_1"]
+    for i in range(2, n_classes):
+        parents = {f"cse_{rnd.randrange(max(0, i - 50), i)}" for _ in range(rnd.randint(1, 2))}
+        lines.append(f"cse_{i} = {', '.join(sorted(parents))}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    n_classes = int(sys.argv[1]) if (len(sys.argv) > 1) else 5000
+    n_rules = int(sys.argv[2]) if (len(sys.argv) > 2) else 20
+    meta = Ini(name="meta.ltx")
+    meta.read_raw(_hierarchy(n_classes))
+    ini_module._INI_META = meta
+
+    t = time.perf_counter()
+    sc = meta.section("server_classes")
+    graph = nx.DiGraph()
+    graph.add_nodes_from(sc.lines())
+    for child in sc.lines():
+        for parent in sc.get_strings(child, mandatory=False):
+            graph.add_edge(child, parent)
+    nx.is_directed_acyclic_graph(graph)
+    print(f"networkx graph: build {time.perf_counter() - t:.3f} s")
+
+    t = time.perf_counter()
+    SC = ServerClasses()
+    print(f"ancestor table: build {time.perf_counter() - t:.3f} s")
+
+    rnd = random.Random(4)
+    classes = list(sc.lines())
+    rules = rnd.sample(classes[: n_classes // 4], n_rules)
+    queries = rnd.sample(classes, min(len(classes), 500))
+
+    t = time.perf_counter()
+    expected = [[nx.has_path(graph, q, r) for r in rules] for q in queries]
+    print(f"nx.has_path: {time.perf_counter() - t:.3f} s ({len(queries) * n_rules} queries)")
+
+    t = time.perf_counter()
+    actual = [[SC.issubclass(q, r) for r in rules] for q in queries]
+    print(f"issubclass: {time.perf_counter() - t:.3f} s")
+    assert actual == expected
+
+
+if __name__ == "__main__":
+    main()
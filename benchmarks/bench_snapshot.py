@@ -0,0 +1,53 @@
+"""Открытие файла снимка ``FrozenIni`` синтетического system.ltx
+и выборка нескольких секций: поиск по хэш-таблице снимка
+в сравнении с чтением ltx-файла и построением словаря ID в памяти.
+
+Запуск: ``python benchmarks/bench_snapshot.py [n_sections] [n_lookups]``
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from ip_ltx import Ini
+from ip_ltx.ini_frozen import FrozenIni
+
+from synthetic import system_ltx
+
+
+def main() -> None:
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 50000
+    n_lookups = int(sys.argv[2]) if (len(sys.argv) > 2) else 100
+    with tempfile.TemporaryDirectory() as tmp:
+        fp_ltx = Path(tmp) / "system.ltx"
+        fp_ltx.write_text(system_ltx(n_sections))
+        fp = str(Path(tmp) / "system.frozen")
+        ini = Ini(name="system.ltx")
+        ini.read(str(fp_ltx))
+        FrozenIni.from_ini(ini).dump(fp)
+        ids = random.Random(1).sample(list(ini.ids()), n_lookups)
+        print(f"system.ltx: {n_sections} sections, {n_lookups} lookups")
+
+        t = time.perf_counter()
+        ini = Ini(name="system.ltx")
+        ini.read(str(fp_ltx))
+        values = [ini.get_string(_id, "field_0", "") for _id in ids]
+        print(f"read ltx + lookups: {time.perf_counter() - t:.3f} s")
+
+        t = time.perf_counter()
+        frozen = FrozenIni.open(fp)
+        pos = {frozen._str(s): i for i, s in enumerate(frozen._sec_id)}
+        values_dict = [frozen._section(pos[_id]).get_string("field_0", "") for _id in ids]
+        print(f"open snapshot + id dict + lookups: {time.perf_counter() - t:.4f} s")
+
+        t = time.perf_counter()
+        frozen = FrozenIni.open(fp)
+        values_hash = [frozen.get_string(_id, "field_0", "") for _id in ids]
+        print(f"open snapshot + hash lookups: {time.perf_counter() - t:.4f} s")
+        assert values == values_dict == values_hash
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Повторные типизированные чтения полей (``get_*``) из секций
+синтетического system.ltx.
+
+Запуск: ``python benchmarks/bench_typed_getters.py [n_sections] [n_passes]``
+"""
+
+import sys
+import time
+
+from ip_ltx import Ini, Section
+
+from synthetic import system_ltx
+
+
+def _pass(ini: Ini) -> None:
+    for section in ini.sections():
+        for field, value in section.fields():
+            if value is None:
+                continue
+            if value.isdecimal():
+                section.get_uint(field)
+            elif "," in value:
+                section.get_strings(field)
+            else:
+                section.get_string(field)
+
+
+def main() -> None:
+    n_sections = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+    n_passes = int(sys.argv[2]) if (len(sys.argv) > 2) else 5
+    ini = Ini(name="system.ltx")
+    ini.read_raw(system_ltx(n_sections), fp_src="system.ltx")
+
+    Section.memo_reset_stats()
+    for i in range(n_passes):
+        t = time.perf_counter()
+        _pass(ini)
+        print(f"pass #{i + 1}: {time.perf_counter() - t:.3f} s")
+    hits, misses = Section.memo_stats()
+    print(f"memo: {hits} hits, {misses} misses")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Генератор синтетических ltx-файлов для бенчмарков."""
+
+import random
+
+
+def system_ltx(n_sections: int = 20000, seed: int = 1) -> str:
+    """Текст, похожий на system.ltx: глубокие иерархии наследования,
+    комментарии, значения-списки, значения в кавычках.
+
+    :param n_sections: Число секций.
+    :param seed: Зерно генератора случайных чисел.
+    """
+    rnd = random.Random(seed)
+    lines = ["; synthetic system.ltx", ""]
+    ids: list[str] = []
+    for i in range(n_sections):
+        sid = f"wpn_item_{i}"
+        if ids and (rnd.random() < 0.7):
+            parents = rnd.sample(ids[-50:], k=min(len(ids), 1 if (rnd.random() < 0.9) else 2))
+            lines.append(f"[{sid}]:{','.join(parents)}  ; comment")
+        else:
+            lines.append(f"[{sid}]")
+        for j in range(rnd.randint(5, 40)):
+            r = rnd.random()
+            if r < 0.3:
+                lines.append(f"field_{j}  = {rnd.randint(0, 1000)}  ; some comment")
+            elif r < 0.5:
+                lines.append((
+                    f"field_{j} = {rnd.random():.4f}, "
+                    f"{rnd.random():.4f}, {rnd.random():.4f}"
+                ))
+            elif r < 0.6:
+                lines.append(f'field_{j} = "quoted value {j}"')
+            elif r < 0.7:
+                lines.append(f"; commented line {j}")
+            elif r < 0.75:
+                lines.append("")
+            elif r < 0.8:
+                lines.append(f"flag_{j}")
+            else:
+                lines.append(f"\tfield_{j}\t=\tsome_name_{rnd.randint(0, 100)}")
+        ids.append(sid)
+        lines.append("")
+    return "\n".join(lines)
+
+
+def alife_ltx(n_objects: int = 20000, seed: int = 2) -> str:
+    """Текст, похожий на декомпилированный all.spawn (``alife_*.ltx``):
+    плоские секции без наследования, многострочные ``custom_data``.
+
+    :param n_objects: Число спавн-объектов.
+    :param seed: Зерно генератора случайных чисел.
+    """
+    rnd = random.Random(seed)
+    lines = []
+    for i in range(n_objects):
+        lines.extend([
+            f"[{i}]",
+            "; cse_abstract properties",
+            f"section_name = item_{rnd.randint(0, 300)}",
+            f"name = item_{i}",
+            f"position = {rnd.uniform(-500, 500):.4f},"
+            f" {rnd.uniform(-50, 50):.4f}, {rnd.uniform(-500, 500):.4f}",
+            "direction = 0, 0, 0",
+            "",
+            "; cse_alife_object properties",
+            f"game_vertex_id = {rnd.randint(0, 3000)}",
+            f"distance = {rnd.uniform(0, 10):.6f}",
+            f"level_vertex_id = {rnd.randint(0, 300000)}",
+            "object_flags = 0xffffffbf",
+        ])
+        if rnd.random() < 0.2:
+            lines.extend([
+                "custom_data = <<END",
+                "[spawn]",
+                f"item_{rnd.randint(0, 300)} = 1",
+                "END",
+            ])
+        lines.append(f"story_id = {i}" if (rnd.random() < 0.05) else "")
+        lines.append("")
+    return "\n".join(lines)
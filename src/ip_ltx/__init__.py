@@ -4,11 +4,26 @@ if sys.version_info < (3, 12):
 
 from .ip_ltx import Section, Ini
 
-import importlib.metadata
-try:
-    __version__ = importlib.metadata.version("ip_ltx")
-except importlib.metadata.PackageNotFoundError:
-    __version__ = "unknown"
-
 __author__ = "Vova Miller"
 __email__ = "vovamiller_97@mail.ru"
+
+
+def __getattr__(name: str):
+    # Версия и подмодули (ip_ltx.spawn, ip_ltx.server, ...) загружаются
+    # при первом обращении, чтобы `import ip_ltx` оставался быстрым.
+    if name == "__version__":
+        import importlib.metadata
+        try:
+            version = importlib.metadata.version("ip_ltx")
+        except importlib.metadata.PackageNotFoundError:
+            version = "unknown"
+        globals()["__version__"] = version
+        return version
+    if not name.startswith("_"):
+        import importlib
+        try:
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -40,7 +40,6 @@ import shutil
 import subprocess
 import traceback
 from pathlib import Path
-from pathvalidate import is_valid_filename
 from typing import TextIO
 
 from ..ip_ltx import Ini, Section
@@ -184,6 +183,7 @@ def build(
         return False
     
     # Проверка имён файлов
+    from pathvalidate import is_valid_filename
     filenames_ok = True
     for filename in itertools.chain(alife_list, way_list):
         if not is_valid_filename(filename):
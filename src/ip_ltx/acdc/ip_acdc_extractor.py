@@ -18,8 +18,8 @@ import re
 import shutil
 import subprocess
 import traceback
+from collections.abc import Iterable
 from pathlib import Path
-from pathvalidate import is_valid_filename
 from typing import TextIO
 
 from ..ip_ltx import Ini, Section
@@ -56,7 +56,7 @@ class Printer:
 
 
 def _ini_write(
-        ini: Ini,
+        sections: Iterable[Section],
         file: TextIO,
         extraction_rules: dict[str, str],
         exceptions: set[str],
@@ -94,7 +94,7 @@ def _ini_write(
         else {*exceptions_hide_fields}
     )
 
-    for base_section in ini.sections():
+    for base_section in sections:
         if not base_section.line_exist("name"):
             print_warning(f"[{base_section.id}] Skipped: no 'name'")
             continue
@@ -232,6 +232,7 @@ def extract(
         return False
     
     # Проверка имён файлов
+    from pathvalidate import is_valid_filename
     filenames_ok = True
     for filename in alife_list:
         if not is_valid_filename(filename):
@@ -257,14 +258,14 @@ def extract(
         print_warning("No alife_*.ltx files")
     else:
         for i, fn in enumerate(alife_list):
+            input_fp = str(input_path.joinpath(fn))
+            output_fp = str(output_path.joinpath(f"_{fn}"))
             try:
-                input_fp = str(input_path.joinpath(fn))
-                output_fp = str(output_path.joinpath(f"_{fn}"))
-                ini = Ini()
-                ini.read(input_fp)
+                # Секции обрабатываются по мере чтения, без загрузки всего файла
+                sections = Ini().iter_sections(input_fp)
                 with open(output_fp, "w", encoding="utf-8") as file:
                     _ini_write(
-                        ini,
+                        sections,
                         file,
                         extraction_rules,
                         exceptions,
@@ -273,6 +274,8 @@ def extract(
                         keep_universal_acdc_format
                     )
             except Exception:
+                # Результат мог быть записан частично
+                Path(output_fp).unlink(missing_ok=True)
                 print("")
                 print(
                     f"{ANSI_COLOR_CODE.RED}-{ANSI_COLOR_CODE.DEF}",
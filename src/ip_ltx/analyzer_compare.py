@@ -1,6 +1,7 @@
 """Функции для сравнения секций"""
 
 from .ini import system_ini
+from .ini_diff import diff_sections
 from .utils import run
 
 # ----------------------------------------------------------------
@@ -22,14 +23,11 @@ def _compare_sections(fn: str, s1_id: str, s2_id: str) -> None:
     s2 = ini_system.section(s2_id)
 
     # collecting diff info
-    fields_unique_1 = [k for k in s1._fields.keys() if k not in s2._fields]
-    fields_unique_2 = [k for k in s2._fields.keys() if k not in s1._fields]
-    fields_diff = []
-    for k in s1._fields.keys():
-        if k in s2._fields:
-            v1, v2 = s1._fields[k], s2._fields[k]
-            if v1 != v2:
-                fields_diff.append(k)
+    sd = diff_sections(s1, s2)
+    changes = sd.fields if (sd is not None) else ()
+    fields_unique_1 = [fc.field for fc in changes if fc.kind == "removed"]
+    fields_unique_2 = [fc.field for fc in changes if fc.kind == "added"]
+    fields_diff = [fc.field for fc in changes if fc.kind == "changed"]
 
     # writing down
     with open(fn, "w", encoding="utf-8") as file:
@@ -8,7 +8,6 @@ import random
 from collections import Counter
 from collections.abc import Callable
 from pathlib import Path, PureWindowsPath
-from pathvalidate import is_valid_filepath
 from typing import TextIO
 
 from .ip_ltx import Ini, Section
@@ -467,6 +466,7 @@ class CharacterFactory:
                     _err(f"<{field}> Empty string")
         
         # Validating and uniforming: <visual>, <snd_config>
+        from pathvalidate import is_valid_filepath
         if hasattr(self, "visual"):
             if is_valid_filepath(self.visual):
                 self.visual = str(PureWindowsPath(self.visual)).removesuffix(".ogf")
@@ -1,6 +1,9 @@
 import os
+import threading
 from pathlib import Path
 
+from . import registry
+from .ini_cache import cached_ini
 from .ip_ltx import Ini
 
 
@@ -9,6 +12,13 @@ _INI_SYSTEM = None
 _INI_SPAWN = None
 _INI_GAME = None
 
+_LOCK_META = threading.Lock()
+_LOCK_SYSTEM = threading.Lock()
+_LOCK_SPAWN = threading.Lock()
+_LOCK_GAME = threading.Lock()
+# Getter-ы могут вызываться одновременно из разных потоков (см. preload):
+# экземпляр создаётся один раз, под блокировкой своего getter-а.
+
 def _read_ini_meta():
     meta_fp = os.environ.get("META_FILEPATH", "")
     if len(meta_fp) == 0:
@@ -24,13 +34,15 @@ def _read_ini_system():
     ini.read("config\\system.ltx", inside_gamedata=True)
     return ini
 
-def _read_ini_spawn():
-    ini = Ini(name="all.spawn", ini_meta=meta_ini())
+def _spawn_paths() -> list[str]:
     sect_db = meta_ini()._s.get("spawn", None)
     if sect_db is None:
         raise Exception("meta-file doesn't have mandatory section [spawn]")
-    for path in sect_db._fields.keys():
-        ini.read(path, inside_gamedata=True)
+    return list(sect_db._fields.keys())
+
+def _read_ini_spawn():
+    ini = Ini(name="all.spawn", ini_meta=meta_ini())
+    ini.read_many(_spawn_paths(), inside_gamedata=True)
     return ini
 
 def _read_ini_game():
@@ -38,28 +50,62 @@ def _read_ini_game():
     ini.read("config\\game.ltx", inside_gamedata=True)
     return ini
 
+def _cache_key(*extra) -> tuple:
+    """Параметры meta-файла, от которых зависит результат чтения из gamedata."""
+    ini = meta_ini()
+    return (
+        ini.get_string_wb("settings", "gamedata_path_mod", ""),
+        ini.get_string_wb("settings", "gamedata_path_alt", ""),
+        *extra,
+    )
+
 # ----------------------------------------------------------------
 
 def meta_ini() -> Ini:
     global _INI_META
     if _INI_META is None:
-        _INI_META = _read_ini_meta()
+        with _LOCK_META:
+            if _INI_META is None:
+                _INI_META = _read_ini_meta()
     return _INI_META
 
 def system_ini() -> Ini:
     global _INI_SYSTEM
     if _INI_SYSTEM is None:
-        _INI_SYSTEM = _read_ini_system()
+        with _LOCK_SYSTEM:
+            if _INI_SYSTEM is None:
+                _INI_SYSTEM = cached_ini("system", _cache_key(), _read_ini_system)
     return _INI_SYSTEM
 
 def spawn_ini() -> Ini:
     global _INI_SPAWN
     if _INI_SPAWN is None:
-        _INI_SPAWN = _read_ini_spawn()
+        with _LOCK_SPAWN:
+            if _INI_SPAWN is None:
+                _INI_SPAWN = cached_ini(
+                    "spawn", _cache_key(*_spawn_paths()), _read_ini_spawn
+                )
     return _INI_SPAWN
 
 def game_ini() -> Ini:
     global _INI_GAME
     if _INI_GAME is None:
-        _INI_GAME = _read_ini_game()
+        with _LOCK_GAME:
+            if _INI_GAME is None:
+                _INI_GAME = cached_ini("game", _cache_key(), _read_ini_game)
     return _INI_GAME
+
+# ----------------------------------------------------------------
+
+def _register(name: str, attr: str, inputs: tuple[str, ...]) -> None:
+    def reset():
+        globals()[attr] = None
+    registry.register(
+        name, lambda: globals()[attr], reset, inputs,
+        files=lambda ini: ini._deps, update=Ini.refresh
+    )
+
+_register("meta_ini", "_INI_META", ())
+_register("system_ini", "_INI_SYSTEM", ("meta_ini",))
+_register("spawn_ini", "_INI_SPAWN", ("meta_ini",))
+_register("game_ini", "_INI_GAME", ("meta_ini",))
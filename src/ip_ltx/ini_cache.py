@@ -0,0 +1,136 @@
+"""
+ini_cache
+=========
+
+Опциональный дисковый кэш считанных экземпляров :class:`Ini`.
+
+Кэш включается установкой переменной окружения ``LTX_CACHE_DIR``
+(путь до папки, в которой будут храниться файлы кэша).
+Если переменная не задана, то кэш не используется.
+
+Запись кэша считается актуальной, если для каждого файла,
+от которого зависит экземпляр (см. :attr:`Ini._deps`),
+совпадают размер и время последнего изменения.
+В т.ч. учитываются файлы, которые при чтении были проверены, но не найдены:
+их появление также делает запись неактуальной.
+
+При загрузке из кэша warning-сообщения, выведенные при исходном
+чтении файлов, повторно не выводятся.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+from .ip_ltx import Ini
+from .utils import file_signature, print_warning
+
+
+_FORMAT_VERSION = 7
+"""Версия формата записи. Увеличивается при изменении структуры
+классов :class:`Ini` и :class:`Section`, чтобы старые записи не считывались."""
+
+
+def cache_dir() -> Path | None:
+    """Папка кэша, заданная переменной окружения ``LTX_CACHE_DIR``.
+
+    :return: Путь до папки или None, если кэш выключен.
+    """
+    dir_str = os.environ.get("LTX_CACHE_DIR", "")
+    if len(dir_str) == 0:
+        return None
+    return Path(dir_str)
+
+
+def _entry_path(dir_cache: Path, tag: str, key: tuple) -> Path:
+    digest = hashlib.sha1(repr((tag, key)).encode("utf-8")).hexdigest()
+    return dir_cache.joinpath(f"{tag}-{digest[:16]}.pickle")
+
+
+def deps_actual(deps: dict[str, tuple[int, int] | None]) -> bool:
+    """Проверка, что ни один из файлов-зависимостей не изменился.
+
+    :param deps: Зависимости в формате :attr:`Ini._deps`.
+    """
+    return all((file_signature(fp) == sig) for fp, sig in deps.items())
+
+
+def load(tag: str, key: tuple) -> Ini | None:
+    """Загрузка экземпляра из кэша.
+
+    :param tag: Короткое имя записи (используется в имени файла).
+    :param key: Прочие параметры, от которых зависит результат чтения
+        (например, пути до папок gamedata). Должны иметь стабильный ``repr``.
+    :return: Экземпляр из кэша или None, если кэш выключен,
+        записи нет или она неактуальна.
+    """
+    dir_cache = cache_dir()
+    if dir_cache is None:
+        return None
+    fp = _entry_path(dir_cache, tag, key)
+    try:
+        with open(fp, "rb") as file:
+            version, entry_key, ini = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print_warning(f"[ini_cache] Broken cache entry ignored ({fp.name}): {e}")
+        return None
+    if (version != _FORMAT_VERSION) or (entry_key != (tag, key)):
+        return None
+    if not isinstance(ini, Ini) or not deps_actual(ini._deps):
+        return None
+    return ini
+
+
+def store(tag: str, key: tuple, ini: Ini) -> None:
+    """Сохранение экземпляра в кэш.
+
+    Ничего не делает, если кэш выключен.
+    Запись производится атомарно (через временный файл).
+
+    :param tag: Короткое имя записи.
+    :param key: Прочие параметры, от которых зависит результат чтения.
+    :param ini: Сохраняемый экземпляр.
+    """
+    dir_cache = cache_dir()
+    if dir_cache is None:
+        return
+    dir_cache.mkdir(parents=True, exist_ok=True)
+    fp = _entry_path(dir_cache, tag, key)
+    fd, fp_tmp = tempfile.mkstemp(dir=dir_cache, prefix=f"{fp.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump(
+                (_FORMAT_VERSION, (tag, key), ini),
+                file,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+        os.replace(fp_tmp, fp)
+    except BaseException:
+        if os.path.exists(fp_tmp):
+            os.remove(fp_tmp)
+        raise
+
+
+def cached_ini(tag: str, key: tuple, builder: Callable[[], Ini]) -> Ini:
+    """Получить экземпляр из кэша или построить его заново.
+
+    Если кэш выключен, то просто вызывает ``builder``.
+
+    :param tag: Короткое имя записи (используется в имени файла).
+    :param key: Прочие параметры, от которых зависит результат чтения.
+    :param builder: Функция, строящая экземпляр с нуля.
+    :return: Актуальный экземпляр :class:`Ini`.
+    """
+    ini = load(tag, key)
+    if ini is None:
+        ini = builder()
+        try:
+            store(tag, key, ini)
+        except OSError as e:
+            print_warning(f"[ini_cache] Unable to store cache entry '{tag}': {e}")
+    return ini
@@ -0,0 +1,243 @@
+"""
+ini_diff
+========
+
+Сравнение двух экземпляров :class:`Ini` (например, до и после установки
+правки мода или двух декомпилированных all.spawn).
+
+Результат - структурированные записи (:class:`IniDiff`, :class:`SectionDiff`,
+:class:`FieldChange`), которые можно вывести текстом или в формате ltx
+(см. :func:`IniDiff.write`).
+
+Поиск изменившихся секций выполняется по хэшам содержимого
+(см. :func:`Ini.differing_ids`), поэтому время сравнения линейно по числу
+секций, а поля сравниваются только у изменившихся.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Literal, TextIO
+
+from .ip_ltx import Ini, Section
+
+
+type ChangeKind = Literal["added", "removed", "changed"]
+
+
+@dataclass(slots=True, frozen=True)
+class FieldChange:
+    """Изменение одного поля секции."""
+    field: str
+    kind: ChangeKind
+    old: str | None
+    """Прежнее значение (``None`` - поле без значения или его не было)."""
+    new: str | None
+    """Новое значение (``None`` - поле без значения или его не стало)."""
+
+
+@dataclass(slots=True, frozen=True)
+class SectionDiff:
+    """Изменения одной секции."""
+    id: str
+    kind: ChangeKind
+    fields: tuple[FieldChange, ...]
+    """Изменения полей. Для добавленной (удалённой) секции - все её поля
+    как добавленные (удалённые)."""
+    parents: tuple[str, ...]
+    """Родители секции (см. :attr:`Section.parents`);
+    для удалённой секции - из прежней версии."""
+    parents_old: tuple[str, ...] | None
+    """Прежние родители, если наследование изменилось."""
+    order_changed: bool
+    """Изменился порядок полей, общих для обеих версий секции."""
+
+
+@dataclass(slots=True, frozen=True)
+class IniDiff:
+    """Различия двух экземпляров :class:`Ini` (см. :func:`diff`)."""
+    sections: tuple[SectionDiff, ...]
+    """Изменения секций: добавленные и изменённые - в порядке новой версии,
+    затем удалённые - в порядке прежней."""
+    moved: tuple[str, ...]
+    """Общие секции, изменившие положение относительно остальных
+    (минимальный набор, без которого порядок общих секций совпадает)."""
+
+    def __bool__(self) -> bool:
+        return (len(self.sections) > 0) or (len(self.moved) > 0)
+
+    def by_kind(self, kind: ChangeKind) -> list[SectionDiff]:
+        """Изменения секций указанного вида."""
+        return [sd for sd in self.sections if sd.kind == kind]
+
+    def write(self, file: TextIO, fmt: Literal["text", "ltx"] = "text") -> None:
+        """Вывод различий.
+
+        :param file: Файл для вывода.
+        :param fmt: Формат:
+
+            * ``text`` - отчёт: списки добавленных, удалённых,
+              перемещённых секций и изменения полей.
+            * ``ltx`` - секции новой версии только с добавленными и изменёнными
+              полями; удалённые поля и секции выводятся комментариями.
+
+        :raises ValueError: при неизвестном формате.
+        """
+        match fmt:
+            case "text":
+                _write_text(self, file)
+            case "ltx":
+                _write_ltx(self, file)
+            case _:
+                raise ValueError(f"Unknown diff format: {fmt}")
+
+# ----------------------------------------------------------------
+
+def diff_sections(old: Section, new: Section) -> SectionDiff | None:
+    """Сравнение двух секций (ID не сравниваются).
+
+    :return: Изменения или None, если поля, их порядок и родители совпадают.
+    """
+    fields_old, fields_new = old._resolved(), new._resolved()
+    changes = []
+    for k, v in fields_old.items():
+        if k not in fields_new:
+            changes.append(FieldChange(k, "removed", v, None))
+        elif fields_new[k] != v:
+            changes.append(FieldChange(k, "changed", v, fields_new[k]))
+    for k, v in fields_new.items():
+        if k not in fields_old:
+            changes.append(FieldChange(k, "added", None, v))
+    order_changed = (
+        [k for k in fields_old if k in fields_new]
+        != [k for k in fields_new if k in fields_old]
+    )
+    parents_old = old.parents if (old.parents != new.parents) else None
+    if (len(changes) == 0) and not order_changed and (parents_old is None):
+        return None
+    return SectionDiff(
+        new.id, "changed", tuple(changes), new.parents, parents_old, order_changed
+    )
+
+
+def diff(old: Ini, new: Ini) -> IniDiff:
+    """Сравнение двух экземпляров.
+
+    Секции с одинаковым содержимым отсеиваются по хэшам
+    (см. :func:`Ini.differing_ids`); у остальных сравниваются поля.
+    Родители (см. :attr:`Section.parents`) в хэш не входят
+    и сравниваются у всех общих секций.
+
+    :param old: Прежняя версия.
+    :param new: Новая версия.
+    """
+    s_old, s_new = old._s, new._s
+    ids = old.differing_ids(new)
+    for _id, section in s_new.items():
+        if _id in ids:
+            continue
+        section_old = s_old.get(_id, None)
+        if (section_old is not None) and (section_old.parents != section.parents):
+            ids.add(_id)
+
+    changed: list[SectionDiff] = []
+    removed: list[SectionDiff] = []
+    for _id in ids:
+        section_old, section_new = s_old.get(_id, None), s_new.get(_id, None)
+        if section_old is None:
+            changed.append(SectionDiff(_id, "added", tuple(
+                FieldChange(k, "added", None, v) for k, v in section_new.fields()
+            ), section_new.parents, None, False))
+        elif section_new is None:
+            removed.append(SectionDiff(_id, "removed", tuple(
+                FieldChange(k, "removed", v, None) for k, v in section_old.fields()
+            ), section_old.parents, None, False))
+        elif (sd := diff_sections(section_old, section_new)) is not None:
+            changed.append(sd)
+    pos_old = {_id: i for i, _id in enumerate(s_old)}
+    pos_new = {_id: i for i, _id in enumerate(s_new)}
+    changed.sort(key=lambda sd: pos_new[sd.id])
+    removed.sort(key=lambda sd: pos_old[sd.id])
+    return IniDiff(tuple(changed + removed), _moved(s_old, pos_new))
+
+
+def _moved(s_old: dict[str, Section], pos_new: dict[str, int]) -> tuple[str, ...]:
+    """Общие секции вне наибольшей возрастающей подпоследовательности
+    позиций (в новой версии) при порядке прежней версии. O(n log n).
+    """
+    common = [_id for _id in s_old if _id in pos_new]
+    tails: list[int] = []      # минимальный последний элемент для каждой длины
+    tails_idx: list[int] = []  # индекс этого элемента в common
+    prev = [-1] * len(common)
+    for i, _id in enumerate(common):
+        p = pos_new[_id]
+        j = bisect_left(tails, p)
+        if j == len(tails):
+            tails.append(p)
+            tails_idx.append(i)
+        else:
+            tails[j] = p
+            tails_idx[j] = i
+        prev[i] = tails_idx[j - 1] if (j > 0) else -1
+    kept = set()
+    i = tails_idx[-1] if tails_idx else -1
+    while i != -1:
+        kept.add(i)
+        i = prev[i]
+    return tuple(_id for i, _id in enumerate(common) if i not in kept)
+
+# ----------------------------------------------------------------
+
+def _fmt_field(k: str, v: str | None) -> str:
+    return k if (v is None) else f"{k} = {v}"
+
+def _fmt_decl(_id: str, parents: tuple[str, ...]) -> str:
+    return f"[{_id}]:{', '.join(parents)}" if (len(parents) > 0) else f"[{_id}]"
+
+def _write_text(d: IniDiff, file: TextIO) -> None:
+    for kind, title in (("added", "Added"), ("removed", "Removed")):
+        file.write(f"## {title} sections\n")
+        sections = d.by_kind(kind)
+        for sd in sections:
+            file.write(f"{sd.id}\n")
+        file.write("\n" if (len(sections) > 0) else "-\n\n")
+
+    file.write("## Moved sections\n")
+    for _id in d.moved:
+        file.write(f"{_id}\n")
+    file.write("\n" if (len(d.moved) > 0) else "-\n\n")
+
+    file.write("## Changed sections\n")
+    sections = d.by_kind("changed")
+    if len(sections) == 0:
+        file.write("-\n")
+    for sd in sections:
+        file.write(f"\n[{sd.id}]\n")
+        if sd.parents_old is not None:
+            file.write(
+                f"; parents: {', '.join(sd.parents_old) or '-'}"
+                f" -> {', '.join(sd.parents) or '-'}\n"
+            )
+        if sd.order_changed:
+            file.write("; fields order changed\n")
+        for fc in sd.fields:
+            match fc.kind:
+                case "added":
+                    file.write(f"+ {_fmt_field(fc.field, fc.new)}\n")
+                case "removed":
+                    file.write(f"- {_fmt_field(fc.field, fc.old)}\n")
+                case "changed":
+                    file.write(f"- {_fmt_field(fc.field, fc.old)}\n")
+                    file.write(f"+ {_fmt_field(fc.field, fc.new)}\n")
+
+def _write_ltx(d: IniDiff, file: TextIO) -> None:
+    for sd in d.sections:
+        if sd.kind == "removed":
+            file.write(f"; removed: [{sd.id}]\n\n")
+            continue
+        file.write(f"{_fmt_decl(sd.id, sd.parents)}\n")
+        for fc in sd.fields:
+            if fc.kind == "removed":
+                file.write(f"; removed: {_fmt_field(fc.field, fc.old)}\n")
+            else:
+                file.write(f"{_fmt_field(fc.field, fc.new)}\n")
+        file.write("\n")
@@ -0,0 +1,396 @@
+"""
+ini_frozen
+==========
+
+Неизменяемый снимок :class:`Ini` (:class:`FrozenIni`) в компактном
+плоском формате: одна таблица строк и массивы смещений (``uint32``)
+в едином буфере байтов.
+
+Снимок предназначен для передачи данных (system.ltx, all.spawn)
+в процессы-обработчики (``multiprocessing``, ``ProcessPoolExecutor``)
+без повторного чтения файлов и без сериализации словарей каждой секции:
+
+* Сериализация (``pickle``) - это копия одного буфера; снимок,
+  открытый из файла (см. :func:`FrozenIni.open`), передаётся только
+  путём, и каждый процесс отображает тот же файл в память (``mmap``).
+* Буфер может быть и внешним (например, ``SharedMemory.buf``,
+  см. :func:`FrozenIni.from_buffer`): данные не копируются.
+* При ``fork`` дочерний процесс не трогает счётчики ссылок объектов
+  каждой секции, поэтому страницы памяти снимка остаются общими.
+
+Поля секций хранятся уже с учётом наследования (как :func:`Section.fields`),
+ID родителей - как :attr:`Section.parents`.
+Секции возвращаются новыми объектами :class:`Section` при каждом обращении.
+
+Формат
+------
+
+Файл снимка (см. :func:`FrozenIni.dump`) можно поставлять вместе с инструментами
+(например, снимок оригинальной gamedata) и открывать без чтения ltx-файлов:
+при :func:`FrozenIni.open` ничего не разбирается, а поиск секции по ID
+и её декодирование затрагивают только нужные страницы файла.
+
+Все числа - ``uint32`` в порядке байтов little-endian; размеры и смещения
+массивов - в 4-байтовых словах, строк - в байтах. Подряд идут:
+
+#. Заголовок (9 слов): ``b"LTXF"``, версия формата, размер снимка в байтах,
+   индекс строки имени экземпляра, число строк ``S``, секций ``N``,
+   ссылок на родителей ``P``, полей ``F`` и размер хэш-таблицы ``H``.
+#. Смещения строк в пуле (``S + 1``): строка ``i`` -
+   ``pool[off[i]:off[i + 1]]``.
+#. Хэш-таблица ID секций (``H``, степень двойки не меньше ``2N``):
+   открытая адресация с линейным пробированием от ``crc32(id) mod H``;
+   значение - номер секции плюс один, ``0`` - пустая ячейка.
+#. Индексы строк ID секций (``N``) в порядке объявления.
+#. Смещения родителей секций (``N + 1``) и индексы строк ID родителей (``P``).
+#. Смещения полей секций (``N + 1``), индексы строк имён полей (``F``)
+   и значений (``F``; ``0xFFFFFFFF`` - поле без значения).
+#. Пул строк в UTF-8 (одинаковые строки хранятся один раз).
+"""
+
+import mmap
+import sys
+import zlib
+from array import array
+from collections.abc import Buffer, Iterator
+from typing import Literal, NoReturn, Self
+
+from .ip_ltx import Ini, Section
+
+
+_MAGIC = b"LTXF"
+_VERSION = 2
+"""Версия формата (см. описание модуля)."""
+
+_NONE = 0xFFFFFFFF
+"""Индекс строки для поля без значения."""
+
+_HEADER_WORDS = 9
+
+
+class FrozenIni:
+    """Неизменяемый снимок экземпляра :class:`Ini`.
+
+    Создаётся через :func:`from_ini`, :func:`from_buffer` или :func:`open`.
+    Поддерживает методы чтения :class:`Ini` (``section``, ``ids``,
+    ``section_exist``, ``get_*``, ...).
+    """
+    __slots__ = (
+        "name", "_buf", "_mm", "_fp", "_str_off", "_str_data", "_hash", "_sec_id",
+        "_par_off", "_par", "_fld_off", "_keys", "_values",
+    )
+
+    name: str
+    _buf: memoryview
+    _mm: mmap.mmap | None
+    """Отображение файла (см. :func:`open`), которое нужно держать открытым."""
+    _fp: str | None
+    """Путь до файла снимка, если снимок открыт из файла."""
+    _str_off: memoryview
+    """Смещения строк в ``_str_data`` (на одно больше числа строк)."""
+    _str_data: memoryview
+    _hash: memoryview
+    """Хэш-таблица ID секций (см. описание модуля)."""
+    _sec_id: memoryview
+    """Индекс строки ID для каждой секции."""
+    _par_off: memoryview
+    _par: memoryview
+    """Индексы строк ID родителей; секции i - ``_par[_par_off[i]:_par_off[i + 1]]``."""
+    _fld_off: memoryview
+    _keys: memoryview
+    _values: memoryview
+    """Индексы строк имён и значений полей; секции i -
+    ``[_fld_off[i]:_fld_off[i + 1]]``."""
+
+    def __init__(
+            self,
+            buf: Buffer,
+            _mm: mmap.mmap | None = None,
+            _fp: str | None = None
+    ):
+        if sys.byteorder != "little":
+            raise ValueError("FrozenIni requires a little-endian machine")
+        mv = memoryview(buf).cast("B")
+        if (len(mv) < 4 * _HEADER_WORDS) or (mv[:4] != _MAGIC):
+            raise ValueError("Not a FrozenIni buffer")
+        header = mv[:4 * _HEADER_WORDS].cast("I")
+        version, size, name, n_str, n_sec, n_par, n_fld, n_hash = header[1:]
+        if version != _VERSION:
+            raise ValueError(f"Unsupported FrozenIni format (version {version})")
+        if size > len(mv):
+            raise ValueError("FrozenIni buffer is truncated")
+        self._buf = mv[:size]
+        self._mm = _mm
+        self._fp = _fp
+
+        pos = 4 * _HEADER_WORDS
+        def take(n: int) -> memoryview:
+            nonlocal pos
+            view = mv[pos:pos + 4 * n].cast("I")
+            pos += 4 * n
+            return view
+        self._str_off = take(n_str + 1)
+        self._hash = take(n_hash)
+        self._sec_id = take(n_sec)
+        self._par_off = take(n_sec + 1)
+        self._par = take(n_par)
+        self._fld_off = take(n_sec + 1)
+        self._keys = take(n_fld)
+        self._values = take(n_fld)
+        self._str_data = mv[pos:size]
+        self.name = self._str(name)
+
+    def __reduce__(self):
+        if self._fp is not None:
+            return (FrozenIni.open, (self._fp,))
+        return (FrozenIni, (self._buf.tobytes(),))
+
+    def __len__(self) -> int:
+        return len(self._sec_id)
+
+    # ----------------------------------------------------------------
+
+    @classmethod
+    def from_ini(cls, ini: Ini) -> Self:
+        """Снимок текущего содержимого экземпляра :class:`Ini`.
+
+        :raises ValueError: на машине с порядком байтов big-endian.
+        """
+        strings: dict[str, int] = {}
+        def idx(s: str | None) -> int:
+            if s is None:
+                return _NONE
+            i = strings.get(s, None)
+            if i is None:
+                i = strings[s] = len(strings)
+            return i
+
+        name = idx(ini._name)
+        sec_id, par_off, par = array("I"), array("I", [0]), array("I")
+        fld_off, keys, values = array("I", [0]), array("I"), array("I")
+        for section in ini.sections():
+            sec_id.append(idx(section.id))
+            par.extend(idx(p) for p in section.parents)
+            par_off.append(len(par))
+            for k, v in section.fields():
+                keys.append(idx(k))
+                values.append(idx(v))
+            fld_off.append(len(keys))
+
+        str_off, chunks = array("I", [0]), []
+        for s in strings:
+            chunks.append(s.encode("utf-8", "surrogatepass"))
+            str_off.append(str_off[-1] + len(chunks[-1]))
+        str_data = b"".join(chunks)
+
+        n_hash = 1
+        while n_hash < 2 * len(sec_id):
+            n_hash *= 2
+        table = array("I", bytes(4 * n_hash))
+        for i, s in enumerate(sec_id):
+            h = zlib.crc32(chunks[s]) & (n_hash - 1)
+            while table[h] != 0:
+                h = (h + 1) & (n_hash - 1)
+            table[h] = i + 1
+
+        parts = [str_off, table, sec_id, par_off, par, fld_off, keys, values]
+        size = 4 * (_HEADER_WORDS + sum(len(a) for a in parts)) + len(str_data)
+        header = array("I", [
+            0, _VERSION, size, name, len(strings), len(sec_id), len(par), len(keys),
+            n_hash
+        ])
+        buf = bytearray(header.tobytes())
+        buf[:4] = _MAGIC
+        for a in parts:
+            buf += a.tobytes()
+        buf += str_data
+        return cls(bytes(buf))
+
+    @classmethod
+    def from_buffer(cls, buf: Buffer) -> Self:
+        """Снимок поверх готового буфера (без копирования данных).
+
+        Буфер может быть длиннее снимка (например, ``SharedMemory.buf``,
+        размер которого округляется до размера страницы).
+
+        :param buf: Объект с буферным протоколом (``bytes``, ``memoryview``, ...),
+            содержащий данные :func:`to_bytes`. Не должен изменяться,
+            пока используется снимок.
+        :raises ValueError: если буфер не содержит снимок.
+        """
+        return cls(buf)
+
+    @classmethod
+    def open(cls, fp: str) -> Self:
+        """Отображение в память файла снимка (см. :func:`dump`).
+
+        Такой снимок сериализуется (``pickle``) только путём до файла.
+
+        :param fp: Путь до файла.
+        :raises ValueError: если файл не содержит снимок.
+        """
+        with open(fp, "rb") as file:
+            mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm, _mm=mm, _fp=fp)
+
+    def to_bytes(self) -> bytes:
+        """Копия буфера снимка."""
+        return self._buf.tobytes()
+
+    def dump(self, fp: str) -> None:
+        """Запись снимка в файл (для :func:`open`)."""
+        with open(fp, "wb") as file:
+            file.write(self._buf)
+
+    def thaw(self) -> Ini:
+        """Новый изменяемый экземпляр :class:`Ini` с теми же секциями.
+
+        Наследование в нём не восстанавливается: каждая секция
+        содержит все свои поля (родители доступны через :attr:`Section.parents`).
+        """
+        ini = Ini(name=self.name)
+        for i in range(len(self)):
+            ini.add(self._section(i), by_reference=True)
+        return ini
+
+    # ----------------------------------------------------------------
+
+    def _raise(self, msg: str) -> NoReturn:
+        raise Ini.Error(
+            f"{self.name} | {msg}" if len(self.name) > 0 else msg
+        )
+
+    def _bytes(self, i: int) -> memoryview:
+        off = self._str_off
+        return self._str_data[off[i]:off[i + 1]]
+
+    def _str(self, i: int) -> str | None:
+        if i == _NONE:
+            return None
+        return str(self._bytes(i), "utf-8", "surrogatepass")
+
+    def _index_of(self, id: str) -> int:
+        """Номер секции по ID через хэш-таблицу (-1, если секции нет)."""
+        kb = id.encode("utf-8", "surrogatepass")
+        table, sec_id = self._hash, self._sec_id
+        mask = len(table) - 1
+        h = zlib.crc32(kb) & mask
+        while (j := table[h]) != 0:
+            if self._bytes(sec_id[j - 1]) == kb:
+                return j - 1
+            h = (h + 1) & mask
+        return -1
+
+    def _section(self, i: int) -> Section:
+        section = Section(self._str(self._sec_id[i]))
+        s = self._str
+        section._parents = tuple(
+            s(p) for p in self._par[self._par_off[i]:self._par_off[i + 1]]
+        )
+        a, b = self._fld_off[i], self._fld_off[i + 1]
+        section._over = {
+            s(k): s(v) for k, v in zip(self._keys[a:b], self._values[a:b])
+        }
+        return section
+
+    def section(self, id: str) -> Section:
+        """Получение секции по её ID.
+
+        :param id: ID секции.
+        :raises Ini.Error: если секции с указанным ID не существует.
+        :return: Новый объект секции (его изменение не затрагивает снимок).
+        """
+        i = self._index_of(id)
+        if i < 0:
+            self._raise(f"section [{id}] doesn't exist")
+        return self._section(i)
+
+    def ids(self) -> Iterator[str]:
+        return (self._str(s) for s in self._sec_id)
+
+    def sections(self) -> Iterator[Section]:
+        return (self._section(i) for i in range(len(self)))
+
+    def get_section_index(self, section_id: str) -> int:
+        """Получить порядковый номер секции с указанным ID.
+        Возвращает -1, если такой секции не существует.
+        """
+        return self._index_of(section_id)
+
+    def section_exist(self, id: str) -> bool:
+        """Существует ли секция с указанным ID.
+        """
+        return self._index_of(id) >= 0
+
+    def line_exist(self, id: str, k: str) -> bool:
+        """Проверка наличия поля в секции.
+
+        :param id: ID секции.
+        :param k: Имя поля.
+        :raises Ini.Error: если секции с указанным ID не существует.
+        :return: Существует ли поле в секции с указанным ID.
+        """
+        i = self._index_of(id)
+        if i < 0:
+            self._raise(f"section [{id}] doesn't exist")
+        kb = k.encode("utf-8", "surrogatepass")
+        return any(
+            (self._bytes(j) == kb)
+            for j in self._keys[self._fld_off[i]:self._fld_off[i + 1]]
+        )
+
+    # ----------------------------------------------------------------
+
+    def get_string(self, id: str, k: str, defval: str | None = None) -> str:
+        """См. :func:`Ini.get_string`."""
+        return self.section(id).get_string(k, defval)
+
+    def get_string_wb(self, id: str, k: str, defval: str | None = None) -> str:
+        """См. :func:`Ini.get_string_wb`."""
+        return self.section(id).get_string_wb(k, defval)
+
+    def get_float(self, id: str, k: str, defval: float | None = None) -> float:
+        """См. :func:`Ini.get_float`."""
+        return self.section(id).get_float(k, defval)
+
+    def get_int(self, id: str, k: str, defval: int | None = None) -> int:
+        """См. :func:`Ini.get_int`."""
+        return self.section(id).get_int(k, defval)
+
+    def get_uint(self, id: str, k: str, defval: int | None = None) -> int:
+        """См. :func:`Ini.get_uint`."""
+        return self.section(id).get_uint(k, defval)
+
+    def get_bool(self, id: str, k: str, defval: bool | None = None) -> bool:
+        """См. :func:`Ini.get_bool`."""
+        return self.section(id).get_bool(k, defval)
+
+    def get_strings(self, id: str, k: str, mandatory: bool = True) -> list[str]:
+        """См. :func:`Ini.get_strings`."""
+        return self.section(id).get_strings(k, mandatory)
+
+    def get_floats(self, id: str, k: str, mandatory: bool = True) -> list[float]:
+        """См. :func:`Ini.get_floats`."""
+        return self.section(id).get_floats(k, mandatory)
+
+    def get_ints(self, id: str, k: str, mandatory: bool = True) -> list[int]:
+        """См. :func:`Ini.get_ints`."""
+        return self.section(id).get_ints(k, mandatory)
+
+    def get_uints(self, id: str, k: str, mandatory: bool = True) -> list[int]:
+        """См. :func:`Ini.get_uints`."""
+        return self.section(id).get_uints(k, mandatory)
+
+    def get_bools(self, id: str, k: str, mandatory: bool = True) -> list[bool]:
+        """См. :func:`Ini.get_bools`."""
+        return self.section(id).get_bools(k, mandatory)
+
+    def get_items(
+            self,
+            id: str,
+            k: str,
+            mandatory: bool = True,
+            parsing_mode: Literal["comma", "vanilla", "vanilla_ext"] = "comma"
+    ) -> list[tuple[str, int]]:
+        """См. :func:`Ini.get_items`."""
+        return self.section(id).get_items(k, mandatory, parsing_mode)
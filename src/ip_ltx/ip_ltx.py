@@ -19,14 +19,58 @@ ip_ltx
 * ...
 """
 
+import hashlib
 import itertools
+import json
 import os
 import re
-from collections.abc import Callable
+import sys
+import zlib
+from array import array
+from collections import deque
+from collections.abc import (
+    Callable,
+    Container,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+)
 from pathlib import Path
+from types import MappingProxyType
 from typing import Literal, NoReturn, Self, TextIO
 
-from .utils import cast_safe, print_warning, read_file
+from .utils import (
+    GamedataFS,
+    cast_safe,
+    file_signature,
+    gamedata_fs,
+    print_warning,
+    read_file,
+)
+
+
+_Layers = tuple[dict[str, str | None], ...]
+
+_memo_stats = [0, 0]
+"""Счётчики попаданий и промахов кэша ``Section._typed``
+(см. :func:`Section.memo_stats`)."""
+
+_VALUE_POOL_MAX_LEN = 16
+"""Короткие значения полей при чтении хранятся в одном экземпляре
+на весь :class:`Ini` (см. ``Ini._values``)."""
+
+_FINGERPRINT_GROUPS = 256
+"""Число групп секций в дереве хэшей :func:`Ini.fingerprint`."""
+
+_FINGERPRINT_CHANGES: list[str] = []
+"""ID изменённых секций, хэш которых был вычислен (см. :func:`Section._reset_typed`).
+По этому журналу деревья хэшей экземпляров :class:`Ini` пересчитывают
+только группы изменённых секций (см. :class:`_FingerprintTree`)."""
+
+_LAYERS_MAX = 8
+"""Максимальная длина цепочки унаследованных словарей (см. ``Section._base``).
+Более длинная цепочка объединяется в один словарь."""
 
 
 class Section:
@@ -38,10 +82,36 @@ class Section:
         Используется при логировании и в сообщениях об ошибках.
     :raises ValueError: при попытке инициализации с невалидным ID.
     """
+    __slots__ = (
+        "id", "_base", "_over", "_own", "_flat", "_shared", "_src", "_lazy", "_typed",
+        "_parents"
+    )
+
     id: str
-    _fields: dict[str, str | None]
-    _fields_own: set[str]
+    _base: "_Layers"
+    """Поля, унаследованные от родителей (на момент объявления секции):
+    цепочка словарей, где каждый следующий переопределяет предыдущие.
+    Словари могут быть общими для нескольких секций, поэтому никогда не изменяются."""
+    _over: dict[str, str | None]
+    """Поля, записанные в саму секцию (в т.ч. переопределённые)."""
+    _own: int
+    """Битовая маска собственных полей секции (объявленных в самой секции):
+    i-й бит соответствует i-му ключу ``_over``. См. :attr:`_fields_own`."""
+    _flat: dict[str, str | None] | None
+    """Кэш всех полей секции одним словарём (см. :func:`_resolved`)."""
+    _shared: bool
+    """Словарь ``_over`` используется потомками как часть ``_base``:
+    перед изменением его нужно скопировать."""
     _src: str
+    _lazy: "_LazyBody | None"
+    """Неразобранное тело ленивой секции (см. ``Ini.read(lazy=True)``)."""
+    _typed: dict[str, dict[str, object]] | None
+    """Кэш значений, уже преобразованных методами ``get_*``:
+    тип -> поле -> значение. Сбрасывается при любом изменении полей секции."""
+    _parents: tuple[str, ...]
+    """ID родителей из объявления секции (см. :attr:`parents`)."""
+
+    _FIELDS_ATTRS = ("_base", "_over", "_own", "_flat", "_shared")
 
     def __init__(self, id: str, init: Self | None = None, _src: str = ""):
         if ("\n" in id) or ("\r" in id):
@@ -49,15 +119,193 @@ class Section:
         if ("]" in id):
             raise ValueError("Invalid section ID: symbol ']' is forbidden")
         self.id = id
+        self._lazy = None
+        self._typed = None
         if init is None:
-            self._fields = {}
-            self._fields_own = set()
+            self._init_fields()
             self._src = _src
+            self._parents = ()
         else:
-            self._fields = init._fields.copy()
-            self._fields_own = init._fields_own.copy()
+            self._parents = init._parents
+            self._base = init._base
+            self._over = init._over.copy()
+            self._own = init._own
+            self._flat = init._flat
+            self._shared = False
             self._src = _src if (len(_src) > 0) else init._src
 
+    def __getattr__(self, name: str):
+        # Вызывается только при отсутствии атрибута.
+        # У ленивой секции (см. ``Ini.read(lazy=True)``) поля ещё не разобраны:
+        #  разбираем их при первом обращении.
+        if (name in Section._FIELDS_ATTRS) and (self._lazy is not None):
+            self._ensure_parsed()
+            return object.__getattribute__(self, name)
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def _make_lazy(self, body: "_LazyBody") -> None:
+        """Превращение секции в ленивую: поля будут разобраны из ``body``
+        при первом обращении к ним.
+        """
+        for name in Section._FIELDS_ATTRS:
+            delattr(self, name)
+        self._lazy = body
+
+    def _ensure_parsed(self) -> None:
+        """Разбор полей ленивой секции (если она ещё не разобрана)."""
+        lazy = self._lazy
+        if lazy is not None:
+            lazy.ini._materialize(self)
+
+    def __getstate__(self):
+        self._ensure_parsed()
+        state, slots = super().__getstate__()
+        return (state, slots | {"_typed": None})
+
+
+    # Поля секции хранятся без копирования унаследованных:
+    #  ``_base`` - общие (неизменяемые) словари полей родителей,
+    #  ``_over`` - собственные поля секции.
+
+    @property
+    def _fields(self) -> "_FieldsView":
+        """Все поля секции в виде словаря (поле -> значение).
+
+        Изменения через это представление записываются в саму секцию,
+        не затрагивая её родителей и потомков.
+        """
+        return _FieldsView(self)
+
+    @_fields.setter
+    def _fields(self, fields: dict[str, str | None]) -> None:
+        own = self._fields_own
+        self._base = ()
+        self._over = dict(fields)
+        self._reset_typed()
+        self._own = 0
+        for i, k in enumerate(self._over):
+            if k in own:
+                self._own |= (1 << i)
+        self._flat = None
+        self._shared = False
+
+    @property
+    def parents(self) -> tuple[str, ...]:
+        """ID родителей секции в порядке их перечисления в объявлении
+        (``[id]:parent_1,parent_2``). Для секций без наследования,
+        а также созданных не чтением файла - пустой кортеж.
+        """
+        return self._parents
+
+    @property
+    def _fields_own(self) -> frozenset[str]:
+        """Имена полей, объявленных в самой секции (не унаследованных).
+        """
+        own = self._own
+        if own == (1 << len(self._over)) - 1:
+            return frozenset(self._over)
+        return frozenset(k for i, k in enumerate(self._over) if (own >> i) & 1)
+
+    def _is_own(self, k: str) -> bool:
+        over = self._over
+        if k not in over:
+            return False
+        own = self._own
+        if own == (1 << len(over)) - 1:
+            return True
+        return bool((own >> list(over).index(k)) & 1)
+
+    def _init_fields(self) -> None:
+        self._base = ()
+        self._over = {}
+        self._own = 0
+        self._flat = None
+        self._shared = False
+        self._reset_typed()
+
+    def _get(self, k: str, default: str | None = None) -> str | None:
+        over = self._over
+        if k in over:
+            return over[k]
+        for layer in reversed(self._base):
+            if k in layer:
+                return layer[k]
+        return default
+
+    def _has(self, k: str) -> bool:
+        return (k in self._over) or any((k in layer) for layer in self._base)
+
+    def _set(self, k: str, v: str | None, own: bool = False) -> bool:
+        """Запись значения поля.
+
+        :param own: Пометить поле как собственное (см. :attr:`_fields_own`).
+        :return: Было ли поле собственным до записи.
+        """
+        if self._shared:
+            self._over = self._over.copy()
+            self._shared = False
+        over = self._over
+        was_own = False
+        if k not in over:
+            if own:
+                self._own |= (1 << len(over))
+        else:
+            was_own = self._is_own(k)
+            if own and not was_own:
+                self._own |= (1 << list(over).index(k))
+        over[k] = v
+        self._flat = None
+        if self._typed is not None:
+            self._reset_typed()
+        return was_own
+
+    def _resolved(self) -> dict[str, str | None]:
+        """Все поля секции одним словарём. Словарь нельзя изменять.
+
+        Если у секции есть унаследованные поля, то словарь строится
+        при первом вызове и кэшируется до изменения секции.
+        """
+        if len(self._base) == 0:
+            return self._over
+        if self._flat is None:
+            if (len(self._base) == 1) and (len(self._over) == 0):
+                return self._base[0]
+            # Порядок: поля родителей, затем новые поля секции
+            flat = {}
+            for layer in self._base:
+                flat.update(layer)
+            flat.update(self._over)
+            self._flat = flat
+        return self._flat
+
+    def _snapshot(self) -> "_Layers":
+        """Текущие поля секции для наследования потомком (без копирования).
+        """
+        if self._flat is not None:
+            return (self._flat,)
+        if len(self._over) == 0:
+            return self._base
+        if len(self._base) >= _LAYERS_MAX:
+            # Слишком длинная цепочка замедляет поиск поля
+            return (self._resolved(),)
+        self._shared = True
+        return self._base + (self._over,)
+
+    def _inherit(self, layers: "_Layers") -> None:
+        """Добавление полей родителя (``layers`` - его :func:`_snapshot`).
+        """
+        if len(self._over) == 0:
+            self._base = self._base + layers
+            self._flat = None
+            self._reset_typed()
+            return
+        # Поля родителя переопределяют уже записанные в секцию
+        for layer in layers:
+            for k, v in layer.items():
+                self._set(k, v)
+
 
     class Error(Exception):
         """Исключение, вызываемое классом :class:`Section`.
@@ -162,39 +410,39 @@ class Section:
         :raises Section.Error: если указанного поля нет.
         :return: Значение поля или None, если оно без значения.
         """
-        if k not in self._fields:
+        if not self._has(k):
             self._raise(f"field '{k}' is absent")
-        return self._fields[k]
+        return self._get(k)
 
     def lines(self):
         """Набор имён всех полей секции.
         Представлен в том порядке, в котором в секцию добавлялись поля.
         """
-        return self._fields.keys()
+        return self._resolved().keys()
 
     def fields(self):
         """Набор всех пар (поле, значение).
         Представлен в том порядке, в котором в секцию добавлялись поля.
         """
-        return self._fields.items()
+        return self._resolved().items()
 
 
     def line_exist(self, k: str) -> bool:
         """Проверка на то, что поле с укзанным именем существует.
         """
-        return (k in self._fields)
+        return self._has(k)
 
     def line_exist_with_value(self, k: str) -> bool:
         """Проверка на то, что поле с укзанным именем существует и имеет значение
         (то есть оно не None).
         """
-        return (k in self._fields) and (self._fields[k] is not None)
+        return self._get(k) is not None
 
 
     def clear(self) -> None:
         """Удаление всех полей из секции."""
-        self._fields.clear()
-        self._fields_own.clear()
+        self._ensure_parsed()
+        self._init_fields()
 
     def add(
             self,
@@ -221,7 +469,7 @@ class Section:
             raise ValueError("Field must be string")
         if (type(value) != str) and (value is not None):
             raise ValueError("Field value must be string or None")
-        field = field.strip()
+        field = sys.intern(field.strip())
         if not overwrite and self.line_exist(field):
             self._raise(f"Field '{field}' already exists")
         if len(field) == 0:
@@ -234,18 +482,17 @@ class Section:
             if (";" in value) or ("//" in value):
                 raise ValueError("Value can't contain comments")
             if field == "custom_data":
-                self._fields[field] = value.strip()
+                self._set(field, value.strip(), own=True)
             else:
                 if (("\n" in value) or ("\r" in value)):
                     raise ValueError("Multi-line value is allowed only for custom_data")
-                self._fields[field] = (
+                self._set(field, (
                     value.strip()
                     if preserve_value_whitespaces
                     else Section.fmt_value_whitespaces(value)
-                )
+                ), own=True)
         else:
-            self._fields[field] = None
-        self._fields_own.add(field)
+            self._set(field, None, own=True)
 
 
     @staticmethod
@@ -288,6 +535,62 @@ class Section:
         return None
 
 
+    def _reset_typed(self) -> None:
+        """Сброс :attr:`_typed` при изменении полей секции."""
+        typed = self._typed
+        if typed is not None:
+            if "fingerprint" in typed:
+                _FINGERPRINT_CHANGES.append(self.id)
+            self._typed = None
+
+    def _memo(self, tag: str) -> dict[str, object]:
+        """Кэш значений одного типа (см. :attr:`_typed`): поле -> значение.
+        """
+        typed = self._typed
+        if typed is None:
+            typed = self._typed = {}
+        memo = typed.get(tag, None)
+        if memo is None:
+            memo = typed[tag] = {}
+        return memo
+
+    def fingerprint(self) -> bytes:
+        """Хэш содержимого секции: ID, поля (в порядке :func:`fields`)
+        и их значения. Не зависит от процесса и версии Python,
+        поэтому подходит в качестве ключа для внешних кэшей.
+
+        Вычисляется при первом вызове и запоминается до изменения секции.
+
+        :return: 16 байт BLAKE2b.
+        """
+        memo = self._memo("fingerprint")
+        r = memo.get(self.id, None)
+        if r is None:
+            data = json.dumps(
+                [self.id, list(self._resolved().items())],
+                ensure_ascii=False,
+                separators=(",", ":")
+            )
+            r = hashlib.blake2b(
+                data.encode("utf-8", "surrogatepass"), digest_size=16
+            ).digest()
+            memo[self.id] = r
+        return r
+
+    @staticmethod
+    def memo_stats() -> tuple[int, int]:
+        """Статистика кэша значений методов ``get_*`` (по всем секциям).
+
+        :return: Пара (число попаданий в кэш, число промахов).
+        """
+        return (_memo_stats[0], _memo_stats[1])
+
+    @staticmethod
+    def memo_reset_stats() -> None:
+        """Обнуление статистики :func:`memo_stats`."""
+        _memo_stats[0] = 0
+        _memo_stats[1] = 0
+
     def get_elem[R](
             self,
             type_caster: Callable[[str], R | None],
@@ -316,15 +619,27 @@ class Section:
         :return: Преобразованное в нужный тип значение поля,
             либо ``defval``, если он не ``None``
             и указанного поля нет или оно без значения.
+
+        Для стандартных преобразований (см. ``get_string``, ``get_float``, ...)
+        результат кэшируется до изменения секции.
         """
-        r = self._fields.get(k, None)
+        memo = None
+        if (tag := _MEMO_CASTERS.get(type_caster, None)) is not None:
+            memo = self._memo(tag)
+            if (r := memo.get(k, None)) is not None:
+                _memo_stats[0] += 1
+                return r
+            _memo_stats[1] += 1
+        r = self._get(k)
         if r is not None:
             r = type_caster(r)
             if r is not None:
+                if memo is not None:
+                    memo[k] = r
                 return r
             self._raise(f"field '{k}' can't be read as *{type_label}*")
         if defval is None:
-            why = "None value" if (k in self._fields) else "non-existent"
+            why = "None value" if self._has(k) else "non-existent"
             self._raise(f"field '{k}' can't be read as *{type_label}*: {why}")
         return defval
 
@@ -396,22 +711,42 @@ class Section:
         :return: Построенный по значению поля список элементов нужного типа,
             либо пустой список, если ``mandatory == False``
             и указанного поля нет или оно без значения.
+
+        Для стандартных преобразований (см. ``get_strings``, ``get_floats``, ...)
+        результат кэшируется до изменения секции.
         """
-        v = self._fields.get(k, None)
+        memo = None
+        if (tag := _MEMO_CASTERS.get(type_caster, None)) is not None:
+            memo = self._memo(f"list[{tag}]")
+            if (r := memo.get(k, None)) is not None:
+                _memo_stats[0] += 1
+                return list(r)
+            _memo_stats[1] += 1
+        v = self._get(k)
         if v is not None:
             if len(v.strip()) == 0:
                 return []
-            r = []
-            for i, rr in enumerate([type_caster(vv.strip()) for vv in v.split(",")]):
-                if rr is None:
-                    self._raise((
-                        f"field '{k}' can't be read as *list[{type_label}]*"
-                        f": value #{i+1} is invalid"
-                    ))
-                r.append(rr)
+            r = None
+            if (bulk := _BULK_CASTERS.get(type_caster, None)) is not None:
+                # Весь список одним вызовом; при ошибке - поэлементно (ради сообщения)
+                try:
+                    r = list(map(bulk, v.split(",")))
+                except ValueError:
+                    pass
+            if r is None:
+                r = []
+                for i, rr in enumerate([type_caster(vv.strip()) for vv in v.split(",")]):
+                    if rr is None:
+                        self._raise((
+                            f"field '{k}' can't be read as *list[{type_label}]*"
+                            f": value #{i+1} is invalid"
+                        ))
+                    r.append(rr)
+            if memo is not None:
+                memo[k] = tuple(r)
             return r
         if mandatory:
-            why = "None value" if (k in self._fields) else "non-existent"
+            why = "None value" if self._has(k) else "non-existent"
             self._raise(f"field '{k}' can't be read as *list[{type_label}]*: {why}")
         return []
 
@@ -482,7 +817,7 @@ class Section:
             и при этом ``mandatory=True``.
         :return: Список пар ``(<section>, <count>)``.
         """
-        r = self._fields.get(k, None)
+        r = self._get(k)
         if r is not None:
             r = str(r)
             if len(r) == 0:
@@ -516,7 +851,7 @@ class Section:
                 r.append((_section, _count))
             return r
         if mandatory:
-            why = "None value" if (k in self._fields) else "non-existent"
+            why = "None value" if self._has(k) else "non-existent"
             self._raise(f"field '{k}' can't be read: {why}")
         return []
 
@@ -551,9 +886,17 @@ class Section:
         def _err(why: str) -> NoReturn:
             self._raise(f"field '{k}' can't be read as a pair of *{type_label}*: {why}")
         
-        v = self._fields.get(k, None)
+        memo = None
+        if (tag := _MEMO_CASTERS.get(type_caster, None)) is not None:
+            memo = self._memo(f"pair[{tag}]{sep}")
+            if (r := memo.get(k, None)) is not None:
+                _memo_stats[0] += 1
+                return r
+            _memo_stats[1] += 1
+
+        v = self._get(k)
         if v is None:
-            _err("None value" if (k in self._fields) else "non-existent")
+            _err("None value" if self._has(k) else "non-existent")
         
         v = v.strip()
         v = v.split(sep) if len(v) > 0 else []
@@ -566,7 +909,10 @@ class Section:
         if v[1] is None:
             _err("value #2 is invalid")
 
-        return (v[0], v[1])
+        r = (v[0], v[1])
+        if memo is not None:
+            memo[k] = r
+        return r
 
     def get_pair_str(self, k: str, sep: str = ",") -> tuple[str, str]:
         """Получить значение поля k как пару обычных строк (str).
@@ -599,6 +945,793 @@ class Section:
         return self.get_pair(Section.cast_bool, "bool", k, sep)
 
 
+_MEMO_CASTERS = {
+    str: "str",
+    Section.cast_string_wb: "string_wb",
+    Section.cast_float: "float",
+    Section.cast_int: "int",
+    Section.cast_uint: "uint",
+    Section.cast_bool: "bool",
+}
+"""Преобразования, результат которых кэшируется в ``Section._typed``
+(значение - метка типа в ключе кэша).
+Произвольные функции (например, lambda) не кэшируются: иначе кэш рос бы
+с каждым вызовом."""
+
+_COLUMN_TYPES: dict[str, tuple[str, Callable[[str], object]]] = {
+    "float": ("d", Section.cast_float),
+    "int": ("q", Section.cast_int),
+    "uint": ("q", Section.cast_uint),
+    "bool": ("b", Section.cast_bool),
+}
+"""Типы :func:`Ini.column`: тип -> (код типа ``array``, преобразование)."""
+
+_BULK_CASTERS: dict[Callable[[str], object], Callable[[str], object]] = {
+    Section.cast_float: float,
+    Section.cast_int: int,
+}
+"""Преобразования, которые можно применить ко всему списку значений
+одним ``map`` (см. :func:`Section.get_elems`): результат и ошибки те же,
+что у поэлементного ``cast_safe`` после ``strip``."""
+
+
+class _FieldsView(MutableMapping[str, str | None]):
+    """Словарь полей секции (см. ``Section._fields``).
+
+    Чтение не копирует унаследованные поля, а запись идёт в собственные
+    поля секции. Порядок полей тот же, что и у :func:`Section.fields`.
+    """
+    __slots__ = ("_section",)
+
+    def __init__(self, section: Section):
+        self._section = section
+
+    def __getitem__(self, k: str) -> str | None:
+        if not self._section._has(k):
+            raise KeyError(k)
+        return self._section._get(k)
+
+    def __setitem__(self, k: str, v: str | None) -> None:
+        self._section._set(k, v)
+
+    def __delitem__(self, k: str) -> None:
+        if not self._section._has(k):
+            raise KeyError(k)
+        fields = dict(self._section._resolved())
+        del fields[k]
+        self._section._fields = fields
+
+    def __contains__(self, k: object) -> bool:
+        return self._section._has(k)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._section._resolved())
+
+    def __len__(self) -> int:
+        return len(self._section._resolved())
+
+    def __repr__(self) -> str:
+        return repr(self._section._resolved())
+
+    def get(self, k: str, default: str | None = None) -> str | None:
+        return self._section._get(k, default)
+
+    def keys(self):
+        return self._section._resolved().keys()
+
+    def items(self):
+        return self._section._resolved().items()
+
+    def values(self):
+        return self._section._resolved().values()
+
+    def copy(self) -> dict[str, str | None]:
+        return dict(self._section._resolved())
+
+    def clear(self) -> None:
+        self._section._fields = {}
+
+
+# ----------------------------------------------------------------
+
+
+_TOKEN_SECTION = "section"
+"""``(kind, ln, line)`` - строка объявления секции."""
+_TOKEN_FIELD = "field"
+"""``(kind, ln, field, value)`` - поле текущей секции."""
+_TOKEN_HEREDOC = "heredoc"
+"""``(kind, ln, value)`` - конец многострочного значения ``custom_data``."""
+_TOKEN_INCLUDE = "include"
+"""``(kind, ln, line)`` - строка include-директивы."""
+_TOKEN_WARNING = "warning"
+"""``(kind, ln, msg)`` - warning-сообщение, не относящееся к секции."""
+_TOKEN_EMPTY_FIELD_NAME = "empty_field_name"
+"""``(kind, ln)`` - строка с пустым именем поля."""
+
+
+def _tokenize(
+        lines: Iterable[str],
+        has_section: bool,
+        preserve_value_whitespaces: bool,
+        start: int = 1
+) -> Iterator[tuple]:
+    """Однопроходный разбор строк ltx-файла на токены.
+
+    Повторяет логику ``Ini._read_raw_legacy``, но каждая строка классифицируется
+    по первому символу и обрезается не более одного раза. Действия, зависящие
+    от уже считанных секций (наследование, include-директивы, повторное
+    объявление поля), выполняются при применении токенов (``Ini._read_tokens``).
+
+    Результат зависит только от аргументов, поэтому токены одного файла
+    можно получать независимо от остальных.
+
+    :param lines: Строки текста (как после ``str.splitlines``).
+    :param has_section: Есть ли текущая секция на момент начала чтения
+        (например, при чтении файла через ``#include`` внутри секции).
+    :param preserve_value_whitespaces: См. :func:`Ini.read_raw`.
+    :param start: Номер первой строки.
+    """
+    fmt_value = Section.fmt_value_whitespaces
+    heredoc: str | None = None
+    for ln, line in enumerate(lines, start=start):
+        line = line.strip()
+
+        # Cutting off comment part
+        if "/" in line:
+            semi = line.find(";")
+            semi_1 = line.find("/")
+            if (
+                (semi_1 + 1) < len(line)
+                and line[semi_1 + 1] == "/"
+                and (semi == -1 or semi_1 < semi)
+            ):
+                semi = semi_1
+            if semi != -1:
+                line = line[:semi]
+            if "//" in line:
+                yield (
+                    _TOKEN_WARNING, ln,
+                    "C-style comment was not recognized due to xrEngine bug"
+                )
+        elif ";" in line:
+            line = line[:line.find(";")]
+
+        # custom_data processing
+        if heredoc is not None:
+            if line.strip() == "END":
+                yield (_TOKEN_HEREDOC, ln, heredoc)
+                heredoc = None
+            else:
+                heredoc += f"{line}\n"
+            continue
+
+        # После обрезки пробельных символов слева нет,
+        #  поэтому пустой остаток может быть только пустой строкой.
+        if not line:
+            continue
+
+        c = line[0]
+        if c == "#" and line.startswith("#include"):
+            yield (_TOKEN_INCLUDE, ln, line)
+            continue
+        if c == "[":
+            yield (_TOKEN_SECTION, ln, line)
+            has_section = True
+            continue
+        if not has_section:
+            yield (_TOKEN_WARNING, ln, "Ignoring redundant text")
+            continue
+
+        idx = line.find("=")
+        if idx == -1:
+            yield (_TOKEN_FIELD, ln, line.strip(), None)
+            continue
+        lv = line[:idx].strip()
+        if not lv:
+            yield (_TOKEN_EMPTY_FIELD_NAME, ln)
+            continue
+        rv = line[idx+1:]
+        if (lv == "custom_data") and (rv.strip() == "<<END"):
+            heredoc = ""
+            yield (_TOKEN_FIELD, ln, lv, "")
+        elif preserve_value_whitespaces:
+            yield (_TOKEN_FIELD, ln, lv, rv.strip())
+        elif '"' in rv:
+            yield (_TOKEN_FIELD, ln, lv, fmt_value(rv))
+        else:
+            yield (_TOKEN_FIELD, ln, lv, "".join(rv.split()))
+
+
+def _cut_comment(line: str) -> str:
+    """Отрезание комментария от строки (как в :func:`_tokenize`).
+
+    :param line: Строка без пробельных символов по краям.
+    """
+    semi = line.find(";")
+    semi_1 = line.find("/")
+    if (
+        semi_1 != -1
+        and (semi_1 + 1) < len(line)
+        and line[semi_1 + 1] == "/"
+        and (semi == -1 or semi_1 < semi)
+    ):
+        semi = semi_1
+    return line[:semi] if (semi != -1) else line
+
+
+_INDEX_PATTERN = re.compile(r"\n[^\S\n]*[\[#]")
+"""Строки-кандидаты для :func:`Ini._index_raw`:
+объявление секции или include-директива (ищется вместе с предшествующим ``\\n``)."""
+
+_INDEX_END_PATTERN = re.compile(r"\n[^\S\n]*END")
+"""Строки-кандидаты на конец многострочного ``custom_data``."""
+
+_LINE_BREAKS_EXTRA = ("\r", "\x0b", "\x0c", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
+"""Символы, по которым ``str.splitlines`` разбивает текст помимо ``\\n``."""
+
+
+def _index_search(pattern: re.Pattern, raw: str, pos: int) -> int:
+    """Начало первой строки-кандидата (не раньше строки, начинающейся с ``pos``).
+
+    :param pattern: ``_INDEX_PATTERN`` или ``_INDEX_END_PATTERN``.
+    :return: Смещение начала строки или -1, если кандидатов нет.
+    """
+    if pos == 0:
+        # Первая строка текста не предваряется "\n"
+        if pattern.match("\n" + raw[:_line_end(raw, 0)]) is not None:
+            return 0
+        m = pattern.search(raw, 0)
+    else:
+        m = pattern.search(raw, pos - 1)
+    return -1 if (m is None) else (m.start() + 1)
+
+
+def _line_end(raw: str, pos: int) -> int:
+    """Смещение конца строки, содержащей позицию ``pos``."""
+    idx = raw.find("\n", pos)
+    return len(raw) if (idx == -1) else idx
+
+_LINES_CHUNK = 1 << 20
+"""Размер (в символах) части текста для :func:`_iter_lines`."""
+
+def _iter_lines(raw: str) -> Iterator[str]:
+    """То же, что ``raw.splitlines()``, но без списка всех строк сразу:
+    текст разбивается по частям (по ``\n``) размером около :data:`_LINES_CHUNK`.
+    """
+    pos = 0
+    while pos < len(raw):
+        end = raw.find("\n", pos + _LINES_CHUNK)
+        if end == -1:
+            end = len(raw)
+        yield from raw[pos:end+1].splitlines()
+        pos = end + 1
+
+
+class _LazyBody:
+    """Неразобранное тело ленивой секции (см. ``Ini.read(lazy=True)``).
+    """
+    __slots__ = ("ini", "segments", "parents", "preserve_value_whitespaces")
+
+    ini: "Ini"
+    """Экземпляр, которому принадлежит секция."""
+
+    segments: list[tuple[str, str, int, int, int]]
+    """Фрагменты текста с полями секции в порядке чтения:
+    ``(fp_src, raw, start, end, ln)``, где ``raw[start:end]`` - строки фрагмента,
+    а ``ln`` - номер первой из них в файле ``fp_src``.
+    Фрагментов больше одного, если тело секции прерывается ``#include``.
+    """
+
+    parents: list[tuple[Section, "_LazyBody", int] | tuple[Section, None, _Layers]]
+    """Родители секции на момент её объявления:
+
+    * ``(section, body, n)`` - ленивый родитель, у которого тогда было
+      ``n`` фрагментов (``body`` - его тело).
+    * ``(section, None, layers)`` - уже разобранный родитель
+      и его поля (см. :func:`Section._snapshot`).
+    """
+
+    preserve_value_whitespaces: bool
+
+    def __init__(self, ini: "Ini", preserve_value_whitespaces: bool):
+        self.ini = ini
+        self.segments = []
+        self.parents = []
+        self.preserve_value_whitespaces = preserve_value_whitespaces
+
+
+_Skeleton = list[tuple[int, tuple | None]]
+"""Структура файла: его объявления секций и include-директивы
+в виде ``(индекс токена, токен)`` (см. :func:`_tokenize`) в порядке чтения.
+Завершается элементом ``(число токенов, None)``.
+Токены между соседними элементами - поля текущей секции.
+"""
+
+
+class _ReadLog:
+    """Журнал чтения файлов экземпляром :class:`Ini` (см. :func:`Ini.refresh`).
+    """
+    __slots__ = (
+        "reads", "failed", "journaled",
+        "skeletons", "decl", "files", "inherited", "quirky"
+    )
+
+    reads: list[tuple]
+    """Аргументы вызовов :func:`Ini.read` в порядке вызова."""
+
+    failed: bool
+    """Одно из чтений завершилось ошибкой: результат неполный."""
+
+    journaled: bool
+    """Заполняются ли поля ниже. Ленивое чтение и ``parser="legacy"``
+    журнал не ведут: для них :func:`Ini.refresh` перечитывает всё."""
+
+    skeletons: dict[tuple[str, bool, bool], _Skeleton]
+    """Структура считанных файлов:
+    ``(путь, была ли текущая секция, preserve_value_whitespaces) -> структура``."""
+
+    decl: dict[str, str]
+    """ID секции -> путь к файлу с её объявлением."""
+
+    files: dict[str, set[str]]
+    """ID секции -> пути, проверенные при разборе include-директив в её теле
+    (включая найденные файлы). Только для секций с такими директивами."""
+
+    inherited: set[str]
+    """ID секций, от которых уже наследовались."""
+
+    quirky: set[str]
+    """ID секций, чьи поля дополнялись уже после объявления наследника
+    (наследник получил неполный набор полей)."""
+
+    def __init__(self, reads: list[tuple]):
+        self.reads = reads
+        self.failed = False
+        self.journaled = True
+        self.skeletons = {}
+        self.decl = {}
+        self.files = {}
+        self.inherited = set()
+        self.quirky = set()
+
+
+class _Refresh:
+    """Состояние :func:`Ini.refresh` на время повторного чтения.
+    """
+    __slots__ = (
+        "log", "changed", "reusable", "reused", "kept", "show_ltx_warnings",
+        "_tokens", "_is_changed"
+    )
+
+    log: _ReadLog
+    """Журнал предыдущего чтения."""
+
+    changed: set[str]
+    """Изменившиеся (появившиеся, удалённые) файлы."""
+
+    reusable: dict[str, Section]
+    """Секции, которые можно не перечитывать: ни объявление, ни тело секции
+    не затронуто изменениями."""
+
+    reused: set[str]
+    """ID секций, взятых из :attr:`reusable`."""
+
+    kept: set[str]
+    """ID секций из :attr:`reused`, у которых не изменились и поля родителей."""
+
+    show_ltx_warnings: bool
+
+    def __init__(
+            self,
+            log: _ReadLog,
+            changed: set[str],
+            old: dict[str, Section],
+            show_ltx_warnings: bool
+    ):
+        self.log = log
+        self.changed = changed
+        self.reused = set()
+        self.kept = set()
+        self.show_ltx_warnings = show_ltx_warnings
+        self._tokens = {}
+        self._is_changed = {}
+        self.reusable = {}
+        for _id, section in old.items():
+            fp = log.decl.get(_id)
+            if (fp is None) or (_id in log.quirky) or self.is_changed(fp):
+                continue
+            files = log.files.get(_id)
+            if (files is not None) and not files.isdisjoint(changed):
+                continue
+            self.reusable[_id] = section
+
+    def reuse(self, _id: str, fp_src: str) -> Section | None:
+        """Секция из предыдущего чтения, если её можно не перечитывать.
+
+        :param fp_src: Путь к файлу, в котором секция объявлена теперь.
+        """
+        section = self.reusable.pop(_id, None)
+        if (section is None) or (self.log.decl[_id] != fp_src):
+            return None
+        self.reused.add(_id)
+        return section
+
+    def is_changed(self, fp: str) -> bool:
+        """Изменился ли файл (путь может быть относительным).
+        """
+        result = self._is_changed.get(fp)
+        if result is None:
+            result = (fp in self.changed) or (str(Path(fp).resolve()) in self.changed)
+            self._is_changed[fp] = result
+        return result
+
+    def tokens(self, fp: str, has_section: bool, pvw: bool) -> list[tuple]:
+        """Токены неизменившегося файла (для секций, которые нужно перечитать).
+        """
+        key = (fp, has_section, pvw)
+        tokens = self._tokens.get(key)
+        if tokens is None:
+            tokens = list(_tokenize(read_file(fp).splitlines(), has_section, pvw))
+            self._tokens[key] = tokens
+        return tokens
+
+
+_ParsedFile = tuple[
+    list[tuple[int, str]],
+    list[tuple[int, str, dict[str, str | None], int, list[tuple[int, str, bool]]]],
+    _Skeleton
+]
+"""Результат :func:`_parse_file`: ``(warnings, sections, skeleton)``.
+
+* ``warnings`` - warning-сообщения до первого объявления секции: ``(ln, msg)``.
+* ``sections`` - объявления секций в порядке чтения:
+  ``(ln, line, fields, own, warnings)``, где ``line`` - строка объявления,
+  ``fields`` и ``own`` - собственные поля секции (см. :attr:`Section._over`,
+  :attr:`Section._own`), ``warnings`` - warning-сообщения тела секции
+  ``(ln, msg, с ID секции или нет)``.
+* ``skeleton`` - структура файла (см. :attr:`_ReadLog.skeletons`).
+"""
+
+
+def _parse_file(fp: str, preserve_value_whitespaces: bool) -> _ParsedFile | None:
+    """Чтение и разбор файла без регистрации секций (для :func:`Ini.read_many`).
+
+    Выполняется в отдельном процессе, поэтому ничего не знает о секциях
+    экземпляра :class:`Ini`: объявления секций (дубликаты, наследование)
+    обрабатываются позже, при объединении результатов.
+    Поля секции от её родителей не зависят, поэтому разбираются здесь.
+
+    :return: Результат разбора или None, если в файле есть ``#include``
+        (такой файл читается обычным образом).
+    """
+    tokens = _tokenize(read_file(fp).splitlines(), False, preserve_value_whitespaces)
+    head: list[tuple[int, str]] = []
+    sections = []
+    skeleton: _Skeleton = []
+    warnings = None
+    current = None
+    pool = {}  # одинаковые строки - один объект (и одна копия при передаче)
+    i = -1
+    for i, token in enumerate(tokens):
+        kind = token[0]
+        if kind is _TOKEN_FIELD:
+            field = pool.setdefault(token[2], token[2])
+            value = token[3]
+            if (value is not None) and (len(value) <= _VALUE_POOL_MAX_LEN):
+                value = pool.setdefault(value, value)
+            if current._set(field, value, own=True):
+                warnings.append((token[1], f"Redeclaration of '{field}'", True))
+        elif kind is _TOKEN_SECTION:
+            current = Section("")
+            warnings = []
+            sections.append((token[1], token[2], current, warnings))
+            skeleton.append((i, token))
+        elif kind is _TOKEN_HEREDOC:
+            current._set("custom_data", token[2])
+        elif kind is _TOKEN_INCLUDE:
+            return None
+        elif kind is _TOKEN_WARNING:
+            if warnings is None:
+                head.append((token[1], token[2]))
+            else:
+                warnings.append((token[1], token[2], False))
+        elif kind is _TOKEN_EMPTY_FIELD_NAME:
+            warnings.append((token[1], "Ignoring line with empty field name", True))
+    skeleton.append((i + 1, None))
+    return (
+        head,
+        [(ln, line, s._over, s._own, w) for ln, line, s, w in sections],
+        skeleton
+    )
+
+
+class _InheritanceGraph:
+    """Граф наследования секций экземпляра :class:`Ini`
+    (см. :func:`Ini.descendants`, :func:`Ini.ancestors`).
+
+    Обратный индекс (родитель -> прямые потомки) строится сразу,
+    а транзитивные замыкания - по запросу для каждой секции
+    и запоминаются до перестроения графа.
+    """
+    __slots__ = ("sections", "children", "_ancestors", "_descendants")
+
+    sections: dict[str, Section]
+    children: dict[str, list[str]]
+    """ID родителя -> ID прямых потомков в порядке объявления."""
+    _ancestors: dict[str, tuple[str, ...]]
+    _descendants: dict[str, tuple[str, ...]]
+
+    def __init__(self, sections: dict[str, Section]):
+        self.sections = sections
+        self.children = {}
+        for section in sections.values():
+            for parent in section._parents:
+                self.children.setdefault(parent, []).append(section.id)
+        self._ancestors = {}
+        self._descendants = {}
+
+    def parents(self, _id: str) -> Iterable[str]:
+        section = self.sections.get(_id, None)
+        return () if (section is None) else section._parents
+
+    def ancestors(self, _id: str) -> tuple[str, ...]:
+        r = self._ancestors.get(_id, None)
+        if r is None:
+            self._ancestors[_id] = r = _walk(_id, self.parents)
+        return r
+
+    def descendants(self, _id: str) -> tuple[str, ...]:
+        r = self._descendants.get(_id, None)
+        if r is None:
+            self._descendants[_id] = r = _walk(_id, lambda k: self.children.get(k, ()))
+        return r
+
+
+def _fingerprint_group(_id: str) -> int:
+    """Номер группы секции в дереве хэшей (см. :func:`Ini.fingerprint`)."""
+    return zlib.crc32(_id.encode("utf-8", "surrogatepass")) % _FINGERPRINT_GROUPS
+
+
+class _FingerprintTree:
+    """Дерево хэшей секций экземпляра :class:`Ini` (см. :func:`Ini.fingerprint`).
+
+    Хэши групп запоминаются: при повторном обращении пересчитываются только
+    группы, в которых секции были добавлены, заменены (см. :func:`touch`)
+    или изменены (по журналу :data:`_FINGERPRINT_CHANGES`).
+    """
+    __slots__ = ("groups", "digests", "dirty", "changes")
+
+    groups: list[dict[str, bytes]] | None
+    """Группы: ID секции -> её хэш. ``None`` - дерево ещё не построено."""
+    digests: list[bytes]
+    """Хэши групп."""
+    dirty: set[int]
+    """Номера групп, которые нужно пересчитать."""
+    changes: int
+    """Просмотренная часть журнала :data:`_FINGERPRINT_CHANGES`."""
+
+    def __init__(self):
+        self.groups = None
+        self.digests = []
+        self.dirty = set()
+        self.changes = 0
+
+    def __reduce__(self):
+        # Журнал изменений у каждого процесса свой: дерево строится заново
+        return (_FingerprintTree, ())
+
+    def touch(self, _id: str) -> None:
+        """Учёт добавленной или заменённой секции."""
+        if self.groups is not None:
+            i = _fingerprint_group(_id)
+            self.groups[i].setdefault(_id, b"")
+            self.dirty.add(i)
+
+    def update(self, sections: dict[str, Section]) -> tuple[list[bytes], list[dict[str, bytes]]]:
+        """Актуальные хэши групп и сами группы.
+        """
+        groups = self.groups
+        if groups is None:
+            self.groups = groups = [{} for _ in range(_FINGERPRINT_GROUPS)]
+            for _id in sections:
+                groups[_fingerprint_group(_id)][_id] = b""
+            self.digests = [b""] * _FINGERPRINT_GROUPS
+            self.dirty = set(range(_FINGERPRINT_GROUPS))
+            self.changes = len(_FINGERPRINT_CHANGES)
+        else:
+            n = len(_FINGERPRINT_CHANGES)
+            for _id in _FINGERPRINT_CHANGES[self.changes:n]:
+                if _id in sections:
+                    self.dirty.add(_fingerprint_group(_id))
+            self.changes = n
+        for i in self.dirty:
+            group = groups[i]
+            for _id in list(group):
+                section = sections.get(_id, None)
+                if section is None:
+                    del group[_id]
+                else:
+                    group[_id] = section.fingerprint()
+            self.digests[i] = hashlib.blake2b(
+                b"".join(sorted(group.values())), digest_size=16
+            ).digest()
+        self.dirty.clear()
+        return self.digests, groups
+
+
+def _walk(start: str, edges: Callable[[str], Iterable[str]]) -> tuple[str, ...]:
+    """Обход графа в глубину (pre-order) от вершины ``start`` (не включая её).
+    Каждая вершина возвращается один раз; циклы допускаются.
+    """
+    order = []
+    seen = {start}
+    stack = list(reversed(tuple(edges(start))))
+    while stack:
+        k = stack.pop()
+        if k in seen:
+            continue
+        seen.add(k)
+        order.append(k)
+        stack.extend(reversed(tuple(edges(k))))
+    return tuple(order)
+
+
+class _SectionStream:
+    """Состояние потокового чтения (см. :func:`Ini.iter_sections`).
+
+    Секции не регистрируются в экземпляре :class:`Ini`: после возврата
+    секции сохраняются только поля тех из них, от которых наследуются
+    ещё не считанные секции.
+
+    Секция завершена, когда в её файле объявлена следующая секция или файл
+    закончился: после include-директивы поля снова записываются в секцию
+    включающего файла, даже если включаемый файл объявил новые секции.
+    """
+    __slots__ = ("ini", "base", "pvw", "refs", "parents", "open", "pending", "done")
+
+    ini: "Ini"
+    """Служебный экземпляр для include-директив и сообщений
+    (чтобы не затрагивать зависимости и журнал :attr:`base`)."""
+    base: "Ini"
+    """Экземпляр, у которого вызван :func:`Ini.iter_sections`.
+    Его секции тоже могут быть родителями."""
+    pvw: bool
+    refs: dict[str, int]
+    """ID -> сколько раз секция указана родителем (по предварительному
+    просмотру файлов, см. :func:`scan`; с запасом)."""
+    parents: dict[str, "_Layers"]
+    """Поля завершённых секций, от которых ещё будут наследоваться."""
+    open: dict[str, Section]
+    """Незавершённые секции (не больше одной на уровень вложенности ``#include``)."""
+    pending: deque[Section]
+    """Ещё не возвращённые секции в порядке объявления."""
+    done: set[str]
+    """ID всех завершённых секций (для поиска дубликатов)."""
+
+    def __init__(self, base: "Ini", preserve_value_whitespaces: bool):
+        self.ini = Ini(name=base._name)
+        self.ini.gdm = base.gdm
+        self.ini.gda = base.gda
+        self.ini.show_ltx_warnings = base.show_ltx_warnings
+        self.ini._log = None
+        self.base = base
+        self.pvw = preserve_value_whitespaces
+        self.refs = {}
+        self.parents = {}
+        self.open = {}
+        self.pending = deque()
+        self.done = set()
+
+    def scan(self, fp: str, text: str, chain: tuple[str, ...] = ()) -> None:
+        """Предварительный просмотр файла (и включаемых им) без разбора:
+        подсчёт ссылок на родителей в объявлениях секций.
+
+        Строки не классифицируются так же строго, как в :func:`_tokenize`
+        (комментарии, ``custom_data``), поэтому лишние ссылки возможны,
+        а пропущенные - нет. Невалидные include-директивы пропускаются:
+        ошибка будет выведена при чтении.
+        """
+        refs = self.refs
+        chain = chain + (fp,)
+        for line in _iter_lines(text):
+            if "]:" in line:
+                line = line.strip()
+                if line.startswith("["):
+                    for part in line[line.find("]:")+2:].split(","):
+                        parent = _cut_comment(part.strip()).strip().lower()
+                        refs[parent] = refs.get(parent, 0) + 1
+            elif "#include" in line:
+                line = _cut_comment(line.strip())
+                if not line.startswith("#include"):
+                    continue
+                show_ltx_warnings = self.ini.show_ltx_warnings
+                self.ini.show_ltx_warnings = False
+                try:
+                    fp_inc = self.ini._resolve_include(line, 0, fp)
+                    if fp_inc not in chain:
+                        self.scan(fp_inc, read_file(fp_inc), chain)
+                except (Ini.Error, OSError, UnicodeDecodeError):
+                    continue
+                finally:
+                    self.ini.show_ltx_warnings = show_ltx_warnings
+
+    def read(self, fp: str, text: str, current: Section | None) -> Iterator[Section]:
+        """Разбор файла с возвратом секций по мере их завершения.
+
+        :param current: Текущая секция включающего файла.
+        """
+        ini = self.ini
+        fn_src = Path(fp).name
+        tokens = _tokenize(_iter_lines(text), current is not None, self.pvw)
+        del text
+        declared = None  # последняя секция, объявленная в этом файле
+        for token in tokens:
+            kind = token[0]
+            if kind is _TOKEN_FIELD:
+                field = sys.intern(token[2])
+                if current._set(field, token[3], own=True):
+                    ini._reader_warning(
+                        fp, token[1], current.id, f"Redeclaration of '{field}'"
+                    )
+            elif kind is _TOKEN_SECTION:
+                if declared is not None:
+                    yield from self._complete(declared)
+                current = declared = self._declare(token[2], token[1], fp, fn_src)
+            elif kind is _TOKEN_HEREDOC:
+                current._set("custom_data", token[2])
+            elif kind is _TOKEN_INCLUDE:
+                fp_inc = ini._resolve_include(token[2], token[1], fp)
+                yield from self.read(fp_inc, read_file(fp_inc), current)
+            elif kind is _TOKEN_WARNING:
+                ini._reader_warning(fp, token[1], None, token[2])
+            elif kind is _TOKEN_EMPTY_FIELD_NAME:
+                ini._reader_warning(
+                    fp, token[1], current.id, "Ignoring line with empty field name"
+                )
+        if declared is not None:
+            yield from self._complete(declared)
+
+    def _declare(self, line: str, ln: int, fp: str, fn_src: str) -> Section:
+        ini = self.ini
+        _id, parents = ini._parse_declaration(line, ln, fp, self.done)
+        if (_id in self.open) or (_id in self.base._s):
+            ini._reader_error(fp, ln, f"Duplicate section [{_id}] found")
+        section = Section(_id, _src=fn_src)
+        for parent in parents or ():
+            if (psect := self.open.get(parent)) is not None:
+                self.refs[parent] -= 1
+                layers = psect._snapshot()
+            elif (layers := self.parents.get(parent)) is not None:
+                # Поля родителя больше не нужны после последней ссылки на него
+                self.refs[parent] -= 1
+                if self.refs[parent] == 0:
+                    del self.parents[parent]
+            elif (psect := self.base._s.get(parent)) is not None:
+                layers = psect._snapshot()
+            else:
+                ini._reader_error(
+                    fp, ln, f"Inheritance from unknown section [{parent}]"
+                )
+            section._inherit(layers)
+        if parents is not None:
+            section._parents = tuple(parents)
+        self.open[_id] = section
+        self.pending.append(section)
+        return section
+
+    def _complete(self, section: Section) -> Iterator[Section]:
+        """Завершение секции и возврат всех готовых секций
+        (с сохранением порядка объявления).
+        """
+        del self.open[section.id]
+        if self.refs.get(section.id, 0) > 0:
+            self.parents[section.id] = section._snapshot()
+        self.done.add(section.id)
+        pending = self.pending
+        while pending and (pending[0].id not in self.open):
+            yield pending.popleft()
+
+
 # ----------------------------------------------------------------
 
 
@@ -626,6 +1759,44 @@ class Ini:
     _s: dict[str, Section]
     _name: str
 
+    _deps: dict[str, tuple[int, int] | None]
+    """Файлы, от которых зависит содержимое экземпляра:
+    путь -> ``(size, mtime_ns)`` на момент чтения.
+
+    Включает все считанные файлы (в т.ч. через ``#include``),
+    а также проверенные, но не найденные пути (значение ``None``):
+    появление такого файла может изменить результат чтения
+    (например, файл в gamedata мода перекроет файл оригинала).
+    """
+
+    _values: dict[str, str]
+    """Пул коротких значений полей: одинаковые значения (``0``, ``1``, ``true``, ...)
+    разных секций хранятся в одном экземпляре строки."""
+
+    _log: _ReadLog | None
+    """Журнал вызовов :func:`read` для :func:`refresh`.
+    ``None``, если данные считывались напрямую через :func:`read_raw`."""
+
+    _refreshing: _Refresh | None
+    """Состояние выполняющегося :func:`refresh`."""
+
+    _probed: list[str] | None
+    """Если не ``None``, то сюда записываются пути,
+    проверяемые :func:`_probe_file`."""
+
+    _indexes: dict[str | None, dict[str | None, tuple[Section, ...]] | None]
+    """Вторичные индексы (см. :func:`build_index`): поле -> значение поля ->
+    секции с этим значением (в порядке объявления).
+    Ключ ``None`` - индекс имён полей (см. :func:`with_field`).
+    Значение ``None`` - индекс устарел и будет перестроен при обращении к нему."""
+
+    _graph: _InheritanceGraph | None
+    """Граф наследования секций (см. :func:`descendants`).
+    ``None`` - ещё не построен или устарел."""
+
+    _fp_tree: _FingerprintTree
+    """Дерево хэшей секций (см. :func:`fingerprint`)."""
+
     gdm: Path | None
     """Объект пути до основной папки gamedata."""
 
@@ -648,6 +1819,14 @@ class Ini:
     def __init__(self, name: str = "", ini_meta: Self | None = None):
         self._s = {}
         self._name = name
+        self._deps = {}
+        self._values = {}
+        self._log = _ReadLog([])
+        self._refreshing = None
+        self._probed = None
+        self._indexes = {}
+        self._graph = None
+        self._fp_tree = _FingerprintTree()
         self.gdm = None
         self.gda = None
         self.show_ltx_warnings = True
@@ -748,12 +1927,271 @@ class Ini:
             parts.append(msg)
             print_warning(" | ".join(parts))
 
+    def _add_dep(self, fp: str, sig: tuple[int, int] | None) -> None:
+        """Регистрация файла как зависимости (см. :attr:`_deps`).
+        """
+        if self._probed is not None:
+            self._probed.append(fp)
+        if sig is None:
+            self._deps.setdefault(fp, None)
+        else:
+            self._deps[fp] = sig
+
+    def _probe_file(self, p: Path) -> bool:
+        """Проверка существования файла с регистрацией его как зависимости.
+        """
+        fp = str(p)
+        sig = file_signature(fp)
+        self._add_dep(fp, sig)
+        return sig is not None
+
+    def _probe_gamedata(self, path: str) -> str | None:
+        """Поиск файла в gamedata (см. :class:`GamedataFS`)
+        с регистрацией его как зависимости.
+
+        Если файл найден в gamedata оригинала, то путь в gamedata мода
+        тоже регистрируется: появление там файла перекроет найденный.
+
+        :param path: Путь до файла относительно папки gamedata
+            (не выходящий за её пределы).
+        :return: Реальный путь до файла или None, если его нет.
+        """
+        found = gamedata_fs(self.gdm, self.gda).locate(path)
+        if (found is None) or (found[0] > 0):
+            parts = GamedataFS.split(path)
+            self._add_dep(str(self.gdm.joinpath(*parts)), None)
+            if found is None:
+                if self.gda is not None:
+                    self._add_dep(str(self.gda.joinpath(*parts)), None)
+                return None
+        fp = str(found[1])
+        sig = file_signature(fp)
+        self._add_dep(fp, sig)
+        return fp if (sig is not None) else None
+
+    def _gamedata_dir(self, fp: str) -> str | None:
+        """Путь до папки файла относительно папки gamedata
+        или None, если файл не из gamedata (или путь не абсолютный).
+        """
+        for gd_path in (self.gdm, self.gda):
+            if gd_path is None:
+                continue
+            prefix = os.path.join(gd_path, "")
+            if fp.startswith(prefix):
+                return os.path.dirname(fp[len(prefix):])
+        return None
+
+    def _resolve_include(self, line: str, ln: int, fp_src: str) -> str:
+        """Разбор строки include-директивы и поиск включаемого файла.
+
+        :param line: Строка директивы (без комментария).
+        :param ln: Номер строки (для сообщений об ошибках).
+        :param fp_src: Путь к файлу, в котором находится директива.
+        :raises Ini.Error: если директива невалидна или файла не существует.
+        :return: Абсолютный путь до включаемого файла.
+        """
+        # Извлечение пути до файла.
+        parts = line.split('"')
+        if len(parts) == 1:
+            self._reader_error(fp_src, ln, "Invalid #include syntax")
+        elif len(parts) != 3:
+            self._reader_warning(fp_src, ln, None, "Strange #include syntax")
+        part_fp = parts[1].strip()
+        if len(fp_src) == 0:
+            self._reader_error(fp_src, ln, "Can't process #include: unknown base path")
+
+        # Внутри gamedata файл ищется по индексу, без обращений к диску.
+        dir_gd = self._gamedata_dir(fp_src)
+        if dir_gd is not None:
+            path = os.path.join(dir_gd, part_fp)
+            if (parts_gd := GamedataFS.split(path)) is not None:
+                fp = self._probe_gamedata(path)
+                if fp is None:
+                    self._reader_error(fp_src, ln, (
+                        f"#include error: gamedata doesn't have this file"
+                        f" (\"{Path(*parts_gd)}\")"
+                    ))
+                return fp
+
+        # Получение абсолютного пути базовой директории.
+        dir_base = Path(fp_src).parent.resolve()
+
+        # Объекты путей до gamedata
+        gdm = self.gdm
+        gda = self.gda
+
+        # Если это внутри оригинальной gamedata,
+        #  то нужно перепрыгнуть в gamedata мода.
+        if (gdm is not None) and (gda is not None):
+            if dir_base.is_relative_to(gda):
+                dir_base = gdm.joinpath(dir_base.relative_to(gda))
+
+        # Путь до файла, который нужно включить.
+        p_inc = dir_base.joinpath(part_fp).resolve()
+
+        # Если файла нет, а его путь внутри gamedata мода,
+        #  то пробуем найти его в папке оригинальной gamedata.
+        if (
+            not self._probe_file(p_inc)
+            and (gdm is not None)
+            and (gda is not None)
+        ):
+            if p_inc.is_relative_to(gdm):
+                p_inc = gda.joinpath(p_inc.relative_to(gdm))
+
+        # Если файла всё равно нет, то приплыли.
+        if not self._probe_file(p_inc):
+            # Определяем, шёл ли путь в какую-либо gamedata.
+            if (gdm is not None) and p_inc.is_relative_to(gdm):
+                inside_gamedata = True
+                str_inc = str(p_inc.relative_to(gdm))
+            elif (gda is not None) and p_inc.is_relative_to(gda):
+                inside_gamedata = True
+                str_inc = str(p_inc.relative_to(gda))
+            else:
+                inside_gamedata = False
+                str_inc = str(p_inc)
+            if inside_gamedata:
+                self._reader_error(fp_src, ln, (
+                    f"#include error: gamedata doesn't have this file"
+                    f" (\"{str_inc}\")"
+                ))
+            else:
+                self._reader_error(fp_src, ln, (
+                    f"#include error: file doesn't exist (\"{str_inc}\")"
+                ))
+
+        return str(p_inc)
+
+    def _parse_declaration(
+            self,
+            line: str,
+            ln: int,
+            fp_src: str,
+            known: Container[str]
+    ) -> tuple[str, list[str] | None]:
+        """Разбор строки объявления секции.
+
+        :param line: Строка объявления (без комментария), начинается с ``[``.
+        :param ln: Номер строки (для сообщений об ошибках).
+        :param fp_src: Путь к файлу, в котором находится объявление.
+        :param known: ID уже объявленных секций (для поиска дубликатов).
+        :raises Ini.Error: при невалидном объявлении.
+        :return: ID секции и список ID её родителей
+            (None, если секция ни от кого не наследуется).
+        """
+        # Parsing line
+        idx_cls = line.find("]")
+        idx_inh = line.find("]:")
+        if (idx_cls == -1):
+            self._reader_error(fp_src, ln, "Invalid section declaration")
+
+        # Some warnings about strange declarations
+        if idx_inh != -1:
+            if idx_cls != idx_inh:
+                self._reader_warning(
+                    fp_src, ln, None,
+                    "Garbage text inside the section declaration line"
+                )
+        else:
+            if idx_cls != (len(line.rstrip()) - 1):
+                self._reader_warning(
+                    fp_src, ln, None,
+                    "Garbage text at the end of the section declaration line"
+                )
+
+        # Section ID
+        _id = line[1:idx_cls].lower()
+        if _id in known:
+            self._reader_error(fp_src, ln, f"Duplicate section [{_id}] found")
+        if (len(_id) > 0) and (_id.split(maxsplit=1) != [_id]):
+            self._reader_warning(fp_src, ln, _id, "Unsafe section ID: whitespaces")
+        if len(_id) == 0:
+            self._reader_warning(fp_src, ln, _id, "Section with empty ID found")
+
+        # Inheritance
+        if idx_inh == -1:
+            return _id, None
+        parents = [
+            part.strip().lower() for part in line[idx_inh+2:].split(",")
+        ]
+        if any(len(s) == 0 for s in parents):
+            self._reader_error(fp_src, ln, "Invalid inheritance")
+        return _id, parents
+
+    def _declare_section(
+            self,
+            line: str,
+            ln: int,
+            fp_src: str,
+            fn_src: str,
+            lazy_body: "_LazyBody | None" = None,
+            reuse: bool = False
+    ) -> Section:
+        """Разбор строки объявления секции, создание и регистрация секции.
+
+        :param line: Строка объявления (без комментария), начинается с ``[``.
+        :param ln: Номер строки (для сообщений об ошибках).
+        :param fp_src: Путь к файлу, в котором находится объявление.
+        :param fn_src: Имя этого файла (для ``Section._src``).
+        :param lazy_body: Тело для ленивой секции. Если указано,
+            то вместо копирования полей родителей запоминаются ссылки на них.
+        :param reuse: Взять поля секции из предыдущего чтения, если это
+            возможно (см. :func:`refresh`); поля родителей при этом обновляются.
+        :raises Ini.Error: при невалидном объявлении.
+        :return: Объект новой секции.
+        """
+        _id, parents = self._parse_declaration(line, ln, fp_src, self._s)
+        section = Section(_id, _src=fn_src)
+        reused = self._refreshing.reuse(_id, fp_src) if reuse else None
+        keep = reused is not None  # поля родителей не изменились
+
+        # Inheritance
+        if parents is not None:
+            keep = keep and self._refreshing.kept.issuperset(parents)
+            for parent in parents:
+                psect = self._s.get(parent, None)
+                if psect is None:
+                    self._reader_error(
+                        fp_src, ln, f"Inheritance from unknown section [{parent}]"
+                    )
+                if keep:
+                    continue
+                if lazy_body is None:
+                    section._inherit(psect._snapshot())
+                elif (pbody := psect._lazy) is not None:
+                    lazy_body.parents.append((psect, pbody, len(pbody.segments)))
+                else:
+                    lazy_body.parents.append((psect, None, psect._snapshot()))
+
+        # Registrating
+        if lazy_body is not None:
+            section._make_lazy(lazy_body)
+        elif ((log := self._log) is not None) and log.journaled:
+            log.decl[_id] = fp_src
+            if parents is not None:
+                log.inherited.update(parents)
+        if reused is not None:
+            if keep:
+                self._refreshing.kept.add(_id)
+            else:
+                reused._base = section._base
+                reused._flat = None
+                reused._reset_typed()
+            section = reused
+        if parents is not None:
+            section._parents = tuple(parents)
+        self._s[_id] = section
+        return section
+
     def read_raw(
             self,
             raw: str,
             fp_src: str = "",
             _current_section: Section | None = None,
-            preserve_value_whitespaces: bool = False
+            preserve_value_whitespaces: bool = False,
+            parser: Literal["fast", "legacy"] = "fast",
+            lazy: bool = False
     ) -> None:
         """Считывание данных о секциях непосредственно со строки (str).
 
@@ -773,13 +2211,428 @@ class Ini:
         :param preserve_value_whitespaces: При чтении значения поля сохранить
             все его пробельные символы (кроме тех, что с краю).
             По умолчанию они сохраняются только если находятся между парой кавычек.
+        :param parser: Реализация разбора текста:
+
+            * ``fast`` - однопроходный токенизатор (см. :func:`_tokenize`).
+            * ``legacy`` - исходный построчный разбор.
+
+            Результат (секции и warning-сообщения) у обеих реализаций одинаковый.
+        :param lazy: Ленивое чтение (только для ``parser="fast"``).
+            Текст просматривается один раз для поиска объявлений секций,
+            include-директив и наследования, а поля секции разбираются
+            при первом обращении к ним (см. :func:`_index_raw`).
         :raises Ini.Error: при ошибке считывания.
         """
-        def _err(ln: int, msg: str):
-            self._reader_error(fp_src, ln, msg)
+        # Текст может не соответствовать никакому файлу: refresh() невозможен
+        self._log = None
+        self._invalidate_indexes()
+        self._read_raw(
+            raw, fp_src, _current_section, preserve_value_whitespaces, parser, lazy
+        )
+
+    def _read_raw(
+            self,
+            raw: str,
+            fp_src: str,
+            _current_section: Section | None,
+            preserve_value_whitespaces: bool,
+            parser: Literal["fast", "legacy"],
+            lazy: bool
+    ) -> None:
+        """Реализация :func:`read_raw`.
+        """
+        if lazy:
+            if parser != "fast":
+                raise ValueError(f"Lazy reading is not supported by parser: {parser}")
+            self._index_raw(
+                raw, fp_src, _current_section, preserve_value_whitespaces
+            )
+            return
+        match parser:
+            case "fast":
+                self._read_tokens(
+                    _tokenize(
+                        raw.splitlines(),
+                        _current_section is not None,
+                        preserve_value_whitespaces
+                    ),
+                    fp_src,
+                    _current_section,
+                    preserve_value_whitespaces
+                )
+            case "legacy":
+                self._read_raw_legacy(
+                    raw, fp_src, _current_section, preserve_value_whitespaces
+                )
+            case _:
+                raise ValueError(f"Unknown parser: {parser}")
+
+    def _read_tokens(
+            self,
+            tokens: Iterable[tuple],
+            fp_src: str,
+            current: Section | None,
+            preserve_value_whitespaces: bool,
+            skeleton: _Skeleton | None = None
+    ) -> None:
+        """Применение токенов, полученных от :func:`_tokenize`.
+
+        :param skeleton: Если указан, то сюда записывается структура файла
+            (см. :attr:`_ReadLog.skeletons`).
+        """
+        fn_src = Path(fp_src).name if (len(fp_src) > 0) else ""
+        pool = self._values
+        i, prev = -1, 0
+        for i, token in enumerate(tokens):
+            kind = token[0]
+            if kind is _TOKEN_FIELD:
+                assert current is not None
+                field = sys.intern(token[2])
+                value = token[3]
+                if (value is not None) and (len(value) <= _VALUE_POOL_MAX_LEN):
+                    value = pool.setdefault(value, value)
+                if current._set(field, value, own=True):
+                    self._reader_warning(
+                        fp_src, token[1], current.id, f"Redeclaration of '{field}'"
+                    )
+            elif kind is _TOKEN_SECTION:
+                if skeleton is not None:
+                    self._log_chunk(current, i > prev)
+                    skeleton.append((i, token))
+                    prev = i + 1
+                current = self._declare_section(token[2], token[1], fp_src, fn_src)
+            elif kind is _TOKEN_HEREDOC:
+                assert current is not None
+                current._set("custom_data", token[2])
+            elif kind is _TOKEN_INCLUDE:
+                if skeleton is not None:
+                    self._log_chunk(current, i > prev)
+                    skeleton.append((i, token))
+                    prev = i + 1
+                self._include(
+                    token[2], token[1], fp_src, current, preserve_value_whitespaces
+                )
+            elif kind is _TOKEN_WARNING:
+                self._reader_warning(fp_src, token[1], None, token[2])
+            elif kind is _TOKEN_EMPTY_FIELD_NAME:
+                assert current is not None
+                self._reader_warning(
+                    fp_src, token[1], current.id, "Ignoring line with empty field name"
+                )
+        if skeleton is not None:
+            self._log_chunk(current, i + 1 > prev)
+            skeleton.append((i + 1, None))
+
+    def _log_chunk(self, current: Section | None, nonempty: bool) -> None:
+        """Учёт в журнале очередной части тела текущей секции
+        (токенов между объявлениями секций и include-директивами).
+        """
+        if nonempty and (current is not None) and (current.id in self._log.inherited):
+            self._log.quirky.add(current.id)
+
+    def _include(
+            self,
+            line: str,
+            ln: int,
+            fp_src: str,
+            current: Section | None,
+            preserve_value_whitespaces: bool
+    ) -> None:
+        """Обработка include-директивы: поиск и чтение включаемого файла.
+        """
+        log = self._log
+        if (current is None) or (log is None) or not log.journaled:
+            str_inc = self._resolve_include(line, ln, fp_src)
+        else:
+            # Запоминаем, от каких файлов зависит тело секции
+            self._probed = probed = []
+            try:
+                str_inc = self._resolve_include(line, ln, fp_src)
+            finally:
+                self._probed = None
+            files = log.files.get(current.id)
+            if files is None:
+                log.files[current.id] = files = set()
+            files.update(probed)
+        self._read_file(str_inc, current, preserve_value_whitespaces)
+
+    def _read_file(
+            self,
+            fp: str,
+            current: Section | None,
+            preserve_value_whitespaces: bool
+    ) -> None:
+        """Чтение файла однопроходным токенизатором
+        (при :func:`refresh` неизменившиеся файлы не перечитываются).
+        """
+        has_section = current is not None
+        key = (fp, has_section, preserve_value_whitespaces)
+        state = self._refreshing
+        show_ltx_warnings = self.show_ltx_warnings
+        if state is not None:
+            if not state.is_changed(fp):
+                skeleton = state.log.skeletons.get(key)
+                if skeleton is not None:
+                    self._replay(fp, skeleton, current, preserve_value_whitespaces)
+                    return
+            # Файл может быть включён из неизменившегося файла,
+            #  warning-сообщения которого не выводятся
+            self.show_ltx_warnings = state.show_ltx_warnings
+
+        log = self._log
+        skeleton = [] if ((log is not None) and log.journaled) else None
+        try:
+            self._read_tokens(
+                _tokenize(
+                    read_file(fp).splitlines(),
+                    has_section,
+                    preserve_value_whitespaces
+                ),
+                fp,
+                current,
+                preserve_value_whitespaces,
+                skeleton
+            )
+        finally:
+            self.show_ltx_warnings = show_ltx_warnings
+        if skeleton is not None:
+            log.skeletons[key] = skeleton
+
+    def _replay(
+            self,
+            fp: str,
+            skeleton: _Skeleton,
+            current: Section | None,
+            preserve_value_whitespaces: bool
+    ) -> None:
+        """Повторное чтение неизменившегося файла при :func:`refresh`
+        по его структуре из журнала.
+
+        Объявления секций и include-директивы обрабатываются заново
+        (с проверкой на ошибки), а поля читаются только для тех секций,
+        которые нельзя взять из предыдущего чтения. Warning-сообщения
+        не выводятся: они уже выводились при предыдущем чтении.
+        """
+        state = self._refreshing
+        log = self._log
+        has_section = current is not None
+        fn_src = Path(fp).name if (len(fp) > 0) else ""
+        tokens = None
+        show_ltx_warnings = self.show_ltx_warnings
+        self.show_ltx_warnings = False
+        try:
+            prev = 0
+            for i, token in skeleton:
+                if (i > prev) and (current is not None):
+                    self._log_chunk(current, True)
+                    if current.id not in state.reused:
+                        if tokens is None:
+                            tokens = state.tokens(fp, has_section, preserve_value_whitespaces)
+                        self._read_tokens(
+                            tokens[prev:i], fp, current, preserve_value_whitespaces
+                        )
+                if token is None:
+                    break
+                if token[0] == _TOKEN_SECTION:  # журнал мог пройти через pickle
+                    current = self._declare_section(
+                        token[2], token[1], fp, fn_src, reuse=True
+                    )
+                else:
+                    self._include(
+                        token[2], token[1], fp, current, preserve_value_whitespaces
+                    )
+                prev = i + 1
+        finally:
+            self.show_ltx_warnings = show_ltx_warnings
+        log.skeletons[(fp, has_section, preserve_value_whitespaces)] = skeleton
+
+    def _index_raw(
+            self,
+            raw: str,
+            fp_src: str,
+            current: Section | None,
+            preserve_value_whitespaces: bool
+    ) -> None:
+        """Ленивое чтение (``read_raw(lazy=True)``).
+
+        Текст просматривается поиском строк-кандидатов по регулярному выражению:
+        обрабатываются только объявления секций, include-директивы и начала
+        многострочных ``custom_data``. Остальные строки запоминаются как
+        фрагменты тела текущей секции (смещения в тексте), которые будут
+        разобраны при первом обращении к полям секции (см. :func:`_materialize`).
+
+        Ошибки объявления секций (дубликаты, наследование) выявляются сразу,
+        а warning-сообщения о полях секции выводятся при её разборе.
+        """
+        # Регулярные выражения ниже разбивают текст на строки только по "\n",
+        #  а str.splitlines - ещё и по ряду других символов.
+        if any((c in raw) for c in _LINE_BREAKS_EXTRA):
+            raw = "\n".join(raw.splitlines())
+
+        fn_src = Path(fp_src).name if (len(fp_src) > 0) else ""
+        n = len(raw)
+        pos, ln = 0, 1  # начало очередной строки и её номер
+        seg_start, seg_ln = 0, 1
+        heredoc_pos = raw.find("<<END")
+        while True:
+            line_start = _index_search(_INDEX_PATTERN, raw, pos)
+            if (heredoc_pos != -1) and (heredoc_pos < pos):
+                heredoc_pos = raw.find("<<END", pos)
+            if (heredoc_pos != -1) and ((line_start == -1) or (heredoc_pos < line_start)):
+                # Кандидат на начало многострочного custom_data.
+                #  Внутри него объявлений быть не может: ищем его конец.
+                line_start = raw.rfind("\n", 0, heredoc_pos) + 1
+                line_end = _line_end(raw, heredoc_pos)
+                ln += raw.count("\n", pos, line_start)
+                pos = min(line_end + 1, n)
+                line = _cut_comment(raw[line_start:line_end].strip())
+                idx = line.find("=")
+                if (
+                    (current is None)
+                    or (idx == -1)
+                    or (line[:idx].strip() != "custom_data")
+                    or (line[idx+1:].strip() != "<<END")
+                ):
+                    ln += 1
+                    continue
+                while (end_start := _index_search(_INDEX_END_PATTERN, raw, pos)) != -1:
+                    pos = min(_line_end(raw, end_start) + 1, n)
+                    end_line = raw[end_start:pos].strip()
+                    if _cut_comment(end_line).strip() == "END":
+                        break
+                else:
+                    # Незакрытый custom_data: до конца файла объявлений нет.
+                    pos = n
+                    break
+                ln += raw.count("\n", line_start, pos)
+                continue
+            if line_start == -1:
+                break
+
+            line_end = _line_end(raw, line_start)
+            ln += raw.count("\n", pos, line_start)
+            pos = min(line_end + 1, n)
+            line = raw[line_start:line_end].strip()
+            if (line[0] == "#") and not line.startswith("#include"):
+                ln += 1
+                continue
+
+            # Объявление секции или include-директива
+            self._index_flush(
+                raw, fp_src, current, seg_start, line_start, seg_ln,
+                preserve_value_whitespaces
+            )
+            for token in _tokenize(
+                (line,), current is not None, preserve_value_whitespaces, ln
+            ):
+                kind = token[0]
+                if kind is _TOKEN_SECTION:
+                    current = self._declare_section(
+                        token[2], ln, fp_src, fn_src,
+                        lazy_body=_LazyBody(self, preserve_value_whitespaces)
+                    )
+                elif kind is _TOKEN_INCLUDE:
+                    str_inc = self._resolve_include(token[2], ln, fp_src)
+                    self._index_raw(
+                        read_file(str_inc), str_inc, current,
+                        preserve_value_whitespaces
+                    )
+                elif kind is _TOKEN_WARNING:
+                    self._reader_warning(fp_src, ln, None, token[2])
+            ln += 1
+            seg_start, seg_ln = pos, ln
+        self._index_flush(
+            raw, fp_src, current, seg_start, n, seg_ln,
+            preserve_value_whitespaces
+        )
+
+    def _index_flush(
+            self,
+            raw: str,
+            fp_src: str,
+            current: Section | None,
+            start: int,
+            end: int,
+            ln: int,
+            preserve_value_whitespaces: bool
+    ) -> None:
+        """Передача фрагмента ``raw[start:end]`` текущей секции.
+
+        Если секция ленивая, то фрагмент запоминается;
+        иначе (или если секции нет) разбирается сразу.
+        """
+        if start >= end:
+            return
+        body = current._lazy if (current is not None) else None
+        if body is not None:
+            body.segments.append((fp_src, raw, start, end, ln))
+        else:
+            self._read_tokens(
+                _tokenize(
+                    raw[start:end].splitlines(),
+                    current is not None,
+                    preserve_value_whitespaces,
+                    ln
+                ),
+                fp_src,
+                current,
+                preserve_value_whitespaces
+            )
+
+    def _materialize(self, section: Section) -> None:
+        """Разбор полей ленивой секции.
+        """
+        body = section._lazy
+        section._lazy = None
+        self._lazy_fill(section, body, len(body.segments))
+
+    def _lazy_fill(self, section: Section, body: _LazyBody, n_segments: int) -> None:
+        """Заполнение полей секции по первым ``n_segments`` фрагментам её тела.
+        """
+        section._init_fields()
+        for parent in body.parents:
+            psect, pbody, state = parent
+            if pbody is None:
+                section._inherit(state)
+                continue
+            n = state
+            if n == len(pbody.segments):
+                section._inherit(psect._snapshot())
+                continue
+            # Родитель дополнялся уже после объявления секции
+            #  (возможно при ``#include`` внутри тела родителя):
+            #  нужно его состояние на момент объявления.
+            tmp = Section(psect.id, _src=psect._src)
+            show_ltx_warnings = self.show_ltx_warnings
+            self.show_ltx_warnings = False
+            try:
+                self._lazy_fill(tmp, pbody, n)
+            finally:
+                self.show_ltx_warnings = show_ltx_warnings
+            section._inherit(tmp._snapshot())
+
+        pvw = body.preserve_value_whitespaces
+        for fp_src, raw, start, end, ln in body.segments[:n_segments]:
+            self._read_tokens(
+                _tokenize(raw[start:end].splitlines(), True, pvw, ln),
+                fp_src,
+                section,
+                pvw
+            )
+
+    def _read_raw_legacy(
+            self,
+            raw: str,
+            fp_src: str,
+            _current_section: Section | None,
+            preserve_value_whitespaces: bool
+    ) -> None:
+        """Исходная реализация :func:`read_raw` (``parser="legacy"``).
+        """
         def _wrn(ln: int, sid: str | None, msg: str) -> None:
             self._reader_warning(fp_src, ln, sid, msg)
         
+        fn_src = Path(fp_src).name if (len(fp_src) > 0) else ""
         custom_data_buffer: str | None = None
         for i, line in enumerate(raw.splitlines(), start=1):
             line = line.strip()
@@ -807,7 +2660,7 @@ class Ini:
                     "custom_data_buffer exists, but there is no current_section"
                 )
                 if (line.strip() == "END"):
-                    _current_section._fields["custom_data"] = custom_data_buffer
+                    _current_section._set("custom_data", custom_data_buffer)
                     custom_data_buffer = None
                 else:
                     custom_data_buffer += f"{line}\n"
@@ -819,62 +2672,8 @@ class Ini:
 
             # "#include" support
             if line.startswith("#include"):
-                # Извлечение пути до файла.
-                parts = line.split('"')
-                if len(parts) == 1:
-                    _err(i, "Invalid #include syntax")
-                elif len(parts) != 3:
-                    _wrn(i, None, "Strange #include syntax")
-                part_fp = parts[1].strip()
-
-                # Получение абсолютного пути базовой директории.
-                if len(fp_src) == 0:
-                    _err(i, "Can't process #include: unknown base path")
-                dir_base = Path(fp_src).parent.resolve()
-
-                # Объекты путей до gamedata
-                gdm = self.gdm
-                gda = self.gda
-
-                # Если это внутри оригинальной gamedata,
-                #  то нужно перепрыгнуть в gamedata мода.
-                if (gdm is not None) and (gda is not None):
-                    if dir_base.is_relative_to(gda):
-                        dir_base = gdm.joinpath(dir_base.relative_to(gda))
-
-                # Путь до файла, который нужно включить.
-                p_inc = dir_base.joinpath(part_fp).resolve()
-
-                # Если файла нет, а его путь внутри gamedata мода,
-                #  то пробуем найти его в папке оригинальной gamedata.
-                if not p_inc.is_file() and (gdm is not None) and (gda is not None):
-                    if p_inc.is_relative_to(gdm):
-                        p_inc = gda.joinpath(p_inc.relative_to(gdm))
-
-                # Если файла всё равно нет, то приплыли.
-                if not p_inc.is_file():
-                    # Определяем, шёл ли путь в какую-либо gamedata.
-                    if (gdm is not None) and p_inc.is_relative_to(gdm):
-                        inside_gamedata = True
-                        str_inc = str(p_inc.relative_to(gdm))
-                    elif (gda is not None) and p_inc.is_relative_to(gda):
-                        inside_gamedata = True
-                        str_inc = str(p_inc.relative_to(gda))
-                    else:
-                        inside_gamedata = False
-                        str_inc = str(p_inc)
-                    if inside_gamedata:
-                        _err(i, (
-                            f"#include error: gamedata doesn't have this file"
-                            f" (\"{str_inc}\")"
-                        ))
-                    else:
-                        _err(i, (
-                            f"#include error: file doesn't exist (\"{str_inc}\")"
-                        ))
-                
-                str_inc = str(p_inc)
-                self.read_raw(
+                str_inc = self._resolve_include(line, i, fp_src)
+                self._read_raw_legacy(
                     raw=read_file(str_inc),
                     fp_src=str_inc,
                     _current_section=_current_section,
@@ -884,55 +2683,7 @@ class Ini:
 
             # New section
             if line.startswith("["):
-                # Parsing line
-                idx_cls = line.find("]")
-                idx_inh = line.find("]:")
-                if (idx_cls == -1):
-                    _err(i, "Invalid section declaration")
-                
-                # Some warnings about strange declarations
-                if idx_inh != -1:
-                    if idx_cls != idx_inh:
-                        _wrn(
-                            i, None,
-                            "Garbage text inside the section declaration line"
-                        )
-                else:
-                    if idx_cls != (len(line.rstrip()) - 1):
-                        _wrn(
-                            i, None,
-                            "Garbage text at the end of the section declaration line"
-                        )
-                
-                # Initializing section
-                _id = line[1:idx_cls].lower()
-                if _id in self._s:
-                    _err(i, f"Duplicate section [{_id}] found")
-                if any(c.isspace() for c in _id):
-                    _wrn(i, _id, "Unsafe section ID: whitespaces")
-                if len(_id) == 0:
-                    _wrn(i, _id, "Section with empty ID found")
-                fn_src = Path(fp_src).name if (len(fp_src) > 0) else ""
-                section = Section(_id, _src=fn_src)
-
-                # Inheritance
-                if (idx_inh != -1):
-                    parents = [
-                        part.strip().lower() for part in line[idx_inh+2:].split(",")
-                    ]
-                    if any(len(s) == 0 for s in parents):
-                        _err(i, "Invalid inheritance")
-                    for parent in parents:
-                        psect = self._s.get(parent, None)
-                        if psect is not None:
-                            for k, v in psect._fields.items():
-                                section._fields[k] = v
-                        else:
-                            _err(i, f"Inheritance from unknown section [{parent}]")
-
-                # Registrating
-                self._s[_id] = section
-                _current_section = self._s[_id]
+                _current_section = self._declare_section(line, i, fp_src, fn_src)
                 continue
 
             # Section's field
@@ -960,10 +2711,9 @@ class Ini:
                     field, value = line.strip(), None
                 
                 # Setting field's value
-                if field in _current_section._fields_own:
+                if _current_section._is_own(field):
                     _wrn(i, _id, f"Redeclaration of '{field}'")
-                _current_section._fields[field] = value
-                _current_section._fields_own.add(field)
+                _current_section._set(field, value, own=True)
             else:
                 _wrn(i, None, "Ignoring redundant text")
                 continue
@@ -972,7 +2722,9 @@ class Ini:
             self,
             fp0: str,
             inside_gamedata: bool = False,
-            preserve_value_whitespaces: bool = False
+            preserve_value_whitespaces: bool = False,
+            parser: Literal["fast", "legacy"] = "fast",
+            lazy: bool = False
     ) -> None:
         """Считать данные с файла.
 
@@ -984,31 +2736,262 @@ class Ini:
         :param preserve_value_whitespaces: При чтении значения поля сохранить
             все его пробельные символы (кроме тех, что с краю).
             По умолчанию они сохраняются только если находятся между парой кавычек.
+        :param parser: Реализация разбора текста, см. :func:`read_raw`.
+        :param lazy: Ленивое чтение, см. :func:`read_raw`.
         :raises Ini.Error: при ошибке считывания.
         """
+        self._refresh_gamedata_fs()
+        self._invalidate_indexes()
+        log = self._log
+        if log is not None:
+            log.reads.append(
+                (fp0, inside_gamedata, preserve_value_whitespaces, parser, lazy)
+            )
+        try:
+            self._read(fp0, inside_gamedata, preserve_value_whitespaces, parser, lazy)
+        except BaseException:
+            if self._log is not None:
+                self._log.failed = True
+            raise
+
+    def _read(
+            self,
+            fp0: str,
+            inside_gamedata: bool,
+            preserve_value_whitespaces: bool,
+            parser: Literal["fast", "legacy"],
+            lazy: bool
+    ) -> None:
+        """Реализация :func:`read`.
+        """
+        fp = self._locate(fp0, inside_gamedata)
+        if (parser == "fast") and not lazy:
+            self._read_file(fp, None, preserve_value_whitespaces)
+            return
+        if self._log is not None:
+            self._log.journaled = False
+        self._read_raw(
+            read_file(fp), fp, None, preserve_value_whitespaces, parser, lazy
+        )
+
+    def iter_sections(
+            self,
+            fp0: str,
+            inside_gamedata: bool = False,
+            preserve_value_whitespaces: bool = False
+    ) -> Iterator[Section]:
+        """Потоковое чтение файла: секции возвращаются по одной
+        (в порядке объявления), как только каждая из них считана полностью.
+
+        Подходит для однопроходной обработки крупных файлов
+        (например, ``alife_*.ltx``): считанные секции не регистрируются
+        в экземпляре и в памяти не накапливаются. Сохраняются только поля
+        секций, от которых ещё будут наследоваться (для этого файл
+        предварительно просматривается), и ID всех секций.
+
+        * Поддерживает наследование: родителем может быть ранее
+          считанная секция файла или секция самого экземпляра.
+        * Поддерживает include-директивы и многострочные значения ``custom_data``.
+
+        :param fp0: Путь до файла, см. :func:`read`.
+        :param inside_gamedata: См. :func:`read`.
+        :param preserve_value_whitespaces: См. :func:`read_raw`.
+        :raises Ini.Error: при ошибке считывания (в момент получения
+            очередной секции; уже полученные секции остаются валидными).
+        :return: Итератор по секциям в порядке их объявления.
+        """
+        self._refresh_gamedata_fs()
+        fp = self._locate(fp0, inside_gamedata)
+        stream = _SectionStream(self, preserve_value_whitespaces)
+        text = read_file(fp)
+        stream.scan(fp, text)
+        sections = stream.read(fp, text, None)
+        del text
+        yield from sections
+
+    def _refresh_gamedata_fs(self) -> None:
+        """Учёт изменений в папках gamedata перед чтением (см. :func:`GamedataFS.refresh`).
+        """
+        if self.gdm is not None:
+            gamedata_fs(self.gdm, self.gda).refresh()
+
+    def _locate(self, fp0: str, inside_gamedata: bool) -> str:
+        """Поиск файла для :func:`read` с регистрацией его как зависимости.
+
+        :raises Ini.Error: если файла не существует.
+        :return: Путь до файла.
+        """
         fp = None
         if inside_gamedata:
             if self.gdm is None:
                 self._raise("gamedata path is not specified")
-            p = self.gdm.joinpath(fp0).resolve()
-            if p.is_file():
-                fp = str(p)
-            elif self.gda is not None:
-                p = self.gda.joinpath(fp0).resolve()
-                if p.is_file():
-                    fp = str(p)
+            if GamedataFS.split(fp0) is not None:
+                fp = self._probe_gamedata(fp0)
             if fp is None:
                 self._raise(f"gamedata doesn't have this file (\"{fp0}\")")
         else:
-            if Path(fp0).is_file():
+            if self._probe_file(Path(fp0).resolve()):
                 fp = fp0
             if fp is None:
                 self._raise(f"FILE DOES NOT EXIST (\"{fp}\")")
-        self.read_raw(
-            raw=read_file(fp),
-            fp_src=fp,
-            preserve_value_whitespaces=preserve_value_whitespaces
+        return fp
+
+    def read_many(
+            self,
+            fps: Iterable[str],
+            inside_gamedata: bool = False,
+            preserve_value_whitespaces: bool = False,
+            max_workers: int | None = None
+    ) -> None:
+        """Считать данные с нескольких файлов.
+
+        Результат (секции, warning-сообщения, ошибки) такой же, как при
+        последовательных вызовах :func:`read` для каждого из файлов,
+        но файлы считываются и разбираются параллельно в нескольких процессах
+        (см. :func:`_parse_file`), а секции добавляются в исходном порядке файлов.
+
+        Имеет смысл для набора крупных файлов (например, ``alife_*.ltx``
+        декомпилированного all.spawn): запуск процессов и передача
+        результатов также занимают время.
+
+        :param fps: Пути до файлов.
+        :param inside_gamedata: См. :func:`read`.
+        :param preserve_value_whitespaces: См. :func:`read`.
+        :param max_workers: Число процессов. По умолчанию - число ядер процессора.
+            Если процесс нужен только один, то файлы просто считываются по очереди.
+        :raises Ini.Error: при ошибке считывания.
+        """
+        self._refresh_gamedata_fs()
+        self._invalidate_indexes()
+        fps = list(fps)
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(fps))
+        if max_workers <= 1:
+            for fp0 in fps:
+                self.read(fp0, inside_gamedata, preserve_value_whitespaces)
+            return
+
+        # Файлы ищутся заранее, но ошибка поиска (как и при последовательном
+        #  чтении) возникает только после обработки предыдущих файлов.
+        paths = []
+        error = None
+        for fp0 in fps:
+            try:
+                paths.append(self._locate(fp0, inside_gamedata))
+            except Ini.Error as e:
+                error = e
+                break
+
+        # Пул процессов нужен только здесь: модули импортируются при вызове
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        log = self._log
+        # Как и в Windows, процессы запускаются с нуля: fork процесса
+        #  с несколькими потоками (например, Jupyter) может зависнуть.
+        executor = ProcessPoolExecutor(
+            max_workers, mp_context=multiprocessing.get_context("spawn")
         )
+        try:
+            results = executor.map(
+                _parse_file, paths, itertools.repeat(preserve_value_whitespaces)
+            )
+            for fp0, fp in zip(fps, paths + [None]):
+                if log is not None:
+                    log.reads.append(
+                        (fp0, inside_gamedata, preserve_value_whitespaces, "fast", False)
+                    )
+                try:
+                    if fp is None:
+                        raise error
+                    parsed = next(results)
+                    if parsed is None:
+                        self._read_file(fp, None, preserve_value_whitespaces)
+                    else:
+                        self._merge_parsed(fp, parsed, preserve_value_whitespaces)
+                except BaseException:
+                    if log is not None:
+                        log.failed = True
+                    raise
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _merge_parsed(
+            self,
+            fp: str,
+            parsed: _ParsedFile,
+            preserve_value_whitespaces: bool
+    ) -> None:
+        """Добавление секций файла, разобранного :func:`_parse_file`.
+        """
+        fn_src = Path(fp).name if (len(fp) > 0) else ""
+        head, sections, skeleton = parsed
+        pool = self._values
+        for ln, msg in head:
+            self._reader_warning(fp, ln, None, msg)
+        for ln, line, fields, own, warnings in sections:
+            section = self._declare_section(line, ln, fp, fn_src)
+            # Строки из другого процесса - новые объекты: как в _read_tokens
+            section._over = {
+                sys.intern(field): (
+                    pool.setdefault(value, value)
+                    if (value is not None) and (len(value) <= _VALUE_POOL_MAX_LEN)
+                    else value
+                )
+                for field, value in fields.items()
+            }
+            section._own = own
+            for wln, msg, with_id in warnings:
+                self._reader_warning(fp, wln, section.id if with_id else None, msg)
+        log = self._log
+        if (log is not None) and log.journaled:
+            log.skeletons[(fp, False, preserve_value_whitespaces)] = skeleton
+
+    def refresh(self) -> bool:
+        """Перечитать данные, если изменились файлы, из которых они были считаны.
+
+        Результат такой же, как при повторении всех вызовов :func:`read`
+        на пустом экземпляре (порядок секций, ошибки дубликатов и наследования
+        и т.д.), но повторно разбираются только изменившиеся файлы
+        (см. :attr:`_deps`). Поля секций, на которые изменения не повлияли,
+        не перечитываются (объекты таких секций сохраняются), а унаследованные
+        ими поля обновляются. Warning-сообщения выводятся только
+        для изменившихся файлов.
+
+        Изменения, внесённые в секции вручную (в т.ч. через :func:`add`),
+        не отслеживаются: такие секции могут как сохраниться, так и пропасть.
+
+        :raises Ini.Error: при ошибке считывания, а также если данные
+            считывались напрямую через :func:`read_raw`.
+        :return: Были ли данные перечитаны.
+        """
+        log = self._log
+        if log is None:
+            self._raise("refresh() is not available after read_raw()")
+        changed = {
+            fp for fp, sig in self._deps.items() if file_signature(fp) != sig
+        }
+        if (len(changed) == 0) and not log.failed:
+            return False
+        self._refresh_gamedata_fs()
+        self._invalidate_indexes()
+
+        old = self._s
+        self._s = {}
+        self._deps = {}
+        self._log = _ReadLog(log.reads)
+        if log.journaled and not log.failed:
+            self._refreshing = _Refresh(log, changed, old, self.show_ltx_warnings)
+        try:
+            for args in log.reads:
+                self._read(*args)
+        except BaseException:
+            self._log.failed = True
+            raise
+        finally:
+            self._refreshing = None
+        return True
 
 
     def write(
@@ -1077,12 +3060,192 @@ class Ini:
         """
         if id not in self._s:
             self._raise(f"section [{id}] doesn't exist")
-        return (k in self._s[id]._fields)
+        return self._s[id]._has(k)
+
+
+    def _index(self, field: str | None) -> dict[str | None, tuple[Section, ...]]:
+        """Актуальный вторичный индекс (при необходимости строится заново).
+        """
+        index = self._indexes.get(field, None)
+        if index is not None:
+            return index
+        groups: dict[str | None, list[Section]] = {}
+        if field is None:
+            for section in self._s.values():
+                for k in section._resolved():
+                    groups.setdefault(k, []).append(section)
+        else:
+            for section in self._s.values():
+                if section._has(field):
+                    groups.setdefault(section._get(field), []).append(section)
+        index = {value: tuple(group) for value, group in groups.items()}
+        self._indexes[field] = index
+        return index
+
+    def _index_append(self, section: Section) -> None:
+        """Добавление новой (последней) секции в построенные индексы.
+        """
+        # У предков секции появился потомок: замыкания нужно пересчитать
+        self._graph = None
+        for field, index in self._indexes.items():
+            if index is None:
+                continue
+            if field is None:
+                for k in section._resolved():
+                    index[k] = index.get(k, ()) + (section,)
+            elif section._has(field):
+                value = section._get(field)
+                index[value] = index.get(value, ()) + (section,)
+
+    def _invalidate_indexes(self) -> None:
+        """Пометка всех вторичных индексов (в т.ч. графа наследования)
+        как устаревших (перед чтением).
+        """
+        for field in self._indexes:
+            self._indexes[field] = None
+        self._graph = None
+        self._fp_tree = _FingerprintTree()
+
+    def build_index(self, field: str) -> Mapping[str | None, tuple[Section, ...]]:
+        """Построение вторичного индекса по значению поля.
+
+        Индекс поддерживается в актуальном состоянии при :func:`add`
+        и :func:`clear` и перестраивается при первом обращении после чтения.
+        Изменения полей самих секций (через методы :class:`Section`)
+        не отслеживаются: после них индекс нужно построить заново этим методом.
+
+        Построение индекса приводит к разбору всех ленивых секций
+        (см. :func:`read_raw`).
+
+        :param field: Имя поля.
+        :return: Индекс (только для чтения): значение поля (как в файле,
+            без преобразований; ``None`` - поле без значения) ->
+            секции с этим значением в порядке объявления.
+            Секции без этого поля в индекс не входят.
+        """
+        self._indexes[field] = None
+        return MappingProxyType(self._index(field))
+
+    def lookup(self, field: str, value: str | None) -> tuple[Section, ...]:
+        """Поиск секций по значению поля (через вторичный индекс,
+        см. :func:`build_index`; при отсутствии индекс строится).
+
+        :param field: Имя поля.
+        :param value: Значение поля (сравнивается как строка, без преобразований;
+            ``None`` - поле без значения).
+        :return: Секции с указанным значением поля в порядке объявления.
+        """
+        return self._index(field).get(value, ())
+
+    def with_field(self, field: str) -> tuple[Section, ...]:
+        """Поиск секций, у которых есть указанное поле (в т.ч. унаследованное),
+        через индекс имён полей всех секций (см. :func:`build_index`).
+
+        :param field: Имя поля.
+        :return: Секции с этим полем в порядке объявления.
+        """
+        return self._index(None).get(field, ())
+
+
+    def _inheritance(self) -> _InheritanceGraph:
+        if self._graph is None:
+            self._graph = _InheritanceGraph(self._s)
+        return self._graph
+
+    def children(self, id: str) -> tuple[str, ...]:
+        """ID прямых потомков секции (секций, у которых она указана
+        в числе родителей) в порядке объявления.
+
+        Как и остальные запросы к графу наследования, использует
+        обратный индекс, который строится при первом обращении
+        и поддерживается так же, как индексы :func:`build_index`.
+
+        :param id: ID секции.
+        :raises Ini.Error: если секции с указанным ID не существует.
+        """
+        if id not in self._s:
+            self._raise(f"section [{id}] doesn't exist")
+        return tuple(self._inheritance().children.get(id, ()))
+
+    def descendants(self, id: str) -> tuple[str, ...]:
+        """ID всех потомков секции (прямых и транзитивных).
+
+        Порядок - обход в глубину: за каждым прямым потомком
+        следуют его собственные потомки. Результат для каждой секции
+        вычисляется один раз и запоминается до изменения экземпляра.
+
+        :param id: ID секции.
+        :raises Ini.Error: если секции с указанным ID не существует.
+        """
+        if id not in self._s:
+            self._raise(f"section [{id}] doesn't exist")
+        return self._inheritance().descendants(id)
+
+    def ancestors(self, id: str) -> tuple[str, ...]:
+        """ID всех предков секции (родителей, их родителей и т.д.).
+
+        Порядок - обход в глубину по :attr:`Section.parents`:
+        за каждым родителем следуют его собственные предки.
+        Результат запоминается так же, как в :func:`descendants`.
+
+        :param id: ID секции.
+        :raises Ini.Error: если секции с указанным ID не существует.
+        """
+        if id not in self._s:
+            self._raise(f"section [{id}] doesn't exist")
+        return self._inheritance().ancestors(id)
+
+
+    def _fingerprint_tree(self) -> tuple[list[bytes], list[dict[str, bytes]]]:
+        """Двухуровневое дерево хэшей (см. :func:`fingerprint`).
+
+        :return: Хэши групп и сами группы: ID секции -> её хэш.
+        """
+        return self._fp_tree.update(self._s)
+
+    def fingerprint(self) -> bytes:
+        """Хэш содержимого всех секций (см. :func:`Section.fingerprint`).
+
+        Секции распределяются по группам по хэшу ID, хэш каждой группы
+        считается по хэшам её секций, а итоговый - по хэшам групп
+        (дерево Меркла). Порядок секций на результат не влияет.
+
+        Хэши секций и групп запоминаются, поэтому повторный вызов
+        пересчитывает только хэши изменившихся секций и их групп.
+
+        :return: 16 байт BLAKE2b.
+        """
+        digests, _ = self._fingerprint_tree()
+        return hashlib.blake2b(b"".join(digests), digest_size=16).digest()
+
+    def differing_ids(self, other: Self) -> set[str]:
+        """ID секций, содержимое которых у двух экземпляров различается
+        (в т.ч. секций, которые есть только в одном из них).
+
+        Сравниваются хэши (см. :func:`fingerprint`): секции заново
+        сравниваются только в группах с разными хэшами.
+
+        :param other: Экземпляр для сравнения.
+        """
+        digests_1, groups_1 = self._fingerprint_tree()
+        digests_2, groups_2 = other._fingerprint_tree()
+        ids = set()
+        for i, (d1, d2) in enumerate(zip(digests_1, digests_2)):
+            if d1 == d2:
+                continue
+            g1, g2 = groups_1[i], groups_2[i]
+            ids.update(_id for _id, fp in g1.items() if g2.get(_id, None) != fp)
+            ids.update(_id for _id in g2 if _id not in g1)
+        return ids
 
 
     def clear(self):
         """Удаление всех секций."""
         self._s.clear()
+        self._deps.clear()
+        self._values.clear()
+        self._log = _ReadLog([])
+        self._invalidate_indexes()
 
     def add(
             self,
@@ -1102,11 +3265,17 @@ class Ini:
         """
         if not overwrite and self.section_exist(section.id):
             self._raise(f"Section [{section.id}] already exists")
-        self._s[section.id] = (
-            section
-            if by_reference
-            else Section(id=section.id, init=section)
-        )
+        if not by_reference:
+            section = Section(id=section.id, init=section)
+        fp_tree = self._fp_tree
+        if section.id in self._s:
+            # Секция заменяется на своём месте: индексы проще перестроить
+            self._invalidate_indexes()
+            self._fp_tree = fp_tree  # (а в дереве хэшей - одну группу)
+        else:
+            self._index_append(section)
+        self._s[section.id] = section
+        fp_tree.touch(section.id)
 
 
     def get_string(self, id: str, k: str, defval: str | None = None) -> str:
@@ -1203,3 +3372,117 @@ class Ini:
         В остальном, см. :func:`Section.get_items`.
         """
         return self.section(id).get_items(k, mandatory, parsing_mode)
+
+
+    def column(
+            self,
+            field: str,
+            type: Literal["float", "int", "uint", "bool"],
+            ids: Iterable[str] | None = None,
+            default: float = 0
+    ) -> tuple[array, bytearray]:
+        """Значения одного поля многих секций одним массивом.
+
+        Преобразование - как у соответствующего ``get_*``
+        (см. :func:`Section.get_float`, ...), но без исключений:
+        отсутствующее, пустое (``None``) или непреобразуемое значение
+        заменяется на ``default`` и отмечается в маске.
+
+        Оба массива поддерживают буферный протокол, поэтому, например,
+        ``numpy.frombuffer(values)`` и ``numpy.frombuffer(valid, dtype=bool)``
+        создают массивы NumPy без копирования.
+
+        :param field: Имя поля.
+        :param type: Тип значений: ``float`` (``array('d')``),
+            ``int`` и ``uint`` (``array('q')``), ``bool`` (``array('b')``).
+        :param ids: ID секций. По умолчанию - все секции в порядке объявления.
+        :param default: Значение для секций без корректного значения поля.
+            Для ``int``, ``uint`` и ``bool`` - целое число (в т.ч. ``-1.0``),
+            помещающееся в элемент массива.
+        :raises Ini.Error: если секции с одним из ID не существует.
+        :raises ValueError: при неизвестном типе или неподходящем ``default``.
+        :return: Массив значений и маска корректности (1 - значение прочитано,
+            0 - подставлено ``default``), по одному элементу на секцию.
+        """
+        if type not in _COLUMN_TYPES:
+            raise ValueError(f"Unknown column type: {type}")
+        typecode, caster = _COLUMN_TYPES[type]
+        if typecode != "d":
+            if isinstance(default, float) and default.is_integer():
+                default = int(default)
+            try:
+                array(typecode, [default])
+            except (TypeError, OverflowError):
+                raise ValueError(
+                    f"Invalid default for {type} column: {default!r}"
+                ) from None
+        if ids is None:
+            sections = self._s.values()
+        else:
+            sections = [self.section(_id) for _id in ids]
+        raw = [section._get(field) for section in sections]
+        converted = [(caster(v) if (v is not None) else None) for v in raw]
+        valid = bytearray(v is not None for v in converted)
+        if typecode == "q":
+            # Выходящие за пределы int64 значения считаются некорректными
+            for i, v in enumerate(converted):
+                if (v is not None) and not (-(1 << 63) <= v < (1 << 63)):
+                    converted[i] = None
+                    valid[i] = 0
+        values = array(typecode, [
+            (v if (v is not None) else default) for v in converted
+        ])
+        return values, valid
+
+    def column_elems(
+            self,
+            field: str,
+            type: Literal["float", "int"],
+            ids: Iterable[str] | None = None
+    ) -> list[list[float] | list[int] | None]:
+        """Значения-списки одного поля многих секций
+        (как :func:`Section.get_floats` или :func:`Section.get_ints` каждой секции,
+        но все числа разбираются одним проходом и без кэширования в секциях).
+
+        :param field: Имя поля.
+        :param type: Тип элементов: ``float`` или ``int``.
+        :param ids: ID секций. По умолчанию - все секции в порядке объявления.
+        :raises Ini.Error: если секции с одним из ID не существует.
+        :raises ValueError: при неизвестном типе.
+        :return: По одному элементу на секцию: список значений или None,
+            если поля нет, оно без значения или содержит некорректный элемент
+            (сообщение об ошибке выдаст соответствующий ``get_*`` секции).
+        """
+        if type not in ("float", "int"):
+            raise ValueError(f"Unknown column type: {type}")
+        caster = _COLUMN_TYPES[type][1]
+        bulk = _BULK_CASTERS[caster]
+        if ids is None:
+            sections = list(self._s.values())
+        else:
+            sections = [self.section(_id) for _id in ids]
+        raw = [section._get(field) for section in sections]
+        r: list[list | None] = [None] * len(raw)
+        filled = []
+        for i, v in enumerate(raw):
+            if v is not None:
+                if len(v.strip()) > 0:
+                    filled.append(i)
+                else:
+                    r[i] = []
+        try:
+            flat = list(map(bulk, ",".join([raw[i] for i in filled]).split(",")))
+        except ValueError:
+            # Есть некорректный элемент: разбор по секциям
+            #  (поэлементно, как в Section.get_elems, но без кэширования)
+            for i in filled:
+                elems = [caster(e.strip()) for e in raw[i].split(",")]
+                if None not in elems:
+                    r[i] = elems
+            return r
+        pos = 0
+        for i in filled:
+            n = raw[i].count(",") + 1
+            r[i] = flat[pos:pos + n]
+            pos += n
+        return r
@@ -145,11 +145,11 @@ def _inspector_pipeline() -> None:
         ini_system = system_ini()
 
     with InspectorStep("Поиск незарегистрированных CLSID") as step:
-        unregistered: dict[str, list[str]] = {}
-        for section in ini_system.sections():
-            _class = section.get_string("class", "")
-            if (len(_class) > 0) and (_class not in CLSIDS):
-                unregistered.setdefault(_class, []).append(section.id)
+        unregistered: dict[str, list[str]] = {
+            _class: [section.id for section in sections]
+            for _class, sections in ini_system.build_index("class").items()
+            if (_class is not None) and (len(_class) > 0) and (_class not in CLSIDS)
+        }
         for clsid, sections in unregistered.items():
             step.error("{}:{} {}{}".format(
                 clsid,
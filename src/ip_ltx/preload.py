@@ -0,0 +1,170 @@
+"""
+preload
+=======
+
+Параллельная инициализация общих данных (``system_ini``, ``spawn_ini``,
+``StringTable``, ``get_spawn``, ...).
+
+Для каждого известного загрузчика указано, от каких других он зависит
+(см. :data:`LOADERS`); :func:`preload` запускает загрузчики в пуле потоков,
+как только готовы все их зависимости. Например, ``Levels`` и ``CLSIDs``
+зависят только от meta-файла, а XML-таблицы - только от system.ltx,
+поэтому они загружаются одновременно с чтением all.spawn.
+
+Время каждого загрузчика выводится при установке переменной окружения
+``LTX_PRELOAD_REPORT`` (``on``/``true``/``1``).
+"""
+
+import importlib
+import importlib.util
+import os
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any
+
+from .ip_ltx import Section
+
+
+@dataclass(slots=True, frozen=True)
+class Loader:
+    """Загрузчик общих данных."""
+    target: str
+    """Функция или singleton-класс: ``модуль:имя``
+    (относительное имя модуля - относительно пакета)."""
+    deps: tuple[str, ...] = ()
+    """Имена загрузчиков, которые нужно выполнить до этого."""
+
+
+LOADERS: dict[str, Loader] = {
+    "meta_ini": Loader(".ini:meta_ini"),
+    "system_ini": Loader(".ini:system_ini", ("meta_ini",)),
+    "game_ini": Loader(".ini:game_ini", ("meta_ini",)),
+    "spawn_ini": Loader(".ini:spawn_ini", ("meta_ini",)),
+    "treasure_manager_ini": Loader(
+        ".treasure_manager:treasure_manager_ini", ("meta_ini",)
+    ),
+    "Levels": Loader(".utils_meta:Levels", ("meta_ini",)),
+    "ServerClasses": Loader(".utils_meta:ServerClasses", ("meta_ini",)),
+    "ObjectTypeDetector": Loader(".utils_meta:ObjectTypeDetector", ("ServerClasses",)),
+    "CLSIDs": Loader(".utils_meta:CLSIDs", ("ServerClasses", "ObjectTypeDetector")),
+    "StringTable": Loader(".xml_data.string_table:StringTable", ("system_ini",)),
+    "Dialogs": Loader(".xml_data.dialogs:Dialogs", ("system_ini",)),
+    "TextureDesc": Loader(".xml_data.texture_desc:TextureDesc", ("system_ini",)),
+    "get_spawn": Loader(
+        ".spawn:get_spawn", ("spawn_ini", "system_ini", "CLSIDs", "Levels")
+    ),
+}
+"""Известные загрузчики: имя -> загрузчик."""
+
+
+class PreloadError(Exception):
+    """Ошибка одного из загрузчиков (исходное исключение - в ``__cause__``).
+
+    :param loader: Имя загрузчика.
+    """
+    def __init__(self, loader: str):
+        super().__init__(f"preload failed: {loader}")
+        self.loader = loader
+
+
+def _resolve(target: str) -> Callable[[], Any]:
+    module, name = target.split(":")
+    return getattr(importlib.import_module(module, __package__), name)
+
+def _name(func: Callable[[], Any]) -> str | None:
+    """Имя известного загрузчика для данной функции (класса)."""
+    module = getattr(func, "__module__", "")
+    for name, loader in LOADERS.items():
+        target_module, target_name = loader.target.split(":")
+        if (
+            (importlib.util.resolve_name(target_module, __package__) == module)
+            and (target_name == func.__qualname__)
+        ):
+            return name
+    return None
+
+def _closure(names: Iterable[str]) -> list[str]:
+    """Загрузчики вместе со всеми зависимостями (зависимости - раньше)."""
+    r: list[str] = []
+    def visit(name: str) -> None:
+        if name not in r:
+            for dep in LOADERS[name].deps:
+                visit(dep)
+            r.append(name)
+    for name in names:
+        visit(name)
+    return r
+
+
+def preload(
+        loaders: Iterable[str | Callable[[], Any]],
+        max_workers: int | None = None
+) -> dict[str, float]:
+    """Выполнение загрузчиков с учётом зависимостей между ними.
+
+    Независимые загрузчики выполняются одновременно в пуле потоков.
+    Функции, отсутствующие в :data:`LOADERS`, выполняются последними,
+    по очереди, в указанном порядке.
+
+    :param loaders: Имена загрузчиков из :data:`LOADERS`
+        или сами функции (singleton-классы).
+    :param max_workers: Максимальное число потоков.
+        ``1`` - последовательное выполнение в текущем потоке.
+    :raises KeyError: при неизвестном имени загрузчика.
+    :raises PreloadError: если один из загрузчиков завершился с ошибкой;
+        остальные загрузчики, ещё не начавшие работу, не запускаются.
+    :return: Время выполнения каждого загрузчика (в секундах)
+        в порядке завершения.
+    """
+    known: list[str] = []
+    extra: list[Callable[[], Any]] = []
+    for loader in loaders:
+        if isinstance(loader, str):
+            if loader not in LOADERS:
+                raise KeyError(f"Unknown loader: {loader}")
+            known.append(loader)
+        elif (name := _name(loader)) is not None:
+            known.append(name)
+        else:
+            extra.append(loader)
+    order = _closure(known)
+    timings: dict[str, float] = {}
+
+    def run(name: str, func: Callable[[], Any]) -> None:
+        t = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            raise PreloadError(name) from e
+        timings[name] = time.perf_counter() - t
+
+    if (max_workers == 1) or (len(order) <= 1):
+        for name in order:
+            run(name, _resolve(LOADERS[name].target))
+    else:
+        # Модули импортируются заранее, в текущем потоке
+        funcs = {name: _resolve(LOADERS[name].target) for name in order}
+        done: set[str] = set()
+        running: dict[Future, str] = {}
+        waiting = list(order)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while waiting or running:
+                for name in [n for n in waiting if done.issuperset(LOADERS[n].deps)]:
+                    waiting.remove(name)
+                    running[executor.submit(run, name, funcs[name])] = name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    done.add(running.pop(future))
+                    if future.exception() is not None:
+                        # Уже запущенные дорабатывают при выходе из with
+                        waiting.clear()
+                        raise future.exception()
+    for func in extra:
+        run(func.__name__, func)
+
+    if Section.cast_bool(os.environ.get("LTX_PRELOAD_REPORT", "off")) is True:
+        for name, t in timings.items():
+            print(f"[preload] {name}: {t:.3f} s")
+    return timings
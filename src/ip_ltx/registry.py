@@ -0,0 +1,181 @@
+"""
+registry
+========
+
+Реестр общих данных, хранящихся на уровне модулей
+(``ini._INI_SYSTEM``, ``spawn._SPAWN``, экземпляры singleton-классов и т.д.).
+
+Каждая запись объявляет, от каких других записей зависит (``inputs``)
+и как получить файлы, из которых считаны данные (``files``).
+Это позволяет сбросить данные без перезапуска процесса: :func:`invalidate`
+сбрасывает запись вместе со всеми зависящими от неё, а :func:`refresh` -
+только те, файлы которых изменились. Сброшенные данные строятся заново
+при следующем обращении к ним (через тот же getter).
+
+Записи регистрируются модулями при импорте (см. :func:`register`),
+singleton-классы - автоматически (см. :class:`utils.SingletonMeta`),
+поэтому в реестре есть только данные уже импортированных модулей.
+
+Сброс не предназначен для вызова одновременно с загрузкой данных
+в других потоках (см. :mod:`preload`).
+"""
+
+import heapq
+import threading
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+type Deps = dict[str, tuple[int, int] | None]
+"""Файлы и их сигнатуры, как в :attr:`Ini._deps`."""
+
+
+@dataclass(slots=True, frozen=True)
+class Entry:
+    """Запись реестра."""
+    name: str
+    get: Callable[[], Any]
+    """Текущее значение или None, если данные не загружены."""
+    reset: Callable[[], None]
+    """Сброс значения (данные будут построены заново при обращении)."""
+    inputs: tuple[str, ...] = ()
+    """Записи, из которых строятся данные."""
+    files: Callable[[Any], Deps | None] | None = None
+    """Файлы, из которых считаны данные (по текущему значению)."""
+    update: Callable[[Any], bool] | None = None
+    """Обновление значения на месте при изменении файлов
+    (например, :func:`Ini.refresh`). Возвращает, изменились ли данные.
+    Если не задано, то значение сбрасывается."""
+
+
+_ENTRIES: dict[str, Entry] = {}
+_LOCK = threading.Lock()
+
+
+def register(
+        name: str,
+        get: Callable[[], Any],
+        reset: Callable[[], None],
+        inputs: tuple[str, ...] = (),
+        files: Callable[[Any], Deps | None] | None = None,
+        update: Callable[[Any], bool] | None = None
+) -> None:
+    """Регистрация данных (см. :class:`Entry`).
+
+    :param name: Имя записи. Повторная регистрация заменяет запись
+        (например, при повторном импорте модуля).
+    """
+    with _LOCK:
+        _ENTRIES[name] = Entry(name, get, reset, tuple(inputs), files, update)
+
+
+def entries() -> dict[str, Entry]:
+    """Зарегистрированные записи: имя -> запись."""
+    with _LOCK:
+        return dict(_ENTRIES)
+
+
+def loaded() -> list[str]:
+    """Имена записей, данные которых загружены."""
+    return [name for name, e in entries().items() if e.get() is not None]
+
+
+def dependents(names: list[str] | tuple[str, ...]) -> list[str]:
+    """Записи, прямо или косвенно зависящие от указанных (без самих указанных).
+
+    Порядок - топологический: каждая запись идёт после тех из её
+    :attr:`Entry.inputs`, что тоже есть в результате; в остальном -
+    в порядке регистрации. Записи на циклах зависимостей - в конце.
+    """
+    items = entries()
+    order = {name: i for i, name in enumerate(items)}
+    users: dict[str, list[str]] = {}
+    for other, e in items.items():
+        for name in set(e.inputs):
+            users.setdefault(name, []).append(other)
+
+    # Все зависящие записи (обход в ширину)
+    start = set(names)
+    found: set[str] = set()
+    todo = deque(names)
+    while len(todo) > 0:
+        for other in users.get(todo.popleft(), ()):
+            if (other not in found) and (other not in start):
+                found.add(other)
+                todo.append(other)
+
+    # Топологическая сортировка (алгоритм Кана)
+    n_inputs = {
+        name: sum(1 for k in set(items[name].inputs) if k in found) for name in found
+    }
+    ready = [order[name] for name, n in n_inputs.items() if n == 0]
+    heapq.heapify(ready)
+    names_by_order = list(items)
+    r: list[str] = []
+    while len(ready) > 0:
+        name = names_by_order[heapq.heappop(ready)]
+        r.append(name)
+        for other in users.get(name, ()):
+            if other in found:
+                n_inputs[other] -= 1
+                if n_inputs[other] == 0:
+                    heapq.heappush(ready, order[other])
+    if len(r) < len(found):
+        done = set(r)
+        r += sorted((name for name in found if name not in done), key=order.__getitem__)
+    return r
+
+
+def invalidate(*names: str) -> list[str]:
+    """Сброс данных вместе со всеми зависящими от них.
+
+    :param names: Имена записей. Неизвестные имена игнорируются
+        (например, модуль с такими данными ещё не импортирован).
+    :return: Имена записей, данные которых были загружены и сброшены.
+    """
+    items = entries()
+    r = []
+    for name in [*names, *dependents(names)]:
+        e = items.get(name, None)
+        if (e is not None) and (e.get() is not None):
+            e.reset()
+            r.append(name)
+    return r
+
+
+def _stale(deps: Deps) -> bool:
+    from .utils import file_signature
+    return any((file_signature(fp) != sig) for fp, sig in deps.items())
+
+
+def refresh() -> list[str]:
+    """Учесть изменения файлов, из которых считаны загруженные данные.
+
+    Данные с методом обновления (:attr:`Entry.update`) обновляются на месте,
+    остальные - сбрасываются. Всё, что зависит от изменившихся данных,
+    сбрасывается.
+
+    :return: Имена обновлённых или сброшенных записей.
+    """
+    r: list[str] = []
+    for name, e in entries().items():
+        if (name in r) or (e.files is None) or ((value := e.get()) is None):
+            continue
+        deps = e.files(value)
+        if (deps is None) or not _stale(deps):
+            continue
+        if e.update is not None:
+            try:
+                changed = e.update(value)
+            except Exception:
+                # Ошибка чтения: данные будут считаны заново при обращении
+                r += [n for n in invalidate(name) if n not in r]
+                continue
+            if changed:
+                r.append(name)
+                r += [n for n in invalidate(*dependents([name])) if n not in r]
+        else:
+            r += [n for n in invalidate(name) if n not in r]
+    return r
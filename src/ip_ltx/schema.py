@@ -0,0 +1,240 @@
+"""
+schema
+======
+
+Декларативное описание набора полей секции (:class:`Schema`)
+и извлечение их значений одной специализированной функцией.
+
+Схема компилируется один раз: по списку полей генерируется функция,
+которая читает каждое поле без вызова ``get_*`` и без обработки исключений
+(значения, в т.ч. элементы списков, преобразуются теми же функциями
+``Section.cast_*``, возвращающими None при ошибке).
+Результат - запись с ``__slots__`` и список сообщений об ошибках;
+сообщения совпадают с сообщениями исключений соответствующих ``get_*``.
+
+Пример::
+
+    SCHEMA = Schema("SpawnFields", [
+        FieldSpec("section_name", "str", default="",
+                  validator=lambda v: None if v else "'section_name' is not specified"),
+        FieldSpec("position", "floats", default=(0, 0, 0), required=True),
+        FieldSpec("story_id", "int", default=-1),
+    ])
+    record, errors = SCHEMA.extract(section)
+"""
+
+import itertools
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, make_dataclass
+from typing import Any, Literal
+
+from .ip_ltx import Ini, Section
+
+
+type FieldType = Literal[
+    "str", "str_wb", "float", "int", "uint", "bool",
+    "strings", "floats", "ints", "uints", "bools",
+]
+
+_TYPES: dict[str, tuple[Callable[[str], Any] | None, str, bool]] = {
+    "str": (None, "str", False),
+    "str_wb": (Section.cast_string_wb, "string_wb", False),
+    "float": (Section.cast_float, "float", False),
+    "int": (Section.cast_int, "int", False),
+    "uint": (Section.cast_uint, "uint", False),
+    "bool": (Section.cast_bool, "bool", False),
+    "strings": (str, "str", True),
+    "floats": (Section.cast_float, "float", True),
+    "ints": (Section.cast_int, "int", True),
+    "uints": (Section.cast_uint, "uint", True),
+    "bools": (Section.cast_bool, "bool", True),
+}
+"""Тип поля -> (преобразование, метка типа как у ``get_*``, список ли это)."""
+
+_COLUMN_LISTS = {"floats": "float", "ints": "int"}
+"""Списочные типы, которые :func:`Schema.extract_all` разбирает
+для всех секций сразу (см. :func:`Ini.column_elems`)."""
+
+
+@dataclass(slots=True, frozen=True)
+class FieldSpec:
+    """Описание одного поля схемы."""
+    name: str
+    """Имя поля в секции."""
+    type: FieldType
+    """Тип значения: как у соответствующего ``get_*``
+    (``str`` - :func:`Section.get_string`, ``floats`` - :func:`Section.get_floats`, ...)."""
+    default: Any = None
+    """Значение, если поля нет или оно без значения (при ``required == False``),
+    а также при любой ошибке. Общее для всех записей, поэтому должно быть
+    неизменяемым (например, кортеж вместо списка)."""
+    required: bool = False
+    """Отсутствие поля (или значения) - ошибка."""
+    validator: Callable[[Any], str | None] | None = None
+    """Проверка прочитанного значения (в т.ч. ``default`` для отсутствующего
+    необязательного поля). Возвращает сообщение об ошибке или None."""
+    attr: str | None = None
+    """Имя атрибута записи. По умолчанию совпадает с именем поля."""
+
+
+def _missing(section: Section, k: str, label: str) -> str:
+    why = "None value" if section._has(k) else "non-existent"
+    return str(Section.Error(
+        section._src, section.id, f"field '{k}' can't be read as *{label}*: {why}"
+    ))
+
+def _invalid(section: Section, k: str, label: str) -> str:
+    return str(Section.Error(
+        section._src, section.id, f"field '{k}' can't be read as *{label}*"
+    ))
+
+def _invalid_elem(section: Section, k: str, label: str, v: list) -> str:
+    return str(Section.Error(
+        section._src, section.id,
+        f"field '{k}' can't be read as *{label}*: value #{v.index(None) + 1} is invalid"
+    ))
+
+
+class Schema:
+    """Набор полей секции, скомпилированный в функцию извлечения.
+
+    :param name: Имя класса записей (атрибуты - поля схемы в том же порядке).
+    :param fields: Описания полей.
+    :raises ValueError: при повторяющемся или невалидном имени атрибута
+        либо неизвестном типе поля.
+    """
+    __slots__ = ("name", "fields", "record", "source", "_fn", "_lists")
+
+    name: str
+    fields: tuple[FieldSpec, ...]
+    record: type
+    """Класс записей (dataclass с ``__slots__``)."""
+    source: str
+    """Исходный код сгенерированной функции (для отладки)."""
+    _fn: Callable[[Section, tuple | None], tuple[Any, list[str]]]
+    _lists: tuple[FieldSpec, ...]
+    """Поля, разбираемые для всех секций сразу (см. :func:`extract_all`)."""
+
+    def __init__(self, name: str, fields: Iterable[FieldSpec]):
+        self.name = name
+        self.fields = tuple(fields)
+        attrs = [(f.attr or f.name) for f in self.fields]
+        for f, attr in zip(self.fields, attrs):
+            if f.type not in _TYPES:
+                raise ValueError(f"Unknown field type: {f.type}")
+            if not attr.isidentifier():
+                raise ValueError(f"Invalid attribute name: {attr}")
+        if len(set(attrs)) != len(attrs):
+            raise ValueError("Attribute names must be unique")
+        self.record = make_dataclass(
+            name, [(attr, Any) for attr in attrs], slots=True
+        )
+        self._lists = tuple(f for f in self.fields if f.type in _COLUMN_LISTS)
+        self._compile()
+
+    def _compile(self) -> None:
+        ns: dict[str, Any] = {
+            "Record": self.record, "_missing": _missing, "_invalid": _invalid,
+            "_invalid_elem": _invalid_elem,
+        }
+        lines = [
+            "def extract(section, parsed=None):",
+            "    errors = []",
+            "    get = section._get",
+        ]
+        n_lists = 0
+        for i, f in enumerate(self.fields):
+            caster, base_label, is_list = _TYPES[f.type]
+            ns[f"c{i}"], ns[f"d{i}"], ns[f"val{i}"] = caster, f.default, f.validator
+            label = f"list[{base_label}]" if is_list else base_label
+            missing = (
+                f"errors.append(_missing(section, {f.name!r}, {label!r})); ok = False"
+                if f.required else "ok = True"
+            )
+            lines += [f"    # {f.name}: {f.type}"]
+            if f.type in _COLUMN_LISTS:
+                lines += [
+                    f"    v{i} = parsed[{n_lists}] if parsed else None",
+                    f"    if v{i} is not None:",
+                    "        ok = True",
+                    f"    elif (raw := get({f.name!r})) is None:",
+                    f"        v{i} = d{i}; {missing}",
+                ]
+                n_lists += 1
+            else:
+                lines += [
+                    f"    raw = get({f.name!r})",
+                    "    if raw is None:",
+                    f"        v{i} = d{i}; {missing}",
+                ]
+            if is_list:
+                # Как Section.get_elems (но без кэширования в секции)
+                lines += [
+                    "    elif len(raw.strip()) == 0:",
+                    f"        v{i} = []; ok = True",
+                    "    else:",
+                    f"        v{i} = [c{i}(e.strip()) for e in raw.split(',')]",
+                    f"        ok = None not in v{i}",
+                    "        if not ok:",
+                    f"            errors.append(_invalid_elem(section, {f.name!r}, {label!r}, v{i}))",
+                    f"            v{i} = d{i}",
+                ]
+            elif caster is None:
+                lines += [
+                    "    else:",
+                    f"        v{i} = raw; ok = True",
+                ]
+            else:
+                lines += [
+                    "    else:",
+                    f"        v{i} = c{i}(raw); ok = v{i} is not None",
+                    "        if not ok:",
+                    f"            errors.append(_invalid(section, {f.name!r}, {label!r}))",
+                    f"            v{i} = d{i}",
+                ]
+            if f.validator is not None:
+                lines += [
+                    f"    if ok and ((err := val{i}(v{i})) is not None):",
+                    f"        errors.append(err); v{i} = d{i}",
+                ]
+        values = ", ".join(f"v{i}" for i in range(len(self.fields)))
+        lines += [f"    return Record({values}), errors"]
+        self.source = "\n".join(lines)
+        exec(compile(self.source, f"<schema {self.name}>", "exec"), ns)
+        self._fn = ns["extract"]
+
+    # ----------------------------------------------------------------
+
+    def extract(self, section: Section, _parsed: tuple | None = None) -> tuple[Any, list[str]]:
+        """Извлечение полей одной секции.
+
+        :param section: Секция.
+        :return: Запись (экземпляр :attr:`record`) и список сообщений об ошибках
+            (пустой, если все поля прочитаны успешно).
+        """
+        return self._fn(section, _parsed)
+
+    def extract_all(
+            self,
+            ini: Ini,
+            ids: Iterable[str] | None = None
+    ) -> Iterator[tuple[Section, Any, list[str]]]:
+        """Извлечение полей многих секций.
+
+        Списки чисел (``floats``, ``ints``) разбираются для всех секций
+        одним проходом (см. :func:`Ini.column_elems`).
+
+        :param ini: Экземпляр с секциями.
+        :param ids: ID секций. По умолчанию - все секции в порядке объявления.
+        :raises Ini.Error: если секции с одним из ID не существует.
+        :return: Тройки (секция, запись, ошибки) в порядке секций.
+        """
+        ids = list(ini.ids()) if (ids is None) else list(ids)
+        sections = [ini.section(_id) for _id in ids]
+        columns = [
+            ini.column_elems(f.name, _COLUMN_LISTS[f.type], ids) for f in self._lists
+        ]
+        rows = zip(*columns) if (len(columns) > 0) else itertools.repeat(None)
+        fn = self._fn
+        for section, parsed in zip(sections, rows):
+            yield section, *fn(section, parsed)
@@ -0,0 +1,362 @@
+"""
+server
+======
+
+Локальный сервер, хранящий загруженные данные (meta-файл, system.ltx,
+all.spawn, XML-таблицы и т.д.) между запусками скриптов.
+
+Обычно каждый скрипт из ``usage/`` - отдельный процесс, который заново
+считывает все данные. Скрипт, запущенный через сервер, выполняется
+в процессе сервера, поэтому данные, загруженные при предыдущих запусках,
+повторно не считываются::
+
+    python -m ip_ltx.server serve                      # в отдельной консоли
+    python -m ip_ltx.server run analyzer_spawn.py      # вместо python analyzer_spawn.py
+    python -m ip_ltx.server stop
+
+Скрипт должен определять функцию ``main()`` и (опционально) переменные
+``META_FILEPATH`` и ``HIDE_GAMEDATA_LTX_WARNINGS``, как скрипты из ``usage/``.
+Вывод скрипта передаётся клиенту. Если сервер не запущен, скрипт выполняется
+в текущем процессе.
+
+Перед каждым запуском проверяются файлы, из которых были считаны данные:
+
+* Экземпляры :class:`Ini` (meta-файл, system.ltx, all.spawn, game.ltx)
+  перечитываются через :func:`Ini.refresh`, т.е. разбираются
+  только изменившиеся файлы.
+* Остальные данные (:func:`spawn.get_spawn`, XML-таблицы,
+  treasure_manager.ltx и т.д.) сбрасываются, если изменились их файлы
+  или данные, из которых они построены, и строятся заново при обращении
+  (см. :mod:`registry`).
+* При смене пути до meta-файла сбрасываются все данные.
+
+Сервер принимает подключения только с локального адреса и с ключом,
+который записывается в файл состояния (см. :func:`state_file`)
+вместе с адресом. Путь до файла состояния можно задать переменной
+окружения ``LTX_SERVER_FILE``.
+
+Скрипты выполняются по одному: текущая папка, ``sys.argv``
+и переменные окружения на время запуска заменяются значениями клиента.
+"""
+
+import getpass
+import io
+import json
+import os
+import runpy
+import secrets
+import sys
+import tempfile
+import time
+import traceback
+from collections.abc import Callable
+from contextlib import redirect_stderr, redirect_stdout
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any
+
+from . import registry
+from .utils import _GAMEDATA_FS, print_error, print_warning
+
+
+_ENV_KEYS = ("META_FILEPATH", "HIDE_GAMEDATA_LTX_WARNINGS")
+"""Переменные окружения клиента, передаваемые серверу
+(а также все переменные с префиксом ``LTX_``)."""
+
+_SCRIPT_MODULES = (
+    "ip_ltx.analyzer_",
+    "ip_ltx.generator_",
+    "ip_ltx.spawn_inspector",
+)
+"""Модули, которые после сброса данных импортируются заново
+(их код уровня модуля использует данные, например :func:`validate_data`)."""
+
+_PRELOAD = (
+    "get_spawn", "game_ini", "treasure_manager_ini",
+    "StringTable", "Dialogs", "TextureDesc",
+)
+"""Данные, загружаемые при запуске сервера (см. :mod:`preload`)."""
+
+
+def state_file() -> Path:
+    """Файл состояния сервера (адрес и ключ).
+
+    Задаётся переменной окружения ``LTX_SERVER_FILE``,
+    по умолчанию - файл во временной папке пользователя.
+    """
+    fp = os.environ.get("LTX_SERVER_FILE", "")
+    if len(fp) > 0:
+        return Path(fp)
+    return Path(tempfile.gettempdir()).joinpath(f"ip_ltx-server-{getpass.getuser()}.json")
+
+
+def _client_env() -> dict[str, str]:
+    return {
+        k: v for k, v in os.environ.items()
+        if (k in _ENV_KEYS) or k.startswith("LTX_")
+    }
+
+# ----------------------------------------------------------------
+
+_META_FILEPATH: str | None = None
+"""Путь до meta-файла, с которым были загружены данные."""
+
+def reload() -> list[str]:
+    """Учесть изменения файлов, из которых были загружены данные
+    (см. :func:`registry.refresh`). При смене пути до meta-файла
+    сбрасываются все данные.
+
+    :return: Имена перечитанных или сброшенных данных.
+    """
+    global _META_FILEPATH
+    meta_fp = os.environ.get("META_FILEPATH", "")
+    if _META_FILEPATH != meta_fp:
+        _META_FILEPATH = meta_fp
+        return registry.invalidate("meta_ini")
+    for fs in _GAMEDATA_FS.values():
+        fs.refresh()
+    return registry.refresh()
+
+
+def run_script(script: str, argv: list[str] | None = None) -> bool:
+    """Выполнение скрипта в текущем процессе (с учётом изменений файлов,
+    см. :func:`reload`).
+
+    :param script: Путь до скрипта с функцией ``main()``.
+    :param argv: Аргументы скрипта (``sys.argv[1:]``).
+    :return: Завершился ли скрипт без исключений.
+    """
+    fp = str(Path(script).resolve())
+    sys_argv, sys_path0 = sys.argv, sys.path[0]
+    sys.argv = [fp, *(argv or [])]
+    sys.path[0] = str(Path(fp).parent)
+    try:
+        ns = runpy.run_path(fp, run_name="__ip_ltx_server__")
+        meta_fp = ns.get("META_FILEPATH", None)
+        if isinstance(meta_fp, str) and (len(meta_fp) > 0):
+            os.environ["META_FILEPATH"] = str(Path(meta_fp).resolve())
+        hide = ns.get("HIDE_GAMEDATA_LTX_WARNINGS", None)
+        if isinstance(hide, bool):
+            os.environ["HIDE_GAMEDATA_LTX_WARNINGS"] = str(int(hide))
+        if len(reloaded := reload()) > 0:
+            for name in [m for m in sys.modules if m.startswith(_SCRIPT_MODULES)]:
+                del sys.modules[name]
+            print(f"[server] reloaded: {', '.join(reloaded)}", file=sys.__stdout__)
+        main = ns.get("main", None)
+        if not callable(main):
+            raise Exception(f"Script doesn't define main(): {fp}")
+        main()
+    except Exception:
+        print("-"*80)
+        traceback.print_exc(file=sys.stdout)
+        print("-"*80, flush=True)
+        return False
+    finally:
+        sys.argv = sys_argv
+        sys.path[0] = sys_path0
+    return True
+
+# ----------------------------------------------------------------
+
+class _Stream(io.TextIOBase):
+    """Поток вывода, передающий текст клиенту."""
+    def __init__(self, conn: Connection):
+        self._conn = conn
+        self._closed = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        if not self._closed:
+            try:
+                self._conn.send(("out", s))
+            except OSError:
+                # Клиент отключился: скрипт дорабатывает без вывода
+                self._closed = True
+        return len(s)
+
+
+def _handle(conn: Connection) -> bool:
+    """Обработка одного запроса.
+
+    :return: Продолжать ли работу сервера.
+    """
+    request = conn.recv()
+    match request:
+        case ("ping",):
+            conn.send(("pong", os.getpid(), _META_FILEPATH))
+        case ("stop",):
+            conn.send(("done", True))
+            return False
+        case ("run", script, cwd, argv, env):
+            cwd_server, env_server = os.getcwd(), dict(os.environ)
+            t = time.perf_counter()
+            try:
+                os.chdir(cwd)
+                for k in _client_env():
+                    del os.environ[k]
+                os.environ.update(env)
+                stream = _Stream(conn)
+                with redirect_stdout(stream), redirect_stderr(stream):
+                    ok = run_script(script, argv)
+            finally:
+                os.chdir(cwd_server)
+                os.environ.clear()
+                os.environ.update(env_server)
+            print(f"[server] {script}: {time.perf_counter() - t:.3f} s", flush=True)
+            conn.send(("done", ok))
+        case _:
+            # Сервер продолжает работу: ошибка передаётся клиенту
+            print_warning(f"[server] Unknown request: {request!r}")
+            conn.send(("error", f"Unknown request: {request!r}"))
+    return True
+
+
+def _preload(names: tuple[str, ...]) -> None:
+    """Загрузка данных при запуске сервера (см. :mod:`preload`).
+
+    Путь до meta-файла запоминается в том же виде, что и при запуске скрипта
+    (см. :func:`run_script`), иначе первый же запуск сбросит загруженные данные.
+    """
+    global _META_FILEPATH
+    from .preload import PreloadError, preload
+    meta_fp = str(Path(os.environ["META_FILEPATH"]).resolve())
+    os.environ["META_FILEPATH"] = _META_FILEPATH = meta_fp
+    t = time.perf_counter()
+    try:
+        preload(names)
+    except PreloadError as e:
+        print_error(f"[server] Preload failed ({e.loader}): {e.__cause__}")
+        registry.invalidate("meta_ini")
+    else:
+        print(f"[server] preloaded: {time.perf_counter() - t:.3f} s", flush=True)
+
+
+def serve() -> None:
+    """Запуск сервера (до :func:`stop` или Ctrl+C).
+
+    Если задана переменная окружения ``META_FILEPATH``,
+    то основные данные загружаются сразу (см. :data:`_PRELOAD`).
+    """
+    if len(os.environ.get("META_FILEPATH", "")) > 0:
+        _preload(_PRELOAD)
+
+    authkey = secrets.token_bytes(32)
+    fp_state = state_file()
+    with Listener(("127.0.0.1", 0), authkey=authkey) as listener:
+        host, port = listener.address
+        fd = os.open(fp_state, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as file:
+            json.dump(
+                {"host": host, "port": port, "key": authkey.hex(), "pid": os.getpid()},
+                file
+            )
+        print(f"[server] listening on {host}:{port} (pid {os.getpid()})", flush=True)
+        try:
+            running = True
+            while running:
+                try:
+                    conn = listener.accept()
+                except (OSError, EOFError, AuthenticationError) as e:
+                    # В т.ч. клиент с неверным ключом
+                    print_warning(f"[server] {e}")
+                    continue
+                with conn:
+                    try:
+                        running = _handle(conn)
+                    except (EOFError, OSError):
+                        pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            try:
+                fp_state.unlink()
+            except OSError:
+                pass
+
+# ----------------------------------------------------------------
+
+def connect() -> Connection | None:
+    """Подключение к запущенному серверу.
+
+    :return: Соединение или None, если сервер не запущен.
+    """
+    try:
+        with open(state_file(), "r") as file:
+            state = json.load(file)
+        return Client(
+            (state["host"], state["port"]), authkey=bytes.fromhex(state["key"])
+        )
+    except (OSError, ValueError, KeyError, EOFError, AuthenticationError):
+        return None
+
+
+def _request(
+        conn: Connection,
+        request: tuple,
+        output: Callable[[str], Any]
+) -> tuple:
+    with conn:
+        conn.send(request)
+        while (response := conn.recv())[0] == "out":
+            output(response[1])
+    return response
+
+
+def run(script: str, argv: list[str] | None = None) -> bool:
+    """Выполнение скрипта на сервере или, если сервер не запущен,
+    в текущем процессе (см. :func:`run_script`).
+
+    :param script: Путь до скрипта с функцией ``main()``.
+    :param argv: Аргументы скрипта.
+    :return: Завершился ли скрипт без исключений.
+    """
+    conn = connect()
+    if conn is None:
+        return run_script(script, argv)
+    request = ("run", str(Path(script).resolve()), os.getcwd(), argv or [], _client_env())
+    def output(s: str) -> None:
+        sys.stdout.write(s)
+        sys.stdout.flush()
+    _, ok = _request(conn, request, output)
+    return ok
+
+
+def stop() -> bool:
+    """Остановка сервера.
+
+    :return: Был ли сервер запущен.
+    """
+    conn = connect()
+    if conn is None:
+        return False
+    _request(conn, ("stop",), print)
+    return True
+
+
+def main() -> None:
+    usage = "usage: python -m ip_ltx.server (serve | run <script> [args...] | stop | status)"
+    args = sys.argv[1:]
+    match args:
+        case ["serve"]:
+            serve()
+        case ["run", script, *argv]:
+            sys.exit(0 if run(script, argv) else 1)
+        case ["stop"]:
+            print("stopped" if stop() else "not running")
+        case ["status"]:
+            conn = connect()
+            if conn is None:
+                print("not running")
+            else:
+                _, pid, meta_fp = _request(conn, ("ping",), print)
+                print(f"running (pid {pid}, meta: {meta_fp or '-'})")
+        case _:
+            print(usage)
+            sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,51 @@
 import os.path
+import threading
 from collections import OrderedDict
+from collections.abc import Callable
 
+from . import registry
 from .ip_ltx import Section, Ini
 from .ini import meta_ini, system_ini, spawn_ini
+from .schema import FieldSpec, Schema
 from .treasure_manager_ext import SpawnEntry, SpawnEntriesPool
 from .utils import print_error
 from .utils_meta import Levels, CLSIDs, ObjectType
 
 # ----------------------------------------------------------------
 
+def _not_empty(field: str) -> Callable[[str], str | None]:
+    return lambda v: None if (len(v) > 0) else f"'{field}' is not specified"
+
+def _vector(field: str) -> Callable[[list[float]], str | None]:
+    return lambda v: None if (len(v) == 3) else (
+        f"'{field}': expected to get 3 numbers, but got {len(v)}"
+    )
+
+def _hex(v: str) -> str | None:
+    try:
+        int(v, 16)
+    except ValueError as e:
+        return str(e)
+    return None
+
+_SPAWN_OBJECT_SCHEMA = Schema("SpawnObjectFields", [
+    FieldSpec("spawn_id", "uint", default=-1),
+    FieldSpec("section_name", "str", default="", validator=_not_empty("section_name")),
+    FieldSpec("name", "str", default="", validator=_not_empty("name")),
+    FieldSpec("position", "floats", default=(0, 0, 0), required=True,
+              validator=_vector("position")),
+    FieldSpec("direction", "floats", default=(0, 0, 0), required=True,
+              validator=_vector("direction")),
+    FieldSpec("game_vertex_id", "uint", default=-1, required=True),
+    FieldSpec("level_vertex_id", "uint", default=-1, required=True),
+    FieldSpec("object_flags", "str", required=True, validator=_hex),
+    FieldSpec("custom_data", "str", default=""),
+    FieldSpec("story_id", "int", default=-1),
+])
+"""Поля секции спавн-объекта, читаемые :func:`SpawnObject.init`."""
+
+# ----------------------------------------------------------------
+
 class SpawnObject:
     """Спавн-объект"""
 
@@ -64,77 +101,36 @@ class SpawnObject:
         self._loot: SpawnEntriesPool = SpawnEntriesPool()
         """Лут [spawn] и/или [spawn_tm] из custom_data"""
 
-    def init(self, section: Section):
+    def init(
+            self,
+            section: Section,
+            extracted: tuple[object, list[str]] | None = None
+    ):
         """Инициализация по секции
 
         :param section: Секция, по которой производится инициализация
+        :param extracted: Уже извлечённые поля секции
+            (см. ``_SPAWN_OBJECT_SCHEMA.extract_all``)
         :raises Exception: при ошибке инициализации какого-либо поля
         """
+        if extracted is None:
+            extracted = _SPAWN_OBJECT_SCHEMA.extract(section)
+        fields, errors = extracted
 
         self._errors.clear()
+        self._errors.extend(errors)
         self._src = section._src
         self._id = section.id
-        self.spawn_id = section.get_uint("spawn_id", -1)
-
-        self.section_name = section.get_string("section_name", "")
-        if len(self.section_name) == 0:
-            self._errors.append("'section_name' is not specified")
-
-        self.name = section.get_string("name", "")
-        if len(self.name) == 0:
-            self._errors.append("'name' is not specified")
-
-        self.position = (0, 0, 0)
-        try:
-            tmp = section.get_floats("position")
-        except Exception as e:
-            self._errors.append(str(e))
-        else:
-            if len(tmp) == 3:
-                self.position = (float(tmp[0]), float(tmp[1]), float(tmp[2]))
-            else:
-                self._errors.append((
-                    f"'position': expected to get 3 numbers,"
-                    f" but got {len(tmp)}"
-                ))
-
-        self.direction = (0, 0, 0)
-        try:
-            tmp = section.get_floats("direction")
-        except Exception as e:
-            self._errors.append(str(e))
-        else:
-            if len(tmp) == 3:
-                self.direction = (float(tmp[0]), float(tmp[1]), float(tmp[2]))
-            else:
-                self._errors.append((
-                    f"'direction': expected to get 3 numbers,"
-                    f" but got {len(tmp)}"
-                ))
-
-        self.game_vertex_id = -1
-        try:
-            tmp = section.get_uint("game_vertex_id")
-        except Exception as e:
-            self._errors.append(str(e))
-        else:
-            self.game_vertex_id = tmp
-
-        self.level_vertex_id = -1
-        try:
-            tmp = section.get_uint("level_vertex_id")
-        except Exception as e:
-            self._errors.append(str(e))
-        else:
-            self.level_vertex_id = tmp
-        
-        self.object_flags = -1
-        try:
-            tmp = int(section.get_string("object_flags"), 16)
-        except Exception as e:
-            self._errors.append(str(e))
-        else:
-            self.object_flags = tmp
+        self.spawn_id = fields.spawn_id
+        self.section_name = fields.section_name
+        self.name = fields.name
+        self.position = tuple(fields.position)
+        self.direction = tuple(fields.direction)
+        self.game_vertex_id = fields.game_vertex_id
+        self.level_vertex_id = fields.level_vertex_id
+        self.object_flags = (
+            int(fields.object_flags, 16) if (fields.object_flags is not None) else -1
+        )
 
         self.custom_data.clear()
         self.custom_data._name = (
@@ -143,21 +139,12 @@ class SpawnObject:
             else "custom_data"
         )
         try:
-            self.custom_data.read_raw(section.get_string("custom_data", ""))
+            self.custom_data.read_raw(fields.custom_data)
         except Exception as e:
             self.custom_data.clear()
             self._errors.append(str(e))
 
-        self.story_id = -1
-        try:
-            tmp = section.get_int("story_id", -1)
-        except Exception as e:
-            self._errors.append(str(e))
-        else:
-            if type(tmp) == int:
-                self.story_id = tmp
-            else:
-                self._errors.append("'story_id' is not an integer")
+        self.story_id = fields.story_id
 
         self._class = ""
         if len(self.section_name) > 0:
@@ -274,10 +261,11 @@ class Spawn:
         self._so.clear()
         self._id_by_sid.clear()
         valid = True
-        for s in spawn_ini().sections():
+        # Поля всех объектов извлекаются одной скомпилированной функцией
+        for s, fields, errors in _SPAWN_OBJECT_SCHEMA.extract_all(spawn_ini()):
             try:
                 so = SpawnObject()
-                so.init(s)
+                so.init(s, (fields, errors))
             except Exception as e:
                 valid = False
                 if not silent:
@@ -326,12 +314,29 @@ class Spawn:
 # ----------------------------------------------------------------
 
 _SPAWN = None
+_LOCK_SPAWN = threading.Lock()
 
 def get_spawn() -> Spawn:
     """Получить единый экземпляр класса Spawn
     """
     global _SPAWN
     if _SPAWN is None:
-        _SPAWN = Spawn()
-        _SPAWN.init(silent=False)
+        with _LOCK_SPAWN:
+            if _SPAWN is None:
+                spawn = Spawn()
+                try:
+                    spawn.init(silent=False)
+                finally:
+                    # Как и раньше, экземпляр сохраняется и при ошибке
+                    # (без проблемных объектов, см. Spawn.init)
+                    _SPAWN = spawn
     return _SPAWN
+
+def _reset_spawn() -> None:
+    global _SPAWN
+    _SPAWN = None
+
+registry.register(
+    "get_spawn", lambda: _SPAWN, _reset_spawn,
+    ("spawn_ini", "system_ini", "CLSIDs", "Levels")
+)
@@ -2,7 +2,6 @@
 
 import re
 import os.path
-import pygtrie
 from collections import OrderedDict
 
 from .db import OBJECT_FLAGS
@@ -284,6 +283,7 @@ def _check_space_restrictors() -> None:
     засорением лога, а также игнорированием мутантами аномальных зон.
     Для деталей см. ``report_39``.
     """
+    import pygtrie
     ini_spawn = spawn_ini()
     trie = pygtrie.CharTrie()  # префиксное дерево
     zones = OrderedDict()
@@ -370,6 +370,7 @@ def _invariant_names_as_prefixes() -> None:
     iPv30 = meta_ini().get_bool("features", "iPv30", False)
     if not iPv30:
         return
+    import pygtrie
     trie_n = pygtrie.CharTrie()  # префиксное дерево имён всех объектов all.spawn
     trie_sn = pygtrie.CharTrie()  # префиксное дерево имён всех секций system.ltx
     names = []
@@ -1,6 +1,7 @@
 from collections import OrderedDict
 from pathlib import Path
 
+from . import registry
 from .ip_ltx import Ini, Section
 from .ini import meta_ini
 from .utils import print_warning
@@ -8,10 +9,13 @@ from .utils import print_warning
 # ----------------------------------------------------------------
 
 _TASK_MANAGER = None
+_DEPS = None
 
 def _read_task_manager():
+    global _DEPS
     ini = Ini(name="task_manager.ltx", ini_meta=meta_ini())
     ini.read("config\\misc\\task_manager.ltx", inside_gamedata=True)
+    _DEPS = dict(ini._deps)
 
     # reading [list]
     tm_list = ini._s.get("list", None)
@@ -56,6 +60,16 @@ def get_task_manager():
         _TASK_MANAGER = _read_task_manager()
     return _TASK_MANAGER
 
+def _reset():
+    global _TASK_MANAGER
+    global _DEPS
+    _TASK_MANAGER = _DEPS = None
+
+registry.register(
+    "get_task_manager", lambda: _TASK_MANAGER, _reset, ("meta_ini",),
+    files=lambda _: _DEPS
+)
+
 
 class TaskIterator:
     """
@@ -1,14 +1,17 @@
 import re
 import os.path
 
+from . import registry
 from .ip_ltx import Ini
 from .ini import meta_ini
 
 
 _BUY_K = None
 _BUY_K_REGEX = None
+_DEPS = None
 
 def _init_buy_k():
+    global _DEPS
     module_name = os.path.basename(__file__)
 
     # reading meta
@@ -33,6 +36,7 @@ def _init_buy_k():
     # reading file
     ini_trade = Ini(name=os.path.basename(file_path), ini_meta=ini_meta)
     ini_trade.read(file_path, inside_gamedata=True)
+    _DEPS = dict(ini_trade._deps)
     if not ini_trade.section_exist(buy_section):
         print((
             "! [{}] Unable to initialize data for 'get_buy_k' function: "
@@ -99,3 +103,14 @@ def get_buy_k(section_name):
 
     # Нет такой секции, возвращаем значение по умолчанию
     return 1.0
+
+def _reset():
+    global _BUY_K
+    global _BUY_K_REGEX
+    global _DEPS
+    _BUY_K = _BUY_K_REGEX = _DEPS = None
+
+registry.register(
+    "get_buy_k", lambda: _BUY_K, _reset, ("meta_ini",),
+    files=lambda _: _DEPS
+)
@@ -1,5 +1,7 @@
 import os.path
+import threading
 
+from . import registry
 from .ip_ltx import Ini, Section
 from .ini import meta_ini
 
@@ -7,6 +9,8 @@ from .ini import meta_ini
 
 _INI = None
 _ID_BY_SID = None
+_DEPS = None
+_LOCK = threading.Lock()
 
 def _exception(msg):
     raise Exception("[{}] {}", os.path.basename(__file__), msg)
@@ -50,15 +54,19 @@ def _initialize():
 
     global _INI
     global _ID_BY_SID
+    global _DEPS
     _INI = ini
     _ID_BY_SID = id_by_sid
+    _DEPS = dict(ini_0._deps)
 
 # ----------------------------------------------------------------
 
 def treasure_manager_ini() -> Ini:
     global _INI
     if _INI is None:
-        _initialize()
+        with _LOCK:
+            if _INI is None:
+                _initialize()
     if _INI is None:
         raise Exception("_INI was not initialized properly")
     return _INI
@@ -67,7 +75,9 @@ def treasure_by_sid(sid: int) -> Section | None:
     global _INI
     global _ID_BY_SID
     if (_INI is None) or (_ID_BY_SID is None):
-        _initialize()
+        with _LOCK:
+            if (_INI is None) or (_ID_BY_SID is None):
+                _initialize()
     if _INI is None:
         raise Exception("_INI was not initialized properly")
     if _ID_BY_SID is None:
@@ -75,3 +85,14 @@ def treasure_by_sid(sid: int) -> Section | None:
     if sid not in _ID_BY_SID:
         return None
     return _INI.section(_ID_BY_SID[sid])
+
+def _reset():
+    global _INI
+    global _ID_BY_SID
+    global _DEPS
+    _INI = _ID_BY_SID = _DEPS = None
+
+registry.register(
+    "treasure_manager_ini", lambda: _INI, _reset, ("meta_ini",),
+    files=lambda _: _DEPS
+)
@@ -1,6 +1,12 @@
+import functools
+import io
+import locale
+import mmap
 import os
 import re
+import stat
 import sys
+import threading
 import traceback
 from collections.abc import Callable
 from pathlib import Path
@@ -8,7 +14,26 @@ from typing import Any, Protocol
 
 # ----------------------------------------------------------------
 
-os.system("")  # enables colors for Windows consoles
+def _enable_console_colors() -> None:
+    """Включение ANSI-цветов в консоли Windows.
+
+    Вместо ``os.system("")`` (запуск cmd.exe) режим консоли
+    устанавливается напрямую; в остальных ОС ничего не требуется.
+    """
+    if sys.platform != "win32":
+        return
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)
+    except (ImportError, AttributeError, OSError):
+        os.system("")
+
+_enable_console_colors()
 
 class ANSI_COLOR_CODE:
     DEF = '\033[0m'
@@ -47,10 +72,67 @@ def print_error(msg, prefix: bool = True, color: bool = True):
 
 # ----------------------------------------------------------------
 
+_MMAP_MIN_SIZE = 1 << 20
+"""Файлы от этого размера (в байтах) отображаются в память (mmap),
+а не считываются в отдельный буфер."""
+
+_DETECTED_ENCODINGS: dict[tuple[str, tuple], tuple[tuple[int, int], int]] = {}
+"""Результаты подбора кодировки в :func:`decode_file`:
+``(путь, кодировки) -> (сигнатура файла, индекс подошедшей кодировки)``.
+Пока файл не изменился, неподходящие кодировки повторно не пробуются."""
+
+def decode_file(
+        fp: str,
+        encodings: tuple[str | None, ...]
+) -> tuple[str, int]:
+    """Считывание текстового файла с подбором кодировки.
+
+    Файл считывается с диска один раз, после чего его содержимое
+    декодируется по очереди указанными кодировками до первой подошедшей.
+    Как и при ``open(fp, "r")``, переводы строк ``\\r\\n`` и ``\\r``
+    заменяются на ``\\n``.
+
+    :param fp: Путь до файла.
+    :param encodings: Кодировки в порядке приоритета
+        (None - стандартная для системы).
+    :raises OSError: при ошибке открытия файла.
+    :raises UnicodeDecodeError: если файл не удалось декодировать
+        ни одной кодировкой.
+    :return: Содержимое файла и индекс подошедшей кодировки
+        (т.е. число неподошедших).
+    """
+    with open(fp, "rb") as file:
+        st = os.fstat(file.fileno())
+        sig = (st.st_size, st.st_mtime_ns)
+        key = (fp, encodings)
+        detected = _DETECTED_ENCODINGS.get(key)
+        start = detected[1] if (detected is not None) and (detected[0] == sig) else 0
+        if st.st_size >= _MMAP_MIN_SIZE:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                text, i = _decode(data, encodings, start)
+        else:
+            text, i = _decode(file.read(), encodings, start)
+    _DETECTED_ENCODINGS[key] = (sig, i)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text, i
+
+def _decode(data, encodings: tuple[str | None, ...], start: int) -> tuple[str, int]:
+    for i in range(start, len(encodings)):
+        encoding = encodings[i]
+        if encoding is None:
+            encoding = locale.getpreferredencoding(False)
+        try:
+            return str(data, encoding), i
+        except UnicodeDecodeError:
+            if i == (len(encodings) - 1):
+                raise
+    raise ValueError("No encodings provided")
+
 def read_file(fp: str) -> str:
     """Основная функция для считывания содержимого файла.
 
-    При открытии пробует ряд основных кодировок:
+    При декодировании пробует ряд основных кодировок (см. :func:`decode_file`):
 
     * ``utf-8-sig`` (UTF-8, UTF-8-BOM)
     * ``cp1251`` (Windows-1251)
@@ -61,16 +143,21 @@ def read_file(fp: str) -> str:
     :raises UnicodeDecodeError: если файл не удалось считать ни одной кодировкой.
     :returns: Содержимое файла.
     """
-    ENCODINGS = ["utf-8-sig", "cp1251", None]
-    for i, encoding in enumerate(ENCODINGS):
-        try:
-            with open(fp, "r", encoding=encoding) as file:
-                return file.read()
-        except UnicodeDecodeError:
-            if i == (len(ENCODINGS) - 1):
-                raise
-            continue
-    return ""
+    return decode_file(fp, ("utf-8-sig", "cp1251", None))[0]
+
+def file_signature(fp: str) -> tuple[int, int] | None:
+    """Сигнатура файла для отслеживания его изменений.
+
+    :param fp: Путь до файла.
+    :return: Пара ``(size, mtime_ns)`` или None, если такого файла нет.
+    """
+    try:
+        st = os.stat(fp)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
+        return None
+    return (st.st_size, st.st_mtime_ns)
 
 # ----------------------------------------------------------------
 
@@ -88,13 +175,36 @@ def cast_safe[R,D](
 
 class SingletonMeta(type):
     _instances = {}
+    _locks: dict[type, threading.Lock] = {}
+    _locks_guard = threading.Lock()
+    def __init__(cls, name, bases, namespace):
+        super().__init__(name, bases, namespace)
+        if len(bases) == 0:
+            return
+        # Экземпляр каждого класса - запись реестра (см. registry)
+        from . import registry
+        def reset() -> None:
+            SingletonMeta._instances.pop(cls, None)
+        registry.register(
+            name, lambda: SingletonMeta._instances.get(cls, None), reset, cls._inputs,
+            files=lambda instance: getattr(instance, "_deps", None)
+        )
     def __call__(cls, *args, **kwargs):
+        # Экземпляр создаётся один раз, даже при одновременном обращении
+        # из разных потоков (см. preload); разные классы - независимо
         if cls not in cls._instances:
-            cls._instances[cls] = super().__call__(*args, **kwargs)
+            with SingletonMeta._locks_guard:
+                lock = SingletonMeta._locks.setdefault(cls, threading.Lock())
+            with lock:
+                if cls not in cls._instances:
+                    cls._instances[cls] = super().__call__(*args, **kwargs)
         return cls._instances[cls]
 
 class SingletonBase(metaclass=SingletonMeta):
-    pass
+    _inputs: tuple[str, ...] = ()
+    """Данные, из которых строится экземпляр (имена записей :mod:`registry`).
+    Если у экземпляра есть атрибут ``_deps`` (файлы, как в :attr:`Ini._deps`),
+    то их изменение также учитывается (см. :func:`registry.refresh`)."""
 
 # ----------------------------------------------------------------
 
@@ -108,19 +218,19 @@ def validate_data(funcs: list[Callable[[], Any]]) -> None:
     if "sphinx" in sys.modules:
         # Ничего не валидировать, если модули подгружаются для документации.
         return
+    from .preload import PreloadError, preload
     try:
-        for func in funcs:
-            func_name = func.__name__
-            func()
-    except Exception as e:
-        msg = f"Mandatory data validation failed ({func_name})"
+        # Независимые данные загружаются одновременно (см. preload)
+        preload(funcs)
+    except PreloadError as e:
+        msg = f"Mandatory data validation failed ({e.loader})"
         print("")
         print((
             f"{ANSI_COLOR_CODE.RED}"
             f"! {msg}"
             f"{ANSI_COLOR_CODE.DEF}"
         ))
-        print(traceback.format_exc())
+        print("".join(traceback.format_exception(e.__cause__)))
         print("", flush=True)
         raise Exception(msg)
 
@@ -135,13 +245,12 @@ def preinit_singletons(singletons: list[type[SingletonBase]]) -> None:
     if "sphinx" in sys.modules:
         # Ничего не инициализировать, если модули подгружаются для документации.
         return
+    from .preload import PreloadError, preload
     try:
-        for cls in singletons:
-            cls_name = cls.__name__
-            cls()
-    except Exception:
-        print_error(f"Mandatory data validation failed ({cls_name})")
-        raise
+        preload(singletons)
+    except PreloadError as e:
+        print_error(f"Mandatory data validation failed ({e.loader})")
+        raise e.__cause__ from None
 
 # ----------------------------------------------------------------
 
@@ -185,6 +294,167 @@ def run(f: Runnable, tag: str, **kwargs: Any) -> None:
 
 # ----------------------------------------------------------------
 
+class GamedataFS:
+    """Индекс ресурсов игры (gamedata) из основной и вспомогательной папок.
+
+    Как и в движке, пути ищутся без учёта регистра и с любыми разделителями
+    (``\\`` или ``/``), а файл из основной папки перекрывает файл
+    из вспомогательной.
+
+    Содержимое каждой папки считывается с диска один раз, при первом
+    обращении к ней. Изменения на диске учитываются только после
+    вызова :func:`refresh`.
+
+    Экземпляр для пары папок можно получить через :func:`gamedata_fs`.
+    Он общий для всех потоков (см. :mod:`preload`): :func:`locate`
+    и :func:`refresh` выполняются под блокировкой.
+
+    :param gd_path_main: Путь до основной папки gamedata.
+    :param gd_path_alt: Путь до вспомогательной папки gamedata.
+    """
+    roots: tuple[Path, ...]
+    """Папки gamedata в порядке приоритета."""
+
+    _listings: dict[str, tuple[int, dict[str, tuple[str, bool]]] | None]
+    """Считанные папки: путь -> ``(mtime_ns, {имя в нижнем регистре: (имя, папка ли)})``
+    или None, если такой папки нет."""
+
+    _found: dict[tuple[str, bool], tuple[int, Path] | None]
+    """Результаты :func:`locate`."""
+
+    _lock: threading.Lock
+
+    def __init__(self, gd_path_main: Path | None, gd_path_alt: Path | None):
+        self.roots = tuple(p for p in (gd_path_main, gd_path_alt) if p is not None)
+        self._listings = {}
+        self._found = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def split(path: str) -> list[str] | None:
+        """Разбиение относительного пути на части
+        (с учётом ``.`` и ``..``, но без изменения регистра).
+
+        :return: Список частей или None, если путь выходит за пределы gamedata.
+        """
+        parts = []
+        for part in path.replace("\\", "/").split("/"):
+            if part in ("", "."):
+                continue
+            if part == "..":
+                if len(parts) == 0:
+                    return None
+                parts.pop()
+            else:
+                parts.append(part)
+        return parts
+
+    def _listing(self, fp_dir: str) -> dict[str, tuple[str, bool]] | None:
+        if fp_dir in self._listings:
+            entry = self._listings[fp_dir]
+            return None if (entry is None) else entry[1]
+        try:
+            mtime = os.stat(fp_dir).st_mtime_ns
+            names = {}
+            with os.scandir(fp_dir) as it:
+                for e in it:
+                    names.setdefault(e.name.lower(), (e.name, e.is_dir()))
+        except OSError:
+            self._listings[fp_dir] = None
+            return None
+        self._listings[fp_dir] = (mtime, names)
+        return names
+
+    def locate(self, path: str, is_dir: bool = False) -> tuple[int, Path] | None:
+        """Поиск файла (или папки).
+
+        :param path: Путь относительно папки gamedata.
+        :param is_dir: Искать папку, а не файл.
+        :return: Пара ``(индекс папки gamedata в roots, реальный путь)``
+            или None, если ничего не найдено.
+        """
+        key = (path, is_dir)
+        with self._lock:
+            if key in self._found:
+                return self._found[key]
+            result = None
+            parts = self.split(path)
+            if parts is not None:
+                for i, root in enumerate(self.roots):
+                    fp = self._locate_in(str(root), parts, is_dir)
+                    if fp is not None:
+                        result = (i, Path(fp))
+                        break
+            self._found[key] = result
+            return result
+
+    def _locate_in(self, fp: str, parts: list[str], is_dir: bool) -> str | None:
+        found_dir = True
+        for part in parts:
+            if not found_dir:
+                return None
+            listing = self._listing(fp)
+            if listing is None:
+                return None
+            entry = listing.get(part.lower())
+            if entry is None:
+                return None
+            name, found_dir = entry
+            fp = os.path.join(fp, name)
+        return fp if (found_dir == is_dir) else None
+
+    def find(self, path: str) -> Path | None:
+        """Реальный путь до файла или None, если его нет.
+
+        :param path: Путь до файла относительно папки gamedata.
+        """
+        result = self.locate(path)
+        return None if (result is None) else result[1]
+
+    def is_file(self, path: str) -> bool:
+        return self.locate(path) is not None
+
+    def is_dir(self, path: str) -> bool:
+        return self.locate(path, is_dir=True) is not None
+
+    def refresh(self) -> bool:
+        """Учесть изменения на диске: папки, время изменения которых
+        поменялось (появились, удалены или переименованы файлы),
+        будут считаны заново.
+
+        :return: Были ли изменения.
+        """
+        changed = False
+        with self._lock:
+            for fp_dir, entry in list(self._listings.items()):
+                try:
+                    mtime = os.stat(fp_dir).st_mtime_ns
+                except OSError:
+                    mtime = None
+                if mtime == (None if (entry is None) else entry[0]):
+                    continue
+                del self._listings[fp_dir]
+                changed = True
+            if changed:
+                self._found.clear()
+        return changed
+
+
+_GAMEDATA_FS: dict[tuple[Path | None, Path | None], GamedataFS] = {}
+_GAMEDATA_FS_LOCK = threading.Lock()
+
+def gamedata_fs(gd_path_main: Path | None, gd_path_alt: Path | None) -> GamedataFS:
+    """Общий для всех экземпляр :class:`GamedataFS` для указанных папок gamedata.
+    """
+    key = (gd_path_main, gd_path_alt)
+    fs = _GAMEDATA_FS.get(key)
+    if fs is None:
+        with _GAMEDATA_FS_LOCK:
+            fs = _GAMEDATA_FS.get(key)
+            if fs is None:
+                fs = _GAMEDATA_FS[key] = GamedataFS(gd_path_main, gd_path_alt)
+    return fs
+
 def is_gamedata_file(
         path: str,
         gd_path_main: Path | None,
@@ -198,10 +468,7 @@ def is_gamedata_file(
         Например, до ресурсов оригинальной игры или распакованных db-архивов.
     :return: Был ли найден указанный файл хотя бы в одной из папок gamedata.
     """
-    for gd_path in [gd_path_main, gd_path_alt]:
-        if (gd_path is not None) and gd_path.joinpath(path).is_file():
-            return True
-    return False
+    return gamedata_fs(gd_path_main, gd_path_alt).is_file(path)
 
 def is_gamedata_dir(
         path: str,
@@ -216,28 +483,36 @@ def is_gamedata_dir(
         Например, до ресурсов оригинальной игры или распакованных db-архивов.
     :return: Была ли найдена указанная папка хотя бы в одной из папок gamedata.
     """
-    for gd_path in [gd_path_main, gd_path_alt]:
-        if (gd_path is not None) and gd_path.joinpath(path).is_dir():
-            return True
-    return False
+    return gamedata_fs(gd_path_main, gd_path_alt).is_dir(path)
 
 # ----------------------------------------------------------------
 
-class XML_PATTERNS:
-    COMMENT = re.compile(r"<!--.*?-->")
-    INVALID_COMMENT_LINE = re.compile(r"<!--.*--.*-->")
-    INVALID_CHARS = re.compile(
-        # Invalid character (XML 1.0)
-        r"[^\x09\x0A\x0D\x20-\uD7FF\uE000-\uFFFD\U00010000-\U0010FFFF]"
-    )
-    UNESCAPED_AMPERSAND = re.compile(
-        r"&(?!(amp|lt|gt|apos|quot|#\d+|#x[a-fA-F0-9]+);)"
-    )
+@functools.cache
+def _xml_patterns() -> type:
+    # Компиляция выражений (особенно INVALID_CHARS) заметно замедляла
+    # импорт модуля, поэтому они компилируются при первом чтении XML.
+    class XML_PATTERNS:
+        COMMENT = re.compile(r"<!--.*?-->")
+        INVALID_COMMENT_LINE = re.compile(r"<!--.*--.*-->")
+        INVALID_CHARS = re.compile(
+            # Invalid character (XML 1.0)
+            r"[^\x09\x0A\x0D\x20-\uD7FF\uE000-\uFFFD\U00010000-\U0010FFFF]"
+        )
+        UNESCAPED_AMPERSAND = re.compile(
+            r"&(?!(amp|lt|gt|apos|quot|#\d+|#x[a-fA-F0-9]+);)"
+        )
+    return XML_PATTERNS
+
+def __getattr__(name: str) -> Any:
+    if name == "XML_PATTERNS":
+        return _xml_patterns()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def read_xml(
         fp_from_config: str,
         gd_path_main: Path | None,
-        gd_path_alt: Path | None
+        gd_path_alt: Path | None,
+        deps: dict[str, tuple[int, int] | None] | None = None
 ) -> list[str]:
     """Основная функция для чтения XML файлов из ресурсов игры
     с поддержкой include-директив.
@@ -257,9 +532,14 @@ def read_xml(
     :param gd_path_main: Путь до основной папки gamedata.
     :param gd_path_alt: Путь до вспомогательной папки gamedata.
         Например, до ресурсов оригинальной игры или распакованных db-архивов.
+    :param deps: Словарь, в который добавляются сигнатуры прочитанных файлов
+        (включая подключённые через ``#include``), как в :attr:`Ini._deps`.
+        Пути, по которым файл искался, но не был найден, добавляются с None.
     :return: Список строк прочитанного файла.
         Может быть использован для передачи в ``xml.etree.ElementTree.fromstringlist``.
     """
+    XML_PATTERNS = _xml_patterns()
+
     def _warn(msg: str) -> None:
         print_warning(f"[XML] ({fp_from_config}) {msg}")
     
@@ -281,38 +561,43 @@ def read_xml(
         return line
 
     # Получаем реальный путь до файла
-    for gd_path in [gd_path_main, gd_path_alt]:
-        if gd_path is None:
-            continue
-        if (path := gd_path.joinpath("config", fp_from_config)).is_file():
-            fp = str(path)
-            break
-    else:
+    path = f"config/{fp_from_config}"
+    found = gamedata_fs(gd_path_main, gd_path_alt).locate(path)
+    if (deps is not None) and ((found is None) or (found[0] > 0)):
+        # Как Ini._probe_gamedata: появление файла в gamedata мода
+        #  (или вообще где-либо) - тоже изменение
+        parts = GamedataFS.split(path) or []
+        for gd_path in ((gd_path_main, gd_path_alt) if (found is None) else (gd_path_main,)):
+            if gd_path is not None:
+                deps.setdefault(str(gd_path.joinpath(*parts)), None)
+    if found is None:
         _warn("Not found")
         return []
+    fp = str(found[1])
+    if deps is not None:
+        deps[fp] = file_signature(fp)
     
     # Читаем файл
     if Path(fp_from_config).is_relative_to("text\\rus\\"):
-        encodings = ["cp1251", "utf-8-sig", None]
+        encodings = ("cp1251", "utf-8-sig", None)
         decode_error_warn = True
     else:
-        encodings = ["utf-8-sig", "cp1251", None]
+        encodings = ("utf-8-sig", "cp1251", None)
         decode_error_warn = False
-    for encoding in encodings:
-        try:
-            with open(fp, "r", encoding=encoding) as f:
-                lines_input = f.readlines()
-                break
-        except UnicodeDecodeError:
-            if decode_error_warn:
-                _warn(f"Can't be read with encoding='{encoding}'")
-            continue
-        except OSError as e:
-            _warn(f"Skipping due to OSError: {e}")
-            return []
-    else:
+    try:
+        text, n_failed = decode_file(fp, encodings)
+    except UnicodeDecodeError:
+        text, n_failed = None, len(encodings)
+    except OSError as e:
+        _warn(f"Skipping due to OSError: {e}")
+        return []
+    if decode_error_warn:
+        for encoding in encodings[:n_failed]:
+            _warn(f"Can't be read with encoding='{encoding}'")
+    if text is None:
         _warn("Skipping: unexpected encoding")
         return []
+    lines_input = io.StringIO(text).readlines()
     
     # Обработка строк и поддержка include-директив
     lines_output = []
@@ -323,7 +608,9 @@ def read_xml(
                 if len(parts) != 3:
                     _warn(f"Strange #include syntax: line {i+1}")
                 part_fp = parts[1].strip()
-                lines_output.extend(read_xml(part_fp, gd_path_main, gd_path_alt))
+                lines_output.extend(
+                    read_xml(part_fp, gd_path_main, gd_path_alt, deps)
+                )
             else:
                 _warn(f"Invalid #include syntax: line {i+1}")
         else:
@@ -1,4 +1,3 @@
-import networkx as nx
 from dataclasses import dataclass
 from enum import Enum, auto
 from typing import Container
@@ -14,6 +13,7 @@ class Levels(SingletonBase):
     Определяется секцией ``[level_gvids]`` в meta-файле.
     """
 
+    _inputs = ("meta_ini",)
     _level_gvids: dict[str, int]
 
     def __init__(self):
@@ -54,45 +54,102 @@ class ServerClasses(SingletonBase):
     Определяется секцией ``[server_classes]`` в meta-файле.
     """
 
-    _graph: nx.DiGraph
-    """Ориентированный граф,
-    в котором ребро (U, V) означает,
-    что класс U напрямую наследуется от класса V.
-    Циклы не допускаются.
-    """
+    _inputs = ("meta_ini",)
+    _parents: dict[str, tuple[str, ...]]
+    """Серверный класс -> классы, от которых он напрямую наследуется."""
+    _index: dict[str, int]
+    """Серверный класс -> его номер (бит в :attr:`_ancestors`)."""
+    _ancestors: list[int]
+    """Номер класса -> битовое множество всех его предков, включая сам класс
+    (транзитивное замыкание, вычисляется один раз при инициализации)."""
 
     def __init__(self):
         SN = "server_classes"
 
         # Построение графа
         sc = meta_ini().section(SN)
-        self._graph = nx.DiGraph()
-        self._graph.add_nodes_from(sc.lines())
+        self._parents = {cse: () for cse in sc.lines()}
         for cse_child in sc.lines():
+            parents = []
             for cse_parent in sc.get_strings(cse_child, mandatory=False):
                 if len(cse_parent) > 0:
-                    self._graph.add_edge(cse_child, cse_parent)
+                    if cse_parent not in parents:
+                        parents.append(cse_parent)
+                    self._parents.setdefault(cse_parent, ())
                 else:
                     print_warning((
                         f"[{SN}] {cse_child} "
                         "is derived from a class with zero-lenth name (ignored)"
                     ))
-        
-        # Проверка на циклы
-        if not nx.is_directed_acyclic_graph(self._graph):
-            cycles = nx.simple_cycles(self._graph)
-            print_warning("[{}] Server classes' hierarchy has cycles:\n    {}".format(
-                SN,
-                "\n    ".join(
-                    [f"{i}: {cycle}" for i, cycle in enumerate(cycles, start=1)]
-                )
-            ))
+            self._parents[cse_child] = tuple(parents)
+
+        # Транзитивное замыкание в топологическом порядке (предки - раньше)
+        self._index = {cse: i for i, cse in enumerate(self._parents)}
+        parents = [
+            [self._index[cse_parent] for cse_parent in cse_parents]
+            for cse_parents in self._parents.values()
+        ]
+        children: list[list[int]] = [[] for _ in parents]
+        for i, ps in enumerate(parents):
+            for j in ps:
+                children[j].append(i)
+        pending = [len(ps) for ps in parents]
+        ready = [i for i, n in enumerate(pending) if n == 0]
+        ancestors: list[int | None] = [None] * len(parents)
+        n_done = 0
+        while len(ready) > 0:
+            i = ready.pop()
+            bits = 1 << i
+            for j in parents[i]:
+                bits |= ancestors[j]
+            ancestors[i] = bits
+            n_done += 1
+            for k in children[i]:
+                pending[k] -= 1
+                if pending[k] == 0:
+                    ready.append(k)
+
+        # Проверка на циклы: классы, не попавшие в топологический порядок
+        if n_done < len(parents):
+            self._report_cycles(SN)
+            for i, bits in enumerate(ancestors):
+                if bits is None:
+                    ancestors[i] = self._walk(i, parents)
+        self._ancestors = ancestors
+
+    @staticmethod
+    def _walk(i: int, parents: list[list[int]]) -> int:
+        """Множество предков обходом графа (для иерархии с циклами)."""
+        bits = 1 << i
+        stack = [i]
+        while len(stack) > 0:
+            for j in parents[stack.pop()]:
+                if not (bits >> j) & 1:
+                    bits |= 1 << j
+                    stack.append(j)
+        return bits
+
+    def _report_cycles(self, SN: str) -> None:
+        import networkx as nx  # тяжёлый модуль, нужен только для отчёта
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self._parents)
+        graph.add_edges_from(
+            (cse, cse_parent)
+            for cse, parents in self._parents.items() for cse_parent in parents
+        )
+        cycles = nx.simple_cycles(graph)
+        print_warning("[{}] Server classes' hierarchy has cycles:\n    {}".format(
+            SN,
+            "\n    ".join(
+                [f"{i}: {cycle}" for i, cycle in enumerate(cycles, start=1)]
+            )
+        ))
 
     def __contains__(self, cse: str) -> bool:
-        return cse in self._graph
+        return cse in self._parents
 
     def __len__(self):
-        return len(self._graph)
+        return len(self._parents)
 
     def issubclass(self, cse_subclass: str, cse_class: str) -> bool:
         """Проверка, является ли один серверный класс подклассом
@@ -102,15 +159,18 @@ class ServerClasses(SingletonBase):
         предков класса A или равен классу A.
 
         Повторяет логику встроенной в Python функции ``issubclass``.
+        Выполняется за O(1) (см. :attr:`_ancestors`).
 
         :raises ValueError: если хотя бы одного из указанных серверных классов
             не существует.
         """
-        if cse_subclass not in self._graph:
+        i = self._index.get(cse_subclass, None)
+        if i is None:
             raise ValueError(f"{cse_subclass} is not a server class")
-        if cse_class not in self._graph:
+        j = self._index.get(cse_class, None)
+        if j is None:
             raise ValueError(f"{cse_class} is not a server class")
-        return nx.has_path(self._graph, cse_subclass, cse_class)
+        return (self._ancestors[i] >> j) & 1 == 1
 
 # ----------------------------------------------------------------
 
@@ -160,6 +220,7 @@ class ObjectTypeDetector(SingletonBase):
         client_classes: list[str]
         server_classes: list[str]
 
+    _inputs = ("meta_ini", "ServerClasses")
     _rules: dict[ObjectType, ObjectTypeRule]
     """Правила определения типа объекта. Задаётся для каждого типа, кроме ``OTHER``."""
 
@@ -248,6 +309,7 @@ class CLSIDs(SingletonBase):
         server_class: str | None
         object_type: ObjectType
 
+    _inputs = ("meta_ini", "ServerClasses", "ObjectTypeDetector")
     _clsids: dict[str, CLSID]
 
     def __init__(self):
@@ -20,12 +20,16 @@ class Dialogs(SingletonBase):
     Пока хранится лишь набор существующих диалогов
     без какой-либо детальной информации.
     """
+    _inputs = ("system_ini",)
     _data: OrderedDict[str, Dialog]
+    _deps: dict[str, tuple[int, int] | None]
+    """Прочитанные XML-файлы и их сигнатуры (см. :func:`read_xml`)."""
 
     def __init__(self):
         ini_system = system_ini()
         xml_names = ini_system.get_strings("dialogs", "files", mandatory=True)
         xml_paths = [f"gameplay\\{fn}.xml" for fn in xml_names]
+        self._deps = {}
         self._data = OrderedDict()
         for fp_from_config in xml_paths:
             try:
@@ -33,7 +37,8 @@ class Dialogs(SingletonBase):
                     read_xml(
                         fp_from_config,
                         ini_system.gdm,
-                        ini_system.gda
+                        ini_system.gda,
+                        self._deps
                     )
                 )
             except Exception:
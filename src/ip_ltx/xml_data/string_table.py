@@ -9,7 +9,10 @@ from ..utils import print_error, print_warning, read_xml, SingletonBase
 class StringTable(SingletonBase):
     """Набор текстов [string_table].
     """
+    _inputs = ("system_ini",)
     _data: dict[str, str]
+    _deps: dict[str, tuple[int, int] | None]
+    """Прочитанные XML-файлы и их сигнатуры (см. :func:`read_xml`)."""
 
     def __init__(self):
         ini_system = system_ini()
@@ -20,6 +23,7 @@ class StringTable(SingletonBase):
         xml_paths = [f"text\\{lang}\\{fn}.xml" for fn in xml_names]
 
         # extracting strings
+        self._deps = {}
         self._data = {}
         for fp_from_config in xml_paths:
             try:
@@ -27,7 +31,8 @@ class StringTable(SingletonBase):
                     read_xml(
                         fp_from_config,
                         ini_system.gdm,
-                        ini_system.gda
+                        ini_system.gda,
+                        self._deps
                     )
                 )
             except Exception:
@@ -21,12 +21,16 @@ class TextureDesc(SingletonBase):
     """Данные из xml-файлов, перечисленных в секции [texture_desc] из system.ltx.
     Порядок определения текстур сохранён.
     """
+    _inputs = ("system_ini",)
     _data: OrderedDict[str, Texture]
+    _deps: dict[str, tuple[int, int] | None]
+    """Прочитанные XML-файлы и их сигнатуры (см. :func:`read_xml`)."""
 
     def __init__(self):
         ini_system = system_ini()
         xml_names = ini_system.get_strings("texture_desc", "files", mandatory=True)
         xml_paths = [f"ui\\{fn}.xml" for fn in xml_names]
+        self._deps = {}
         self._data = OrderedDict()
         for fp_from_config in xml_paths:
             try:
@@ -34,7 +38,8 @@ class TextureDesc(SingletonBase):
                     read_xml(
                         fp_from_config,
                         ini_system.gdm,
-                        ini_system.gda
+                        ini_system.gda,
+                        self._deps
                     )
                 )
             except Exception:
@@ -842,3 +842,120 @@ def test_section_get_pair():
         _ = section.get_pair_float("pair_str_1")
     with pytest.raises(Section.Error):
         _ = section.get_pair_uint("pair_int_1")
+
+def test_section_init_copy_on_write():
+    source = Section(id="source")
+    source.add("a", "1")
+    source.add("b", "2")
+    copy = Section(id="copy", init=source)
+    copy.add("b", "3", overwrite=True)
+    copy.add("c", "4")
+    source.add("a", "5", overwrite=True)
+    source.add("d", "6")
+
+    assert list(source.fields()) == [("a", "5"), ("b", "2"), ("d", "6")]
+    assert list(copy.fields()) == [("a", "1"), ("b", "3"), ("c", "4")]
+    assert copy.line_exist("a") and not copy.line_exist("d")
+
+def test_section_fields_view():
+    source = Section(id="source")
+    source.add("a", "1")
+    section = Section(id="test", init=source)
+    section._fields["b"] = "2"
+    section._fields["a"] = None
+    assert section._fields == {"a": None, "b": "2"}
+    assert section._fields.get("a", "-") is None
+    assert "b" in section._fields
+    assert list(section._fields.keys()) == ["a", "b"]
+    del section._fields["a"]
+    assert list(section.lines()) == ["b"]
+    assert list(source.fields()) == [("a", "1")]
+    with pytest.raises(KeyError):
+        _ = section._fields["a"]
+
+def test_section_deep_inheritance_chain():
+    sections = [Section(id="s_0")]
+    sections[0].add("f_0", "0")
+    for i in range(1, 30):
+        section = Section(id=f"s_{i}", init=sections[-1])
+        section.add(f"f_{i}", str(i))
+        section.add("f_0", str(i), overwrite=True)
+        sections.append(section)
+    last = sections[-1]
+    assert list(last.lines()) == [f"f_{i}" for i in range(30)]
+    assert last.field("f_0") == "29"
+    assert sections[10].field("f_0") == "10"
+    assert not sections[10].line_exist("f_11")
+
+def test_section_fields_own():
+    source = Section(id="source")
+    source.add("a", "1")
+    source.add("b", "2")
+    section = Section(id="test", init=source)
+    section._fields["c"] = "3"
+    section.add("d", "4")
+    assert not hasattr(section, "__dict__")
+    assert section._fields_own == {"a", "b", "d"}
+    del section._fields["a"]
+    assert section._fields_own == {"b", "d"}
+    section.clear()
+    assert section._fields_own == set()
+    assert source._fields_own == {"a", "b"}
+
+def test_section_typed_memo():
+    section = Section(id="test")
+    section.add("cost", "100")
+    section.add("list", "a, b")
+    section.add("pair", "1.5, 2")
+    Section.memo_reset_stats()
+
+    assert section.get_uint("cost") == 100
+    assert section.get_uint("cost") == 100
+    assert Section.memo_stats() == (1, 1)
+
+    strings = section.get_strings("list")
+    strings.append("c")
+    assert section.get_strings("list") == ["a", "b"]
+    assert section.get_pair_float("pair") == (1.5, 2.0)
+    assert section.get_pair_float("pair") == (1.5, 2.0)
+    assert Section.memo_stats() == (3, 3)
+
+    # Изменение секции сбрасывает кэш
+    section.add("cost", "200", overwrite=True)
+    assert section.get_uint("cost") == 200
+    section.clear()
+    assert section.get_uint("cost", 0) == 0
+
+    # Произвольные преобразования не кэшируются
+    section.add("cost", "300")
+    Section.memo_reset_stats()
+    assert section.get_elem(lambda v: int(v) * 2, "x2", "cost", None) == 600
+    assert Section.memo_stats() == (0, 0)
+
+def test_section_get_elems_bulk():
+    # Разбор списка одним вызовом совпадает с поэлементным (в т.ч. сообщения ошибок)
+    section = Section(id="test")
+    values = [
+        "1, 2.5,-3e2 ,  +4", "1_000, 2", "inf, nan", "1,,2", "1, zero, 3", "1,", "1.5",
+    ]
+    for i, v in enumerate(values):
+        section.add(f"f_{i}", v)
+    for caster, label, getter in (
+        (Section.cast_float, "float", Section.get_floats),
+        (Section.cast_int, "int", Section.get_ints),
+    ):
+        for i in range(len(values)):
+            def slow() -> list:
+                return section.get_elems(
+                    lambda v: caster(v), label, f"f_{i}", True
+                )
+            try:
+                expected = slow()
+            except Section.Error as e:
+                with pytest.raises(Section.Error) as e_bulk:
+                    getter(section, f"f_{i}")
+                assert str(e_bulk.value) == str(e)
+            else:
+                r = getter(section, f"f_{i}")
+                assert [type(x) for x in r] == [type(x) for x in expected]
+                assert str(r) == str(expected)
@@ -1,5 +1,7 @@
 import inspect
 import math
+import os
+import pickle
 import pytest
 from pathlib import Path
 
@@ -1352,6 +1354,32 @@ def test_ini_read_encoding_cp1251(tmp_path):
 def test_ini_read_encoding_default(tmp_path):
     _test_ini_read_encoding(tmp_path, None)
 
+def test_ini_read_encoding_detection(tmp_path, monkeypatch):
+    from ip_ltx import utils
+    encodings = ("utf-8-sig", "cp1251", None)
+    file_path = tmp_path / "test.ltx"
+    file_path.write_bytes("[rus]\r\nlower = йцукен\rUPPER = ЙЦУКЕН\r\n".encode("cp1251"))
+    text = "[rus]\nlower = йцукен\nUPPER = ЙЦУКЕН\n"
+    assert utils.decode_file(str(file_path), encodings) == (text, 1)
+
+    # Подошедшая кодировка запоминается, пока файл не изменился
+    file_path.write_bytes(b"[eng]\nlower = qwerty\n")
+    os.utime(file_path, ns=(0, 1_000_000_000))
+    assert utils.decode_file(str(file_path), encodings)[1] == 0
+    key = (str(file_path), encodings)
+    sig, _ = utils._DETECTED_ENCODINGS[key]
+    utils._DETECTED_ENCODINGS[key] = (sig, 1)
+    assert utils.decode_file(str(file_path), encodings)[1] == 1
+    file_path.write_bytes("[rus]\nlower = йцукен\n".encode("utf-8"))
+    os.utime(file_path, ns=(0, 2_000_000_000))
+    assert utils.decode_file(str(file_path), encodings) == ("[rus]\nlower = йцукен\n", 0)
+
+    # Крупные файлы отображаются в память
+    monkeypatch.setattr(utils, "_MMAP_MIN_SIZE", 1)
+    file_path.write_bytes("[rus]\r\nUPPER = ЙЦУКЕН\r\n".encode("cp1251"))
+    os.utime(file_path, ns=(0, 3_000_000_000))
+    assert utils.read_file(str(file_path)) == "[rus]\nUPPER = ЙЦУКЕН\n"
+
 
 def test_ini_read_inside_gamedata(tmp_path):
     # Setting up folders
@@ -1533,3 +1561,637 @@ def test_ini_get_string_wb():
     # non-existent section
     with pytest.raises(Ini.Error):
         _ = ini.get_string_wb("unknown", "valid_1")
+
+
+_PARSER_SAMPLES = [
+    "\n".join([
+        "; comment before any section",
+        "redundant text",
+        "[parent]",
+        "f1 = v1 ; comment",
+        "f2 = v/2 // not a comment",
+        "f3 = v3  // comment",
+        "f1 = v11",
+        "flag",
+        " = empty name",
+        '"q" = " a b " c d',
+        "[child]:parent  ; comment",
+        "f4 = 1, 2, 3",
+        "[odd]x]:parent",
+        "[odd_2] garbage",
+        "[ws id]",
+        "[]",
+    ]),
+    "\n".join([
+        "custom_data = <<END",
+        "[obj]",
+        "name = obj",
+        "custom_data = <<END",
+        "[spawn] ; comment",
+        "item = 1 // c",
+        "  END  ; end",
+        "custom_data = <<END",
+        "[never_closed]",
+    ]),
+    "\n".join([
+        "[a]",
+        "[a]",
+    ]),
+    "\n".join([
+        "[a]",
+        "[b]:a,,a",
+    ]),
+    "\n".join([
+        "[b]:unknown",
+    ]),
+]
+
+@pytest.mark.parametrize("raw", _PARSER_SAMPLES)
+@pytest.mark.parametrize("preserve_value_whitespaces", [False, True])
+def test_ini_read_parsers_equivalence(capsys, raw, preserve_value_whitespaces):
+    """Реализации ``fast`` и ``legacy`` дают одинаковые секции,
+    warning-сообщения и ошибки.
+    """
+    results = []
+    for parser in ("legacy", "fast"):
+        ini = Ini(name="test_ini")
+        error = None
+        try:
+            ini.read_raw(
+                raw,
+                preserve_value_whitespaces=preserve_value_whitespaces,
+                parser=parser
+            )
+        except Ini.Error as e:
+            error = str(e)
+        results.append((
+            [
+                (s.id, list(s.fields()), sorted(s._fields_own))
+                for s in ini.sections()
+            ],
+            error,
+            capsys.readouterr().err,
+        ))
+    assert results[0] == results[1]
+
+def test_ini_read_parsers_equivalence_on_files(sample_ini):
+    fp_entry = next(iter(sample_ini._deps))
+    assert fp_entry.endswith("file_1.ltx")
+    ini_legacy = Ini(name="test")
+    ini_legacy.read(fp_entry, parser="legacy")
+    assert list(ini_legacy.ids()) == list(sample_ini.ids())
+    for s1, s2 in zip(ini_legacy.sections(), sample_ini.sections()):
+        assert list(s1.fields()) == list(s2.fields())
+        assert s1._src == s2._src
+
+def _ini_snapshot(ini):
+    return [
+        (s.id, list(s.fields()), sorted(s._fields_own), s._src, s.parents)
+        for s in ini.sections()
+    ]
+
+@pytest.mark.parametrize("raw", _PARSER_SAMPLES)
+@pytest.mark.parametrize("preserve_value_whitespaces", [False, True])
+def test_ini_read_lazy_equivalence(capsys, raw, preserve_value_whitespaces):
+    """Ленивое чтение даёт те же секции и ошибки, что и обычное."""
+    results = []
+    for lazy in (False, True):
+        ini = Ini(name="test_ini")
+        error = None
+        try:
+            ini.read_raw(
+                raw,
+                preserve_value_whitespaces=preserve_value_whitespaces,
+                lazy=lazy
+            )
+        except Ini.Error as e:
+            error = str(e)
+        results.append((
+            _ini_snapshot(ini) if (error is None) else None,
+            error,
+        ))
+    capsys.readouterr()
+    assert results[0] == results[1]
+
+def test_ini_read_lazy_equivalence_on_files(sample_ini):
+    fp_entry = next(iter(sample_ini._deps))
+    ini_lazy = Ini(name="test")
+    ini_lazy.read(fp_entry, lazy=True)
+    assert _ini_snapshot(ini_lazy) == _ini_snapshot(sample_ini)
+
+def test_ini_read_lazy_materialization():
+    ini = Ini(name="test_ini")
+    ini.read_raw("\n".join([
+        "[a]",
+        "f1 = 1",
+        "[b]:a",
+        "f2 = 2",
+        "[c]",
+        "f3 = 3",
+    ]), lazy=True)
+    assert list(ini.ids()) == ["a", "b", "c"]
+    for s in ini.sections():
+        assert s._lazy is not None
+    assert ini.get_int("b", "f1") == 1
+    assert ini.section("a")._lazy is None
+    assert ini.section("b")._lazy is None
+    assert ini.section("c")._lazy is not None
+    assert list(ini.section("b").fields()) == [("f1", "1"), ("f2", "2")]
+    assert ini.section("b")._fields_own == {"f2"}
+
+def test_ini_read_lazy_heredoc():
+    ini = Ini(name="test_ini")
+    ini.read_raw("\n".join([
+        "[obj]",
+        "custom_data = <<END",
+        "[not_a_section]",
+        "#include \"not_an_include.ltx\"",
+        "END",
+        "f = 1",
+        "[next]",
+    ]), lazy=True)
+    assert list(ini.ids()) == ["obj", "next"]
+    assert ini.get_string("obj", "custom_data") == (
+        "[not_a_section]\n#include \"not_an_include.ltx\"\n"
+    )
+    assert ini.get_int("obj", "f") == 1
+
+def test_ini_read_lazy_parent_with_include(tmp_path):
+    """Потомок получает поля родителя на момент своего объявления, даже если
+    тело родителя продолжается после ``#include``.
+    """
+    f_main = tmp_path / "main.ltx"
+    f_inc = tmp_path / "inc.ltx"
+    f_main.write_text("\n".join([
+        "[a]",
+        "f1 = 1",
+        "#include \"inc.ltx\"",
+        "f2 = 2",
+    ]))
+    f_inc.write_text("\n".join([
+        "f3 = 3",
+        "[b]:a",
+    ]))
+    ini = Ini(name="test_ini")
+    ini.read(str(f_main), lazy=True)
+    assert list(ini.section("b").fields()) == [("f1", "1"), ("f3", "3")]
+    assert list(ini.section("a").fields()) == [
+        ("f1", "1"), ("f3", "3"), ("f2", "2")
+    ]
+    assert ini.section("a")._src == "main.ltx"
+    assert ini.section("b")._src == "inc.ltx"
+
+def test_ini_read_lazy_errors():
+    ini = Ini(name="test_ini")
+    with pytest.raises(Ini.Error):
+        ini.read_raw("[a]\nf = 1\n[a]", lazy=True)
+    ini = Ini(name="test_ini")
+    with pytest.raises(Ini.Error):
+        ini.read_raw("[b]:unknown", lazy=True)
+
+def test_ini_read_inheritance_copy_on_write():
+    """Потомок не копирует поля родителя, но и не видит изменений родителя,
+    сделанных после объявления потомка.
+    """
+    ini = Ini(name="test_ini")
+    ini.read_raw("\n".join([
+        "[base]",
+        "f1 = 1",
+        "f2 = 2",
+        "[child]:base",
+        "f2 = 3",
+        "f3 = 4",
+        "[grandchild]:child",
+        "f1 = 5",
+    ]))
+    ini.section("base").add("f4", "6")
+    ini.section("child").add("f1", "7", overwrite=True)
+    assert list(ini.section("base").fields()) == [
+        ("f1", "1"), ("f2", "2"), ("f4", "6")
+    ]
+    assert list(ini.section("child").fields()) == [
+        ("f1", "7"), ("f2", "3"), ("f3", "4")
+    ]
+    assert list(ini.section("grandchild").fields()) == [
+        ("f1", "5"), ("f2", "3"), ("f3", "4")
+    ]
+    assert ini.section("grandchild")._fields_own == {"f1"}
+
+def test_ini_read_shared_values():
+    ini = Ini(name="test_ini")
+    ini.read_raw("\n".join([
+        "[a]",
+        "flag = true",
+        "[b]",
+        "flag = true",
+        "flag = true",
+    ]))
+    v_a = ini.section("a").field("flag")
+    v_b = ini.section("b").field("flag")
+    assert v_a == v_b == "true"
+    assert v_a is v_b
+    assert ini.section("b")._fields_own == {"flag"}
+
+def _write_touched(fp, lines):
+    """Запись файла со сдвигом mtime (чтобы изменение было заметно сразу)."""
+    fp.write_text("\n".join(lines))
+    st = fp.stat()
+    os.utime(fp, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+def test_ini_refresh(tmp_path):
+    f_main = tmp_path / "main.ltx"
+    f_base = tmp_path / "base.ltx"
+    f_items = tmp_path / "items.ltx"
+    f_main.write_text("\n".join([
+        '#include "base.ltx"',
+        '#include "items.ltx"',
+        "[standalone]",
+        "f = 1",
+    ]))
+    f_base.write_text("\n".join([
+        "[base]",
+        "cost = 10",
+    ]))
+    f_items.write_text("\n".join([
+        "[item_1]:base",
+        "weight = 1",
+        "[item_2]:item_1",
+        "[other]",
+        "g = 2",
+    ]))
+    ini = Ini(name="test_ini")
+    ini.read(str(f_main))
+    assert ini.refresh() == False
+    standalone = ini.section("standalone")
+    other = ini.section("other")
+
+    # Изменение родителя: потомки в неизменившемся файле получают новые поля
+    _write_touched(f_base, [
+        "[base]",
+        "cost = 20",
+    ])
+    assert ini.refresh() == True
+    ini_fresh = Ini(name="test_ini")
+    ini_fresh.read(str(f_main))
+    assert _ini_snapshot(ini) == _ini_snapshot(ini_fresh)
+    assert ini.get_uint("item_2", "cost") == 20
+    assert ini.section("standalone") is standalone
+    assert ini.section("other") is other
+    assert ini.refresh() == False
+
+    # Изменение потомка
+    _write_touched(f_items, [
+        "[item_1]:base",
+        "weight = 2",
+        "[item_2]:item_1",
+        "cost = 30",
+        "[other]",
+        "g = 2",
+    ])
+    assert ini.refresh() == True
+    ini_fresh = Ini(name="test_ini")
+    ini_fresh.read(str(f_main))
+    assert _ini_snapshot(ini) == _ini_snapshot(ini_fresh)
+    assert ini.get_uint("item_2", "cost") == 30
+    assert ini.section("standalone") is standalone
+
+def test_ini_refresh_errors(tmp_path):
+    f_main = tmp_path / "main.ltx"
+    f_inc = tmp_path / "inc.ltx"
+    f_main.write_text("\n".join([
+        "[a]",
+        '#include "inc.ltx"',
+        "[b]:a",
+    ]))
+    f_inc.write_text("f = 1")
+    ini = Ini(name="test_ini")
+    ini.read(str(f_main))
+
+    # Дубликат, как и при обычном чтении
+    _write_touched(f_inc, ["f = 1", "[b]"])
+    with pytest.raises(Ini.Error, match="Duplicate section"):
+        ini.refresh()
+
+    # После исправления ошибки данные считываются полностью
+    _write_touched(f_inc, ["f = 2"])
+    assert ini.refresh() == True
+    assert list(ini.ids()) == ["a", "b"]
+    assert ini.get_uint("b", "f") == 2
+
+    ini.read_raw("[c]")
+    with pytest.raises(Ini.Error):
+        ini.refresh()
+
+def test_ini_refresh_inside_gamedata(tmp_path):
+    """Появление файла в gamedata мода перекрывает файл оригинала."""
+    gd_mod_path = tmp_path / "gamedata-mod"
+    gd_alt_path = tmp_path / "gamedata-alt"
+    gd_mod_path.mkdir()
+    gd_alt_path.mkdir()
+    (gd_alt_path / "entry.ltx").write_text("\n".join([
+        "[entry]",
+        '#include "inc.ltx"',
+        "[child]:entry",
+    ]))
+    (gd_alt_path / "inc.ltx").write_text("taken_from = alt")
+
+    _ss = Section(id="settings")
+    _ss.add("gamedata_path_mod", f'"{str(gd_mod_path)}"')
+    _ss.add("gamedata_path_alt", f'"{str(gd_alt_path)}"')
+    ini_meta = Ini(name="meta")
+    ini_meta.add(_ss, by_reference=True)
+
+    ini = Ini(name="entry", ini_meta=ini_meta)
+    ini.read("entry.ltx", inside_gamedata=True)
+    assert ini.get_string("child", "taken_from") == "alt"
+    (gd_mod_path / "inc.ltx").write_text("taken_from = mod")
+    assert ini.refresh() == True
+    assert ini.get_string("entry", "taken_from") == "mod"
+    assert ini.get_string("child", "taken_from") == "mod"
+
+def test_ini_refresh_after_pickle(tmp_path):
+    """Журнал чтения восстанавливается из pickle (как в ini_cache)."""
+    f_main = tmp_path / "main.ltx"
+    f_inc = tmp_path / "inc.ltx"
+    f_main.write_text("\n".join([
+        "[a]",
+        '#include "inc.ltx"',
+        "[b]:a",
+    ]))
+    f_inc.write_text("f = 1")
+    ini = Ini(name="test_ini")
+    ini.read(str(f_main))
+    ini = pickle.loads(pickle.dumps(ini))
+    _write_touched(f_inc, ["f = 2"])
+    assert ini.refresh() == True
+    assert ini.get_uint("b", "f") == 2
+
+def test_ini_read_many(tmp_path, capsys):
+    files = {
+        "a.ltx": ["; redundant", "x", "[a]", "f = 1", "f = 2", "custom_data = <<END", "q", "END"],
+        "b.ltx": ["[b]:a", "g = 3", " = 4"],
+        "c.ltx": ['#include "d.ltx"', "[c]:b"],
+        "d.ltx": ["[d]", "h = 5"],
+    }
+    for name, lines in files.items():
+        (tmp_path / name).write_text("\n".join(lines))
+    fps = [str(tmp_path / name) for name in ("a.ltx", "b.ltx", "c.ltx")]
+
+    ini_serial = Ini(name="test_ini")
+    for fp in fps:
+        ini_serial.read(fp)
+    out_serial = capsys.readouterr()
+    ini = Ini(name="test_ini")
+    ini.read_many(fps, max_workers=2)
+    out = capsys.readouterr()
+    assert _ini_snapshot(ini) == _ini_snapshot(ini_serial)
+    assert out == out_serial
+    assert ini.refresh() == False
+
+    # Изменение одного из файлов (остальные - по журналу из процессов)
+    _write_touched(tmp_path / "b.ltx", ["[b]:a", "cost = 100", "weight = 4.5"])
+    ini = Ini(name="test_ini")
+    ini.read_many(fps, max_workers=2)
+    capsys.readouterr()
+    _write_touched(tmp_path / "a.ltx", ["[a]", "f = 3"])
+    assert ini.refresh() == True
+    ini_serial = Ini(name="test_ini")
+    for fp in fps:
+        ini_serial.read(fp)
+    assert _ini_snapshot(ini) == _ini_snapshot(ini_serial)
+    assert ini.get_uint("b", "f") == 3
+
+    # Строки из процессов-обработчиков - общие с остальными секциями
+    ini.read_raw("[e]\ncost = 100")
+    assert ini.get_string("b", "cost") is ini.get_string("e", "cost")
+    assert list(ini.section("b")._over)[0] is list(ini.section("e")._over)[0]
+
+    # Ошибки - те же, что и при последовательном чтении
+    ini = Ini(name="test_ini")
+    with pytest.raises(Ini.Error, match="Duplicate section"):
+        ini.read_many(fps + [str(tmp_path / "d.ltx")], max_workers=2)
+    assert list(ini.ids()) == ["a", "b", "d", "c"]
+    ini = Ini(name="test_ini")
+    with pytest.raises(Ini.Error, match="FILE DOES NOT EXIST"):
+        ini.read_many([fps[0], str(tmp_path / "missing.ltx"), fps[1]], max_workers=2)
+    assert list(ini.ids()) == ["a"]
+
+def test_ini_iter_sections(tmp_path, capsys):
+    (tmp_path / "main.ltx").write_text("\n".join([
+        "; redundant", "x",
+        "[a]", "f = 1", "f = 2",
+        '#include "inc.ltx"',
+        "g = 3",
+        "[c]:b, base ; comment",
+        "custom_data = <<END", "[fake]:a", "END",
+        "[d]:a",
+    ]))
+    (tmp_path / "inc.ltx").write_text("\n".join(["h = 4", "[b]:a", " = 5"]))
+    ini_base = Ini(name="test_ini")
+    ini_base.read_raw("[base]\nk = 6")
+
+    ini = Ini(name="test_ini")
+    ini.read_raw("[base]\nk = 6")
+    ini.read(str(tmp_path / "main.ltx"))
+    out_read = capsys.readouterr()
+    sections = ini_base.iter_sections(str(tmp_path / "main.ltx"))
+    stream = [(s.id, list(s.fields()), s._src) for s in sections]
+    out = capsys.readouterr()
+    assert stream == [
+        (s.id, list(s.fields()), s._src) for s in ini.sections() if s.id != "base"
+    ]
+    assert out == out_read
+    # Секции в экземпляре не регистрируются
+    assert list(ini_base.ids()) == ["base"]
+
+    # Секция возвращается сразу после считывания её последней строки
+    (tmp_path / "dup.ltx").write_text("[a]\n[b]:a\n[a]")
+    sections = Ini().iter_sections(str(tmp_path / "dup.ltx"))
+    assert next(sections).id == "a"
+    assert next(sections).get_string("__dummy", "") == ""
+    with pytest.raises(Ini.Error, match="Duplicate section"):
+        next(sections)
+
+def test_ini_index():
+    ini = Ini()
+    ini.read_raw("\n".join([
+        "[base]", "class = II_ATTCH", "inv_name = base",
+        "[wpn_1]:base", "class = WP_AK74",
+        "[wpn_2]:base", "class = WP_AK74", "flag",
+        "[misc]", "flag",
+    ]))
+    index = ini.build_index("class")
+    assert {k: [s.id for s in v] for k, v in index.items()} == {
+        "II_ATTCH": ["base"], "WP_AK74": ["wpn_1", "wpn_2"],
+    }
+    assert [s.id for s in ini.lookup("flag", None)] == ["wpn_2", "misc"]
+    assert ini.lookup("class", "WP_BM16") == ()
+    assert [s.id for s in ini.with_field("inv_name")] == ["base", "wpn_1", "wpn_2"]
+
+    # add() и clear() обновляют индексы, чтение - помечает их устаревшими
+    ini.add(Section("wpn_3", init=ini.section("wpn_1")))
+    assert [s.id for s in ini.lookup("class", "WP_AK74")] == ["wpn_1", "wpn_2", "wpn_3"]
+    assert [s.id for s in ini.with_field("inv_name")][-1] == "wpn_3"
+    replaced = Section("wpn_1")
+    replaced._fields["class"] = "WP_BM16"
+    ini.add(replaced, overwrite=True)
+    assert [s.id for s in ini.lookup("class", "WP_AK74")] == ["wpn_2", "wpn_3"]
+    ini.read_raw("[wpn_4]:wpn_2")
+    assert [s.id for s in ini.lookup("class", "WP_AK74")] == ["wpn_2", "wpn_3", "wpn_4"]
+    ini.clear()
+    assert ini.lookup("class", "WP_AK74") == ()
+    assert ini.with_field("flag") == ()
+
+def test_ini_inheritance_graph():
+    ini = Ini()
+    ini.read_raw("\n".join([
+        "[a]", "[b]", "[c]:a", "[d]:c, b", "[e]:a", "[f]:d",
+    ]))
+    assert ini.section("d").parents == ("c", "b")
+    assert ini.section("a").parents == ()
+    assert ini.children("a") == ("c", "e")
+    assert ini.descendants("a") == ("c", "d", "f", "e")
+    assert ini.descendants("f") == ()
+    assert ini.ancestors("f") == ("d", "c", "a", "b")
+    with pytest.raises(Ini.Error):
+        ini.ancestors("z")
+
+    # Граф обновляется после изменения экземпляра
+    ini.add(Section("g", init=ini.section("f")))
+    assert ini.section("g").parents == ("d",)
+    assert ini.descendants("b") == ("d", "f", "g")
+    ini.read_raw("[h]:g")
+    assert ini.descendants("c") == ("d", "f", "g", "h")
+
+def test_ini_fingerprint():
+    raw = "[a]\nx = 1\nflag\n[b]:a\ny = 2\n[c]\n"
+    ini_1, ini_2 = Ini(), Ini()
+    ini_1.read_raw(raw)
+    ini_2.read_raw("[c]\n[a]\nx = 1\nflag\n[b]:a\ny = 2\n")
+
+    # Хэш секции не зависит от процесса (подходит для внешних кэшей)
+    s = Section("s")
+    s._fields["a"] = "1"
+    s._fields["b"] = None
+    assert s.fingerprint().hex() == "12e4c4778d52cea54a5eaa016348f9a7"
+
+    a = ini_1.section("a")
+    assert a.fingerprint() == ini_2.section("a").fingerprint()
+    assert ini_1.fingerprint() == ini_2.fingerprint()
+    assert ini_1.differing_ids(ini_2) == set()
+
+    # Любое изменение секции меняет её хэш
+    fingerprints = {a.fingerprint()}
+    a._fields["flag"] = ""
+    fingerprints.add(a.fingerprint())
+    a._fields["x"] = "2"
+    fingerprints.add(a.fingerprint())
+    del a._fields["x"]
+    a._fields["x"] = "2"
+    fingerprints.add(a.fingerprint())
+    a.id = "a2"
+    fingerprints.add(a.fingerprint())
+    assert len(fingerprints) == 5
+    a.id = "a"
+
+    ini_2.add(Section("d"))
+    assert ini_1.fingerprint() != ini_2.fingerprint()
+    assert ini_1.differing_ids(ini_2) == {"a", "d"}
+
+def test_ini_fingerprint_incremental(monkeypatch):
+    raw = "\n".join(f"[s{i}]\nx = {i}" for i in range(2000))
+    ini_1, ini_2 = Ini(), Ini()
+    ini_1.read_raw(raw)
+    ini_2.read_raw(raw)
+    assert ini_1.differing_ids(ini_2) == set()
+
+    calls = []
+    fingerprint = Section.fingerprint
+    def counted(self):
+        calls.append(self.id)
+        return fingerprint(self)
+    monkeypatch.setattr(Section, "fingerprint", counted)
+
+    # Без изменений хэши групп не пересчитываются
+    digest = ini_1.fingerprint()
+    assert ini_1.differing_ids(ini_2) == set()
+    assert calls == []
+
+    # Пересчитываются только группы изменённых и добавленных секций
+    ini_1.section("s5")._fields["x"] = "new"
+    ini_2.add(Section("extra"))
+    ini_2.add(Section("s7"), overwrite=True)
+    assert ini_1.differing_ids(ini_2) == {"s5", "s7", "extra"}
+    assert ini_1.fingerprint() != digest
+    assert 3 <= len(calls) < 100
+
+    # Результат - как у построенных заново деревьев
+    monkeypatch.undo()
+    for ini in (ini_1, ini_2):
+        assert ini.fingerprint() == pickle.loads(pickle.dumps(ini)).fingerprint()
+
+def test_ini_column():
+    ini = Ini()
+    ini.read_raw("\n".join([
+        "[base]", "cost = 100", "weight = 0.5", "quest = true",
+        "[a]:base", "cost = 250",
+        "[b]:base", "cost = -1", "weight = bad", "quest = off",
+        "[c]", "cost", "weight = 1e1",
+        "[d]", "cost = 99999999999999999999",
+    ]))
+    values, valid = ini.column("cost", "int")
+    assert list(values) == [100, 250, -1, 0, 0]
+    assert list(valid) == [1, 1, 1, 0, 0]
+    values, valid = ini.column("cost", "uint", default=-1)
+    assert (values.typecode == "q") and (list(values) == [100, 250, -1, -1, -1])
+    assert list(valid) == [1, 1, 0, 0, 0]
+    values, valid = ini.column("weight", "float", ids=["c", "b", "a"], default=math.nan)
+    assert (values.typecode == "d") and (values[0] == 10.0) and math.isnan(values[1])
+    assert (values[2] == 0.5) and (list(valid) == [1, 0, 1])
+    values, valid = ini.column("quest", "bool", ids=["b", "a", "d"])
+    assert (list(values) == [0, 1, 0]) and (list(valid) == [1, 1, 0])
+
+    # Те же значения, что и у get_*
+    for _id, v, ok in zip(ini.ids(), *ini.column("weight", "float")):
+        if ok:
+            assert ini.get_float(_id, "weight") == v
+        else:
+            with pytest.raises(Section.Error):
+                ini.get_float(_id, "weight")
+
+    with pytest.raises(Ini.Error):
+        ini.column("cost", "int", ids=["absent"])
+    with pytest.raises(ValueError):
+        ini.column("cost", "str")
+
+    # default целочисленных столбцов
+    values, _ = ini.column("cost", "int", default=-1.0)
+    assert list(values) == [100, 250, -1, -1, -1]
+    values, _ = ini.column("quest", "bool", default=True)
+    assert list(values) == [1, 1, 0, 1, 1]
+    for type, default in (("int", 0.5), ("uint", math.nan), ("int", 1 << 63), ("bool", 300)):
+        with pytest.raises(ValueError, match="Invalid default"):
+            ini.column("cost", type, default=default)
+
+def test_ini_column_elems():
+    ini = Ini()
+    ini.read_raw("\n".join([
+        "[a]", "position = 1.5, -2, 3",
+        "[b]", "position = 4,5,6",
+        "[c]", "position",
+        "[d]", "position = ",
+        "[e]",
+    ]))
+    r = ini.column_elems("position", "float")
+    assert r == [[1.5, -2.0, 3.0], [4.0, 5.0, 6.0], None, [], None]
+    assert ini.column_elems("position", "int", ids=["b", "e"]) == [[4, 5, 6], None]
+
+    # Некорректный элемент в одной секции не мешает остальным
+    ini.read_raw("[f]\nposition = 1, x, 3")
+    assert ini.column_elems("position", "float", ids=["a", "f"]) == [[1.5, -2.0, 3.0], None]
+    assert ini.column_elems("position", "int", ids=["a", "b"]) == [None, [4, 5, 6]]
+    assert all(ini.section(_id)._typed is None for _id in "abf")  # без кэширования
+    with pytest.raises(Section.Error, match="value #2 is invalid"):
+        ini.get_floats("f", "position")
+    with pytest.raises(ValueError):
+        ini.column_elems("position", "bool")
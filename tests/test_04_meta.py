@@ -1,7 +1,10 @@
 import pytest
 import re
 
+from ip_ltx import Ini
+from ip_ltx import ini as ini_module
 from ip_ltx.ini import spawn_ini
+from ip_ltx.utils import SingletonMeta
 from ip_ltx.utils_meta import (
     Levels, ServerClasses, ObjectType, ObjectTypeDetector, CLSIDs
 )
@@ -99,6 +102,38 @@ def test_server_classes_issubclass():
     with pytest.raises(ValueError):
         _ = SC.issubclass("", "")
 
+def test_server_classes_closure():
+    import networkx as nx
+    SC = ServerClasses()
+    graph = nx.DiGraph()
+    graph.add_nodes_from(SC._parents)
+    graph.add_edges_from((c, p) for c, parents in SC._parents.items() for p in parents)
+    for a in SC._parents:
+        for b in SC._parents:
+            assert SC.issubclass(a, b) == nx.has_path(graph, a, b), (a, b)
+
+def test_server_classes_cycles(monkeypatch, capsys):
+    meta = Ini(name="meta.ltx")
+    meta.read_raw("\n".join([
+        "[server_classes]",
+        "a",
+        "b = a, undeclared",
+        "c = b, d",
+        "d = c",
+        "e = d, a",
+    ]))
+    monkeypatch.setattr(ini_module, "_INI_META", meta)
+    monkeypatch.setattr(SingletonMeta, "_instances", {})
+    SC = ServerClasses()
+    assert "has cycles" in capsys.readouterr().err
+    assert len(SC) == 6
+    assert "undeclared" in SC
+    assert SC.issubclass("b", "undeclared")
+    assert SC.issubclass("c", "d") and SC.issubclass("d", "c")
+    assert SC.issubclass("e", "undeclared")
+    assert not SC.issubclass("b", "c")
+    assert not SC.issubclass("a", "e")
+
 # ----------------------------------------------------------------
 
 def test_object_type_is_mob():
@@ -0,0 +1,123 @@
+import os
+import pytest
+
+from ip_ltx import Ini, Section
+from ip_ltx import ini_cache
+
+
+@pytest.fixture
+def gamedata(tmp_path, monkeypatch):
+    gd_mod_path = tmp_path / "gamedata-mod"
+    gd_alt_path = tmp_path / "gamedata-alt"
+    (gd_mod_path / "config").mkdir(parents=True)
+    (gd_alt_path / "config").mkdir(parents=True)
+    (gd_alt_path / "config" / "entry.ltx").write_text("\n".join([
+        '#include "inc.ltx"',
+        "[entry]:inc",
+        "f = 1",
+    ]))
+    (gd_alt_path / "config" / "inc.ltx").write_text("\n".join([
+        "[inc]",
+        "taken_from = alt",
+    ]))
+
+    _ss = Section(id="settings")
+    _ss.add("gamedata_path_mod", f'"{str(gd_mod_path)}"')
+    _ss.add("gamedata_path_alt", f'"{str(gd_alt_path)}"')
+    ini_meta = Ini(name="meta")
+    ini_meta.add(_ss, by_reference=True)
+
+    monkeypatch.setenv("LTX_CACHE_DIR", str(tmp_path / "cache"))
+    return gd_mod_path, gd_alt_path, ini_meta
+
+
+def _make_builder(ini_meta, calls):
+    def _builder():
+        calls.append(1)
+        ini = Ini(name="entry", ini_meta=ini_meta)
+        ini.read("config/entry.ltx", inside_gamedata=True)
+        return ini
+    return _builder
+
+
+def test_ini_cache_disabled(gamedata, monkeypatch):
+    _, _, ini_meta = gamedata
+    monkeypatch.delenv("LTX_CACHE_DIR")
+    calls = []
+    builder = _make_builder(ini_meta, calls)
+    ini_cache.cached_ini("entry", (), builder)
+    ini_cache.cached_ini("entry", (), builder)
+    assert len(calls) == 2
+
+
+def test_ini_cache_hit(gamedata):
+    _, _, ini_meta = gamedata
+    calls = []
+    builder = _make_builder(ini_meta, calls)
+    ini_1 = ini_cache.cached_ini("entry", (), builder)
+    ini_2 = ini_cache.cached_ini("entry", (), builder)
+    assert len(calls) == 1
+    assert ini_2 is not ini_1
+    assert list(ini_2.ids()) == ["inc", "entry"]
+    for s1, s2 in zip(ini_1.sections(), ini_2.sections()):
+        assert list(s1.fields()) == list(s2.fields())
+        assert s1._fields_own == s2._fields_own
+        assert s1._src == s2._src
+    assert ini_2.get_string("entry", "taken_from") == "alt"
+
+
+def test_ini_cache_key(gamedata):
+    _, _, ini_meta = gamedata
+    calls = []
+    builder = _make_builder(ini_meta, calls)
+    ini_cache.cached_ini("entry", ("a",), builder)
+    ini_cache.cached_ini("entry", ("b",), builder)
+    assert len(calls) == 2
+
+
+def test_ini_cache_invalidation_on_change(gamedata):
+    _, gd_alt_path, ini_meta = gamedata
+    calls = []
+    builder = _make_builder(ini_meta, calls)
+    ini_cache.cached_ini("entry", (), builder)
+
+    f_inc = gd_alt_path / "config" / "inc.ltx"
+    f_inc.write_text("\n".join([
+        "[inc]",
+        "taken_from = alt_changed",
+    ]))
+    st = f_inc.stat()
+    os.utime(f_inc, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    ini = ini_cache.cached_ini("entry", (), builder)
+    assert len(calls) == 2
+    assert ini.get_string("entry", "taken_from") == "alt_changed"
+
+
+def test_ini_cache_invalidation_on_shadowing(gamedata):
+    """Появление файла в gamedata мода перекрывает файл оригинала."""
+    gd_mod_path, _, ini_meta = gamedata
+    calls = []
+    builder = _make_builder(ini_meta, calls)
+    ini_cache.cached_ini("entry", (), builder)
+
+    (gd_mod_path / "config" / "inc.ltx").write_text("\n".join([
+        "[inc]",
+        "taken_from = mod",
+    ]))
+
+    ini = ini_cache.cached_ini("entry", (), builder)
+    assert len(calls) == 2
+    assert ini.get_string("entry", "taken_from") == "mod"
+
+
+def test_ini_cache_broken_entry(gamedata):
+    _, _, ini_meta = gamedata
+    calls = []
+    builder = _make_builder(ini_meta, calls)
+    ini_cache.cached_ini("entry", (), builder)
+    for fp in ini_cache.cache_dir().iterdir():
+        fp.write_bytes(b"garbage")
+    ini = ini_cache.cached_ini("entry", (), builder)
+    assert len(calls) == 2
+    assert ini.section_exist("entry")
@@ -0,0 +1,107 @@
+import os
+import sys
+import threading
+
+from ip_ltx.utils import (
+    GamedataFS, file_signature, gamedata_fs, is_gamedata_dir, is_gamedata_file, read_xml
+)
+
+
+def _make_gamedata(tmp_path):
+    gd_mod_path = tmp_path / "gamedata-mod"
+    gd_alt_path = tmp_path / "gamedata-alt"
+    (gd_mod_path / "config" / "misc").mkdir(parents=True)
+    (gd_alt_path / "config" / "misc").mkdir(parents=True)
+    (gd_alt_path / "meshes" / "Actors").mkdir(parents=True)
+    (gd_mod_path / "config" / "System.ltx").write_text("mod")
+    (gd_alt_path / "config" / "system.ltx").write_text("alt")
+    (gd_alt_path / "config" / "misc" / "alt.ltx").write_text("alt")
+    (gd_alt_path / "meshes" / "Actors" / "stalker.ogf").write_text("")
+    return gd_mod_path, gd_alt_path
+
+
+def test_gamedata_fs_lookup(tmp_path):
+    gd_mod_path, gd_alt_path = _make_gamedata(tmp_path)
+    fs = GamedataFS(gd_mod_path, gd_alt_path)
+
+    # Без учёта регистра и с любыми разделителями; MOD перекрывает ALT
+    assert fs.find("config\\system.ltx") == gd_mod_path / "config" / "System.ltx"
+    assert fs.find("CONFIG/SYSTEM.LTX") == gd_mod_path / "config" / "System.ltx"
+    assert fs.locate("config\\misc\\alt.ltx") == (
+        1, gd_alt_path / "config" / "misc" / "alt.ltx"
+    )
+    assert fs.find("config/misc/../misc/./alt.ltx") is not None
+    assert fs.find("config\\misc") is None
+    assert fs.find("config\\missing.ltx") is None
+    assert fs.find("..\\gamedata-alt\\config\\system.ltx") is None
+    assert fs.is_dir("meshes\\actors")
+    assert not fs.is_dir("meshes\\actors\\stalker.ogf")
+
+    assert is_gamedata_file("meshes\\actors\\stalker.ogf", gd_mod_path, gd_alt_path)
+    assert is_gamedata_dir("config\\MISC", gd_mod_path, gd_alt_path)
+    assert not is_gamedata_file("meshes\\actors\\bandit.ogf", gd_mod_path, None)
+    assert gamedata_fs(gd_mod_path, gd_alt_path) is gamedata_fs(gd_mod_path, gd_alt_path)
+
+
+def test_gamedata_fs_refresh(tmp_path):
+    gd_mod_path, gd_alt_path = _make_gamedata(tmp_path)
+    fs = GamedataFS(gd_mod_path, gd_alt_path)
+    assert fs.locate("config\\misc\\alt.ltx")[0] == 1
+    assert fs.refresh() == False
+
+    # Файл в gamedata мода перекрывает файл оригинала только после refresh()
+    dir_misc = gd_mod_path / "config" / "misc"
+    (dir_misc / "alt.ltx").write_text("mod")
+    st = dir_misc.stat()
+    os.utime(dir_misc, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert fs.locate("config\\misc\\alt.ltx")[0] == 1
+    assert fs.refresh() == True
+    assert fs.locate("config\\misc\\alt.ltx")[0] == 0
+
+
+def test_gamedata_fs_threads(tmp_path):
+    # Как при preload(): несколько потоков читают ini-файлы одной gamedata
+    gd_mod_path, gd_alt_path = _make_gamedata(tmp_path)
+    fs = gamedata_fs(gd_mod_path, gd_alt_path)
+    dir_misc = gd_mod_path / "config" / "misc"
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    errors = []
+    def worker(n):
+        try:
+            for _ in range(200):
+                assert fs.locate("config\\system.ltx")[0] == 0
+                assert fs.locate("config\\misc\\alt.ltx")[0] == 1
+                if n == 0:
+                    st = dir_misc.stat()
+                    os.utime(dir_misc, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+                fs.refresh()
+        except Exception as e:
+            errors.append(e)
+    try:
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert errors == []
+    assert fs is gamedata_fs(gd_mod_path, gd_alt_path)
+
+
+def test_read_xml_deps(tmp_path, capsys):
+    gd_mod_path, gd_alt_path = _make_gamedata(tmp_path)
+    (gd_alt_path / "config" / "misc" / "alt.xml").write_text("<a/>")
+    deps = {}
+    assert read_xml("misc\\alt.xml", gd_mod_path, gd_alt_path, deps) == ["<a/>"]
+    fp_alt = str(gd_alt_path / "config" / "misc" / "alt.xml")
+    assert deps == {str(gd_mod_path / "config" / "misc" / "alt.xml"): None,
+                    fp_alt: file_signature(fp_alt)}
+
+    # Отсутствующий файл: его появление в любой из папок - изменение
+    deps = {}
+    assert read_xml("misc\\new.xml", gd_mod_path, gd_alt_path, deps) == []
+    assert "Not found" in capsys.readouterr().err
+    assert deps == {str(gd_mod_path / "config" / "misc" / "new.xml"): None,
+                    str(gd_alt_path / "config" / "misc" / "new.xml"): None}
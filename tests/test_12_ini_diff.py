@@ -0,0 +1,82 @@
+import io
+import random
+
+import pytest
+
+from ip_ltx import Ini
+from ip_ltx.ini_diff import FieldChange, SectionDiff, diff
+
+
+def _ini(raw: str) -> Ini:
+    ini = Ini()
+    ini.read_raw(raw)
+    return ini
+
+
+def test_ini_diff():
+    old = _ini("\n".join([
+        "[base]", "cost = 10",
+        "[a]:base", "x = 1", "y = 2", "flag",
+        "[b]", "z = 3",
+        "[c]:base",
+        "[d]", "p = 1", "q = 2",
+        "[gone]", "w = 0",
+    ]))
+    new = _ini("\n".join([
+        "[base]", "cost = 10",
+        "[c]:base",
+        "[a]:base", "x = 1", "y = 5", "extra = 1",
+        "[b]:base", "z = 3",
+        "[d]", "q = 2", "p = 1",
+        "[new]:a",
+    ]))
+    d = diff(old, new)
+    assert d.moved == ("c",)
+    assert d.sections == (
+        SectionDiff("a", "changed", (
+            FieldChange("y", "changed", "2", "5"),
+            FieldChange("flag", "removed", None, None),
+            FieldChange("extra", "added", None, "1"),
+        ), ("base",), None, False),
+        SectionDiff("b", "changed", (
+            FieldChange("cost", "added", None, "10"),
+        ), ("base",), (), False),
+        SectionDiff("d", "changed", (), (), None, True),
+        SectionDiff("new", "added", tuple(
+            FieldChange(k, "added", None, v) for k, v in new.section("new").fields()
+        ), ("a",), None, False),
+        SectionDiff("gone", "removed", (
+            FieldChange("w", "removed", "0", None),
+        ), (), None, False),
+    )
+    assert not diff(old, old)
+
+    file = io.StringIO()
+    d.write(file, fmt="ltx")
+    assert file.getvalue().startswith("\n".join([
+        "[a]:base", "y = 5", "; removed: flag", "extra = 1", "",
+        "[b]:base", "cost = 10", "",
+        "[d]", "",
+    ]))
+    assert file.getvalue().endswith("; removed: [gone]\n\n")
+    file = io.StringIO()
+    d.write(file)
+    text = file.getvalue()
+    assert "## Moved sections\nc\n" in text
+    assert "[b]\n; parents: - -> base\n+ cost = 10\n" in text
+    assert "[d]\n; fields order changed\n" in text
+    with pytest.raises(ValueError):
+        d.write(file, fmt="json")
+
+
+def test_ini_diff_moved_minimal():
+    rnd = random.Random(1)
+    ids = [f"s{i}" for i in range(200)]
+    old = _ini("\n".join(f"[{_id}]" for _id in ids))
+    for _ in range(5):
+        ids.insert(rnd.randrange(len(ids)), ids.pop(rnd.randrange(len(ids))))
+    new = _ini("\n".join(f"[{_id}]" for _id in ids))
+    moved = diff(old, new).moved
+    assert 0 < len(moved) <= 5
+    rest = [_id for _id in ids if _id not in moved]
+    assert rest == [_id for _id in old.ids() if _id not in moved]
@@ -0,0 +1,81 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from ip_ltx import Ini
+from ip_ltx.ini_frozen import FrozenIni
+
+
+_RAW = "\n".join([
+    "[base]", "cost = 10", "name = \"Ящик\"",
+    "[item]:base", "cost = 20", "flag", "list = 1, 2, 3",
+    "[other]:base,item",
+    "[empty]",
+])
+
+
+def _snapshot(ini) -> list:
+    return [(s.id, s.parents, list(s.fields())) for s in ini.sections()]
+
+
+def _worker(frozen: FrozenIni) -> tuple[int, float]:
+    return len(frozen), frozen.get_float("item", "cost")
+
+
+def test_ini_frozen(tmp_path):
+    ini = Ini(name="test")
+    ini.read_raw(_RAW)
+    frozen = FrozenIni.from_ini(ini)
+    assert frozen.name == "test"
+    assert len(frozen) == 4
+    assert list(frozen.ids()) == list(ini.ids())
+    assert _snapshot(frozen) == _snapshot(ini)
+    assert _snapshot(frozen.thaw()) == _snapshot(ini)
+    assert frozen.get_section_index("other") == 2
+    assert frozen.get_section_index("absent") == -1
+    assert frozen.section_exist("empty") and not frozen.section_exist("absent")
+    assert frozen.line_exist("other", "flag") and not frozen.line_exist("base", "flag")
+    assert frozen.get_string_wb("item", "name") == "Ящик"
+    assert frozen.get_ints("item", "list") == [1, 2, 3]
+    with pytest.raises(Ini.Error):
+        frozen.section("absent")
+
+    # Изменение полученной секции не затрагивает снимок
+    frozen.section("item").add("cost", "30", overwrite=True)
+    assert frozen.get_int("item", "cost") == 20
+
+    # Сериализация, внешний буфер и файл
+    assert _snapshot(pickle.loads(pickle.dumps(frozen))) == _snapshot(ini)
+    assert _snapshot(FrozenIni.from_buffer(bytearray(frozen.to_bytes()) + b"\0" * 64)) \
+        == _snapshot(ini)
+    fp = str(tmp_path / "system.frozen")
+    frozen.dump(fp)
+    mapped = FrozenIni.open(fp)
+    assert _snapshot(mapped) == _snapshot(ini)
+    data = pickle.dumps(mapped)
+    assert len(data) < len(frozen.to_bytes())
+    assert _snapshot(pickle.loads(data)) == _snapshot(ini)
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(_worker, mapped).result() == (4, 20.0)
+
+    with pytest.raises(ValueError):
+        FrozenIni.from_buffer(b"not a snapshot at all, definitely not")
+    with pytest.raises(ValueError):
+        FrozenIni.from_buffer(frozen.to_bytes()[:-1])
+
+
+def test_ini_frozen_lookup(tmp_path):
+    ini = Ini()
+    ini.read_raw("".join(f"[s_{i}]\nv = {i}\n" for i in range(1000)) + "[секция]\n")
+    fp = str(tmp_path / "many.frozen")
+    FrozenIni.from_ini(ini).dump(fp)
+    frozen = FrozenIni.open(fp)
+    assert all(frozen.get_section_index(f"s_{i}") == i for i in range(1000))
+    assert frozen.get_section_index("секция") == 1000
+    assert not any(frozen.section_exist(f"s_{i}") for i in range(1000, 2000))
+    assert frozen.get_int("s_777", "v") == 777
+
+    empty = FrozenIni.from_ini(Ini())
+    assert (len(empty) == 0) and not empty.section_exist("s_0")
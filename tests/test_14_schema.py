@@ -0,0 +1,83 @@
+import pytest
+
+from ip_ltx import Ini, Section
+from ip_ltx.schema import FieldSpec, Schema
+
+
+def _not_empty(v: str) -> str | None:
+    return None if (len(v) > 0) else "'name' is not specified"
+
+
+_SCHEMA = Schema("Fields", [
+    FieldSpec("name", "str", default="", validator=_not_empty),
+    FieldSpec("visual", "str_wb", default=""),
+    FieldSpec("cost", "uint", default=0),
+    FieldSpec("weight", "float", required=True),
+    FieldSpec("quest", "bool", default=False),
+    FieldSpec("position", "floats", default=(0.0, 0.0, 0.0), required=True,
+              validator=lambda v: None if (len(v) == 3) else "bad position"),
+    FieldSpec("slots", "ints", default=()),
+    FieldSpec("tags", "strings", default=()),
+    FieldSpec("upd:health", "float", default=1.0, attr="health"),
+])
+
+
+def _expected_error(getter, *args) -> str:
+    with pytest.raises(Section.Error) as e:
+        getter(*args)
+    return str(e.value)
+
+
+def test_schema_extract():
+    ini = Ini()
+    ini.read_raw("\n".join([
+        "[ok]", "name = a", "visual = \"b\"", "cost = 10", "weight = 0.5", "quest = on",
+        "position = 1, 2, 3", "slots = 1,2", "tags = x, y", "upd:health = 0.5",
+        "[bad]", "cost = -1", "weight", "quest = maybe", "position = 1, x, 3",
+        "slots = 1, 2.5", "tags",
+        "[short]", "name = c", "weight = 1", "position = 1, 2",
+    ]))
+    record, errors = _SCHEMA.extract(ini.section("ok"))
+    assert errors == []
+    assert (record.name, record.visual, record.cost, record.weight) == ("a", "b", 10, 0.5)
+    assert (record.quest, record.position, record.slots) == (True, [1.0, 2.0, 3.0], [1, 2])
+    assert (record.tags, record.health) == (["x", "y"], 0.5)
+    assert not hasattr(record, "__dict__")
+    # Без get_* (кэш секции не заполняется) и без обработки исключений
+    assert ini.section("ok")._typed is None
+    assert "try" not in _SCHEMA.source
+
+    # Сообщения совпадают с исключениями get_*; при ошибке - default
+    s = ini.section("bad")
+    record, errors = _SCHEMA.extract(s)
+    assert errors == [
+        "'name' is not specified",
+        _expected_error(s.get_uint, "cost"),
+        _expected_error(s.get_float, "weight"),
+        _expected_error(s.get_bool, "quest"),
+        _expected_error(s.get_floats, "position"),
+        _expected_error(s.get_ints, "slots"),
+    ]
+    assert (record.cost, record.weight, record.position, record.slots) == (
+        0, None, (0.0, 0.0, 0.0), ()
+    )
+    assert (record.tags, record.health) == ((), 1.0)
+
+    record, errors = _SCHEMA.extract(ini.section("short"))
+    assert errors == ["bad position"]
+
+    # Пакетное извлечение даёт тот же результат
+    for section, record, errors in _SCHEMA.extract_all(ini):
+        assert (record, errors) == _SCHEMA.extract(section)
+    assert [s.id for s, _, _ in _SCHEMA.extract_all(ini, ids=["short", "ok"])] == [
+        "short", "ok"
+    ]
+
+
+def test_schema_invalid():
+    with pytest.raises(ValueError):
+        Schema("R", [FieldSpec("a", "str"), FieldSpec("a", "int")])
+    with pytest.raises(ValueError):
+        Schema("R", [FieldSpec("upd:a", "str")])
+    with pytest.raises(ValueError):
+        Schema("R", [FieldSpec("a", "vector")])
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from ip_ltx import preload as preload_module
+from ip_ltx.preload import LOADERS, Loader, PreloadError, preload
+
+_LOG: list[str] = []
+_LOG_LOCK = threading.Lock()
+_ACTIVE = [0, 0]  # текущее и максимальное число одновременно работающих
+
+
+def _work(name: str, delay: float = 0.05) -> None:
+    with _LOG_LOCK:
+        _ACTIVE[0] += 1
+        _ACTIVE[1] = max(_ACTIVE)
+    time.sleep(delay)
+    with _LOG_LOCK:
+        _ACTIVE[0] -= 1
+        _LOG.append(name)
+
+def load_base():
+    _work("base")
+
+def load_a():
+    _work("a")
+
+def load_b():
+    _work("b")
+
+def load_top():
+    _work("top", 0)
+
+def load_broken():
+    raise RuntimeError("broken data")
+
+def extra():
+    _work("extra", 0)
+
+
+@pytest.fixture
+def loaders(monkeypatch):
+    _LOG.clear()
+    _ACTIVE[:] = [0, 0]
+    fake = {
+        "base": Loader(f"{__name__}:load_base"),
+        "a": Loader(f"{__name__}:load_a", ("base",)),
+        "b": Loader(f"{__name__}:load_b", ("base",)),
+        "top": Loader(f"{__name__}:load_top", ("a", "b")),
+        "broken": Loader(f"{__name__}:load_broken", ("base",)),
+    }
+    monkeypatch.setattr(preload_module, "LOADERS", fake)
+    return fake
+
+
+def test_preload_order(loaders):
+    timings = preload(["top"], max_workers=4)
+    assert _LOG[0] == "base"
+    assert set(_LOG[1:3]) == {"a", "b"}
+    assert _LOG[3] == "top"
+    assert list(timings) == _LOG
+    assert timings["base"] >= 0.04
+    assert _ACTIVE[1] == 2  # a и b - одновременно
+
+
+def test_preload_sequential(loaders):
+    preload([load_top, "a"], max_workers=1)
+    assert _LOG == ["base", "a", "b", "top"]
+    assert _ACTIVE[1] == 1
+
+
+def test_preload_extra(loaders):
+    timings = preload([extra, "a"])
+    assert _LOG == ["base", "a", "extra"]
+    assert "extra" in timings
+
+
+def test_preload_error(loaders):
+    with pytest.raises(PreloadError) as e:
+        preload(["broken", "top"], max_workers=4)
+    assert e.value.loader == "broken"
+    assert isinstance(e.value.__cause__, RuntimeError)
+    assert "top" not in _LOG
+
+    with pytest.raises(PreloadError):
+        preload([load_broken], max_workers=1)
+    with pytest.raises(KeyError):
+        preload(["unknown"])
+
+
+def test_preload_known():
+    for name, loader in LOADERS.items():
+        for dep in loader.deps:
+            assert dep in LOADERS, (name, dep)
+    from ip_ltx.ini import system_ini
+    assert preload_module._name(system_ini) == "system_ini"
+    assert preload_module._closure(["get_spawn"])[0] == "meta_ini"
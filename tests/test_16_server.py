@@ -0,0 +1,124 @@
+import os
+import subprocess
+import sys
+import time
+from multiprocessing import Pipe
+
+import pytest
+
+from ip_ltx import ini as ini_module
+from ip_ltx import server
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    for attr in ("_INI_META", "_INI_SYSTEM", "_INI_SPAWN", "_INI_GAME"):
+        monkeypatch.setattr(ini_module, attr, None)
+    monkeypatch.setattr(server, "_META_FILEPATH", None)
+    for k in ("META_FILEPATH", "HIDE_GAMEDATA_LTX_WARNINGS"):
+        # run_script() меняет переменные окружения процесса
+        monkeypatch.setenv(k, os.environ.get(k, ""))
+    monkeypatch.setenv("LTX_SERVER_FILE", str(tmp_path / "state.json"))
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath("meta.ltx").write_text("[settings]\nx = 1\n")
+    tmp_path.joinpath("script.py").write_text("\n".join([
+        "import os, sys",
+        "META_FILEPATH = 'meta.ltx'",
+        "def main():",
+        "    from ip_ltx.ini import meta_ini",
+        "    x = meta_ini().get_string('settings', 'x')",
+        "    print('x', x, 'pid', os.getpid(), 'args', *sys.argv[1:])",
+        "    if x == 'fail':",
+        "        raise ValueError('failed')",
+    ]))
+    yield tmp_path
+
+
+def _touch(fp, text: str) -> None:
+    # Время изменения должно отличаться и на ФС с грубой точностью
+    mtime = os.stat(fp).st_mtime_ns
+    fp.write_text(text)
+    os.utime(fp, ns=(mtime + 10**9, mtime + 10**9))
+
+
+def test_server_run_local(workdir, capsys):
+    assert server.run("script.py", ["a"])
+    assert f"x 1 pid {os.getpid()} args a" in capsys.readouterr().out
+    meta = ini_module._INI_META
+    assert meta is not None
+    assert os.environ["META_FILEPATH"] == str(workdir / "meta.ltx")
+
+    # Без изменений данные не перечитываются
+    assert server.reload() == []
+    assert server.run("script.py")
+    assert ini_module._INI_META is meta
+
+    _touch(workdir / "meta.ltx", "[settings]\nx = fail\n")
+    assert not server.run("script.py")
+    out = capsys.readouterr().out
+    assert "ValueError: failed" in out
+    assert ini_module._INI_META is meta  # перечитан на месте (Ini.refresh)
+    assert ini_module._INI_META.get_string("settings", "x") == "fail"
+
+
+def test_server_reload_deps(workdir, monkeypatch):
+    from ip_ltx import trade
+    server.run("script.py")
+    workdir.joinpath("trade.ltx").write_text("[buy]\n")
+    monkeypatch.setattr(trade, "_BUY_K", {})
+    monkeypatch.setattr(trade, "_DEPS", {str(workdir / "trade.ltx"): None})
+    assert server.reload() == ["get_buy_k"]
+    assert trade._BUY_K is None
+    assert server.reload() == []
+
+
+def test_server_preload(workdir, monkeypatch):
+    # Как при запуске "META_FILEPATH=meta.ltx python -m ip_ltx.server serve"
+    monkeypatch.setenv("META_FILEPATH", "meta.ltx")
+    server._preload(("meta_ini",))
+    meta = ini_module._INI_META
+    assert meta is not None
+    assert server.reload() == []
+    assert server.run("script.py")
+    assert ini_module._INI_META is meta
+
+
+def test_server_unknown_request():
+    conn, client = Pipe()
+    client.send(("unknown",))
+    assert server._handle(conn)
+    assert client.recv()[0] == "error"
+
+
+def test_server_process(workdir):
+    env = dict(os.environ)
+    env.pop("META_FILEPATH", None)
+    cmd = [sys.executable, "-m", "ip_ltx.server"]
+    proc = subprocess.Popen(cmd + ["serve"], env=env, stdout=subprocess.DEVNULL)
+    try:
+        for _ in range(100):
+            if (workdir / "state.json").exists():
+                break
+            time.sleep(0.05)
+        outputs = []
+        for args in (["a"], ["b"]):
+            r = subprocess.run(
+                cmd + ["run", "script.py", *args], env=env, capture_output=True, text=True
+            )
+            assert r.returncode == 0, r.stdout + r.stderr
+            outputs.append(r.stdout)
+        assert f"pid {proc.pid} args a" in outputs[0]
+        assert f"pid {proc.pid} args b" in outputs[1]
+
+        _touch(workdir / "meta.ltx", "[settings]\nx = fail\n")
+        r = subprocess.run(cmd + ["run", "script.py"], env=env, capture_output=True, text=True)
+        assert r.returncode == 1
+        assert "ValueError: failed" in r.stdout
+
+        r = subprocess.run(cmd + ["stop"], env=env, capture_output=True, text=True)
+        assert "stopped" in r.stdout
+        proc.wait(10)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+    assert not (workdir / "state.json").exists()
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from ip_ltx import registry
+from ip_ltx.utils import SingletonBase, SingletonMeta, file_signature
+
+
+@pytest.fixture
+def entries(monkeypatch):
+    # Реальные записи (ini, spawn, ...) не затрагиваются
+    monkeypatch.setattr(registry, "_ENTRIES", {})
+    values: dict[str, object] = {}
+    def add(name, inputs=(), **kwargs):
+        values[name] = f"value of {name}"
+        registry.register(
+            name, lambda: values.get(name, None), lambda: values.pop(name),
+            inputs, **kwargs
+        )
+    return values, add
+
+
+def test_registry_invalidate(entries):
+    values, add = entries
+    add("meta")
+    add("system", ("meta",))
+    add("xml", ("system",))
+    add("levels", ("meta",))
+    add("spawn", ("system", "levels"))
+    add("other")
+
+    assert registry.dependents(["system"]) == ["xml", "spawn"]
+    # Запись идёт после своих входных данных, даже если зарегистрирована раньше
+    add("report", ("xml", "summary"))
+    add("summary", ("spawn",))
+    assert registry.dependents(["system"]) == ["xml", "spawn", "summary", "report"]
+    values.pop("report"); values.pop("summary")
+    assert registry.invalidate("system") == ["system", "xml", "spawn"]
+    assert sorted(values) == ["levels", "meta", "other"]
+    # Сброшенные данные повторно не сбрасываются, неизвестные имена игнорируются
+    assert registry.invalidate("system", "unknown") == []
+    assert registry.invalidate("meta") == ["meta", "levels"]
+    assert registry.loaded() == ["other"]
+
+
+def test_registry_refresh(entries, tmp_path):
+    values, add = entries
+    fp = tmp_path / "a.ltx"
+    fp.write_text("[a]")
+    deps = {str(fp): file_signature(str(fp))}
+    updates = []
+    def update(value):
+        # Как Ini.refresh: данные и сигнатуры файлов обновляются
+        updates.append(value)
+        deps[str(fp)] = file_signature(str(fp))
+        return True
+    add("ini", files=lambda _: deps, update=update)
+    add("derived", ("ini",))
+    xml_deps = dict(deps)
+    add("xml", files=lambda _: xml_deps)
+    add("unrelated", files=lambda _: {})
+
+    assert registry.refresh() == []
+    mtime = os.stat(fp).st_mtime_ns
+    fp.write_text("[a]\nx = 1")
+    os.utime(fp, ns=(mtime + 10**9, mtime + 10**9))
+    assert registry.refresh() == ["ini", "derived", "xml"]
+    assert updates == ["value of ini"]
+    assert sorted(values) == ["ini", "unrelated"]
+
+    def broken(value):
+        raise OSError("can't read")
+    add("broken", files=lambda _: {str(tmp_path / "missing.ltx"): (1, 1)}, update=broken)
+    add("derived", ("broken",))
+    assert registry.refresh() == ["broken", "derived"]
+    assert "broken" not in values
+
+
+def test_registry_singleton(entries):
+    class Table(SingletonBase):
+        _inputs = ("system_ini",)
+        def __init__(self):
+            self._deps = {}
+    try:
+        entry = registry.entries()["Table"]
+        assert entry.inputs == ("system_ini",)
+        assert entry.get() is None
+        table = Table()
+        assert entry.get() is table
+        assert entry.files(table) == {}
+        registry.register("system_ini", lambda: 1, lambda: None)
+        assert registry.invalidate("system_ini") == ["system_ini", "Table"]
+        assert Table() is not table
+    finally:
+        SingletonMeta._instances.pop(Table, None)
@@ -0,0 +1,63 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+_USAGE = Path(__file__).parent.parent.joinpath("usage")
+
+_ENTRY_POINTS = sorted({
+    m for fp in _USAGE.rglob("*.py")
+    for m in re.findall(r"(?:import|from)\s+(ip_ltx\.\w+)", fp.read_text(encoding="utf-8"))
+})
+"""Модули, импортируемые скриптами из usage/."""
+
+_BUDGET_MS = {"ip_ltx": 100}
+_BUDGET_MS_DEFAULT = 200
+_SCALE = float(os.environ.get("LTX_IMPORT_BUDGET_SCALE", "1"))
+"""Множитель бюджетов (для медленных машин)."""
+
+_HEAVY = ("networkx", "pygtrie", "pathvalidate", "multiprocessing", "importlib.metadata")
+"""Модули, которые не должны загружаться при импорте."""
+
+_CODE = "\n".join([
+    "import sys, types",
+    # Как при сборке документации: validate_data() ничего не загружает
+    "sys.modules['sphinx'] = types.ModuleType('sphinx')",
+    "import {module}",
+    "print(*[m for m in {heavy!r} if m in sys.modules])",
+])
+
+
+def _import_time(module: str) -> tuple[float, list[str]]:
+    """Время импорта (мс, ``-X importtime``) и загруженные тяжёлые модули."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    code = _CODE.format(module=module, heavy=_HEAVY)
+    times = []
+    for _ in range(3):
+        r = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            env=env, capture_output=True, text=True, check=True
+        )
+        for line in r.stderr.splitlines():
+            parts = line.split("|")
+            if (len(parts) == 3) and (parts[2].strip() == module):
+                times.append(int(parts[1]) / 1000)
+    # Первый запуск может включать компиляцию (.pyc)
+    return min(times[1:]), r.stdout.split()
+
+
+def test_entry_points_found():
+    assert "ip_ltx.analyzer_spawn" in _ENTRY_POINTS
+    assert "ip_ltx.acdc" in _ENTRY_POINTS
+
+
+@pytest.mark.parametrize("module", ["ip_ltx", *_ENTRY_POINTS])
+def test_import_time(module):
+    ms, heavy = _import_time(module)
+    assert heavy == []
+    budget = _BUDGET_MS.get(module, _BUDGET_MS_DEFAULT) * _SCALE
+    assert ms < budget, f"import {module}: {ms:.1f} ms (budget {budget:.0f} ms)"